@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark description cleaning in extract_schemas.py.
+
+Renders DataTypes.md and every block file from the 2.0.1 schema set while
+recording each clean_description() call, then replays that exact call
+sequence through the per-call re.sub pipeline it replaced (reproduced
+below as the baseline), the precompiled pipeline without its cache, and
+the memoized clean_description() from a cold cache. Fails if any
+description cleans differently.
+
+Usage:
+    python scripts/bench_clean_description.py [--schema-dir DIR] [--repeat N]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import extract_schemas as x
+import schema_ir
+
+# ---------------------------------------------------------------------------
+# Baseline: re.sub with pattern strings on every call
+# ---------------------------------------------------------------------------
+
+def legacy_clean_description(desc):
+    if not desc:
+        return ""
+    desc = desc.replace("\r\n", "\n").replace("\r", "")
+    desc = desc.replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
+    desc = re.sub(r'urn:x-[\w:-]+\n?', '', desc)
+    desc = re.sub(r'\A[\w][\w_ ]*(\.\s*[\w][\w_ ]*)+\s*\n', '', desc)
+    desc = re.sub(r'\A[\w]+_\s[\w_ ]*\s*\n', '', desc)
+    desc = re.sub(r'\A[A-Z][\w]{0,29}\s*\n', '', desc)
+    desc = re.sub(r'<<ref-([^,>]+),\[([^\]]+)\]>>', r'\2', desc)
+    desc = re.sub(r'<<[^,>]+,\s*([^>]+?)>>', r'\1', desc)
+    desc = re.sub(r'<<[^>]*>>', '', desc)
+    desc = desc.replace('`', '')
+    desc = re.sub(r'\n{2,}', ' ', desc)
+    desc = re.sub(r'\s+', ' ', desc).strip()
+    return desc
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def render_all(ir):
+    """Render every output of extract_schemas.main() in memory."""
+    shared_types, local_types = x.classify_types(ir.types)
+    type_usage_map = x.build_type_usage_map(ir.types)
+    x.generate_datatypes_md(shared_types, type_usage_map)
+    for block_name, messages_in_block in x.BLOCK_MAP.items():
+        x.generate_block_md(block_name, messages_in_block, ir.messages,
+                            shared_types, local_types, type_usage_map)
+
+
+def record_calls(ir):
+    """Every argument clean_description() receives in one run, in order."""
+    calls = []
+    cached = x.clean_description
+
+    def recorder(desc):
+        calls.append(desc)
+        return cached(desc)
+
+    x.clean_description = recorder
+    try:
+        render_all(ir)
+    finally:
+        x.clean_description = cached
+    return calls
+
+
+def best_of(run, repeat):
+    """Best wall time of run() over repeat runs, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--schema-dir", type=Path, default=x.SCHEMA_DIR,
+                        help=f"OCPP 2.0.1 JSON schemas (default: {x.SCHEMA_DIR.name}/)")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    if not args.schema_dir.exists():
+        print(f"ERROR: Schema directory not found: {args.schema_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    ir = schema_ir.load(args.schema_dir)
+    calls = record_calls(ir)
+    unique = set(calls)
+    precompiled = x.clean_description.__wrapped__
+    mismatches = sum(1 for d in unique if legacy_clean_description(d) != precompiled(d))
+    if mismatches:
+        print(f"ERROR: {mismatches} of {len(unique)} descriptions clean differently", file=sys.stderr)
+        sys.exit(1)
+
+    def run_legacy():
+        for desc in calls:
+            legacy_clean_description(desc)
+
+    def run_precompiled():
+        for desc in calls:
+            precompiled(desc)
+
+    def run_cached():
+        x.clean_description.cache_clear()  # one extractor run starts cold
+        for desc in calls:
+            x.clean_description(desc)
+
+    size = sum(len(d) for d in unique)
+    print(f"{len(calls)} calls, {len(unique)} unique descriptions "
+          f"({size / 1024:.1f} KB), outputs identical\n")
+    legacy_ms = best_of(run_legacy, args.repeat)
+    print(f"{'pipeline':<24}  {'ms':>8}  {'speedup':>7}")
+    for label, run in [("re.sub per call", run_legacy),
+                       ("precompiled", run_precompiled),
+                       ("precompiled + memoized", run_cached)]:
+        ms = legacy_ms if run is run_legacy else best_of(run, args.repeat)
+        print(f"{label:<24}  {ms:>8.2f}  {legacy_ms / ms:>6.1f}x")
+
+    # Whole-render effect: every output with the old and the new cleaner
+    x.clean_description.cache_clear()
+    cached = x.clean_description
+    new_ms = best_of(lambda: (cached.cache_clear(), render_all(ir)), args.repeat)
+    x.clean_description = legacy_clean_description
+    try:
+        old_ms = best_of(lambda: render_all(ir), args.repeat)
+    finally:
+        x.clean_description = cached
+    print(f"\nRender all outputs: {old_ms:.1f} ms -> {new_ms:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
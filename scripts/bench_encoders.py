@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark the generated JSON encoders against json.dumps().
+
+Builds large outbound 2.0.1 payloads -- a SendLocalList with N
+authorization entries, a SetChargingProfile whose schedule has the
+maximum number of periods, and a GetVariables with N variables -- from
+full schema samples (every optional property but customData present), varying the
+strings and numbers of each array item. Each payload is serialized by
+the encoder of generate_encoders.py (built in memory) and by json.dumps()
+with the same separators. Fails if any output differs.
+
+Usage:
+    python scripts/bench_encoders.py [--entries N] [--compact] [--repeat N]
+"""
+
+import argparse
+import json
+import sys
+import time
+import types
+
+import generate_encoders
+import schema_ir
+import schema_payloads
+
+VERSION = "2.0.1"
+
+# Schema file -> path of the array grown to the benchmark size
+LARGE_PAYLOADS = {
+    "SendLocalListRequest": ("localAuthorizationList",),
+    "SetChargingProfileRequest": ("chargingProfile", "chargingSchedule", 0, "chargingSchedulePeriod"),
+    "GetVariablesRequest": ("getVariableData",),
+}
+
+
+def without_custom_data(value):
+    """Copy of value without vendor extensions, which outbound messages
+    rarely carry."""
+    if isinstance(value, list):
+        return [without_custom_data(item) for item in value]
+    if isinstance(value, dict):
+        return {key: without_custom_data(item) for key, item in value.items() if key != "customData"}
+    return value
+
+
+def vary(value, i):
+    """Copy of a sample value with its placeholder strings and its numbers
+    made distinct per item i."""
+    if isinstance(value, str):
+        return f"ID{i:08d}"[:max(len(value), 10)] if set(value) == {"a"} else value
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        return value + i
+    if isinstance(value, float):
+        return value + i * 0.1
+    if isinstance(value, list):
+        return [vary(item, i) for item in value]
+    if isinstance(value, dict):
+        return {key: vary(item, i) for key, item in value.items()}
+    return value
+
+
+def large_payload(schema_file, path, entries):
+    """A full sample of schema_file with the array at path grown to
+    entries items (or its maxItems)."""
+    payload = without_custom_data(schema_payloads.sample(schema_file, schema_file))
+    parent = payload
+    for key in path[:-1]:
+        parent = parent[key]
+    array_node = _node_at(schema_file, path)
+    count = entries if array_node.max_items is None else min(entries, array_node.max_items)
+    parent[path[-1]] = [vary(parent[path[-1]][0], i) for i in range(count)]
+    return payload
+
+
+def _node_at(schema_file, path):
+    """The schema node of the value at path."""
+    node = schema_file
+    for key in path:
+        if isinstance(key, int):
+            node = node.items
+        else:
+            node = node.shape.fields[key]
+        while getattr(node, "ref", None) is not None:
+            node = schema_file.definitions[node.ref]
+    return node
+
+
+def _value_at(payload, path):
+    for key in path:
+        payload = payload[key]
+    return payload
+
+
+def best_of(run, repeat):
+    """Best wall time of run() over repeat runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1000, help="items in each grown array")
+    parser.add_argument("--compact", action="store_true", help='use "," and ":" separators')
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    schema_dir = schema_payloads.VERSIONS[VERSION]["schema_dir"]
+    if not schema_dir.exists():
+        print(f"ERROR: Schema directory not found: {schema_dir}", file=sys.stderr)
+        sys.exit(1)
+    ir = schema_ir.load(schema_dir)
+    separators = generate_encoders.COMPACT_SEPARATORS if args.compact else generate_encoders.SEPARATORS
+    module = types.ModuleType("encoders")
+    source = generate_encoders.generate_module(VERSION, ir, separators)
+    exec(compile(source, "encoders", "exec"), module.__dict__)
+    dumps = json.JSONEncoder(separators=separators).encode
+
+    print(f"separators {separators!r}\n")
+    print(f"{'payload':<26}  {'items':>5}  {'KB':>7}  {'json.dumps':>10}  {'encoder':>9}  {'speedup':>7}")
+    for file_name, path in LARGE_PAYLOADS.items():
+        schema_file = ir.files[file_name]
+        payload = large_payload(schema_file, path, args.entries)
+        encode = getattr(module, f"encode_{file_name}")
+        text = encode(payload)
+        if text != dumps(payload):
+            print(f"ERROR: {file_name}: encoder output differs from json.dumps", file=sys.stderr)
+            sys.exit(1)
+
+        items = len(_value_at(payload, path))
+        dumps_ms = best_of(lambda: dumps(payload), args.repeat)
+        encode_ms = best_of(lambda: encode(payload), args.repeat)
+        print(f"{file_name:<26}  {items:>5}  {len(text) / 1024:>7.1f}  {dumps_ms:>8.2f}ms  "
+              f"{encode_ms:>7.2f}ms  {dumps_ms / encode_ms:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
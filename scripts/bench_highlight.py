@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the JSON syntax highlighter in generate_site.py.
+
+Collects every ```json block under docs/, escapes it the way the
+fenced_code extension does, and times highlight_json() against the
+character-by-character highlighter it replaced (reproduced below as the
+baseline). Fails if the two ever produce different output.
+
+Usage:
+    python scripts/bench_highlight.py [--repeat N]
+"""
+
+import argparse
+import re
+import sys
+import time
+
+import generate_site as site
+
+# ---------------------------------------------------------------------------
+# Baseline: the character-by-character highlighter
+# ---------------------------------------------------------------------------
+
+def legacy_highlight_json(code_text):
+    result = []
+    i = 0
+    text = code_text
+    length = len(text)
+
+    while i < length:
+        ch = text[i]
+
+        if ch == '"' or ch == '&' and text[i:i+6] == '&quot;':
+            if ch == '&':
+                quote_str = '&quot;'
+                quote_len = 6
+            else:
+                quote_str = '"'
+                quote_len = 1
+
+            j = i + quote_len
+            while j < length:
+                if text[j] == '\\':
+                    j += 2
+                    continue
+                if text[j:j+quote_len] == quote_str:
+                    j += quote_len
+                    break
+                if text[j] == '&':
+                    if text[j:j+6] == '&quot;':
+                        j += 6
+                        break
+                j += 1
+            else:
+                j = length
+
+            token = text[i:j]
+            rest = text[j:j+10].lstrip()
+            if rest.startswith(':'):
+                result.append(f'<span class="tok-key">{token}</span>')
+            else:
+                result.append(f'<span class="tok-str">{token}</span>')
+            i = j
+            continue
+
+        if ch in '0123456789' or (ch == '-' and i + 1 < length and text[i+1] in '0123456789'):
+            j = i + 1
+            while j < length and text[j] in '0123456789.eE+-':
+                j += 1
+            result.append(f'<span class="tok-num">{text[i:j]}</span>')
+            i = j
+            continue
+
+        for keyword in ['true', 'false', 'null']:
+            if text[i:i+len(keyword)] == keyword:
+                result.append(f'<span class="tok-num">{keyword}</span>')
+                i += len(keyword)
+                break
+        else:
+            if ch in '{}[]':
+                result.append(f'<span class="tok-bracket">{ch}</span>')
+                i += 1
+            else:
+                result.append(ch)
+                i += 1
+
+    return ''.join(result)
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+JSON_BLOCK_RE = re.compile(r'^```json\n(.*?)^```', re.MULTILINE | re.DOTALL)
+
+
+def fenced_escape(code):
+    """Escape code the way Python-Markdown's fenced_code extension does."""
+    return (code.replace('&', '&amp;').replace('<', '&lt;')
+            .replace('>', '&gt;').replace('"', '&quot;'))
+
+
+def load_blocks():
+    blocks = []
+    for path in sorted((site.ROOT / "docs").rglob("*.md")):
+        text = path.read_text(encoding='utf-8')
+        blocks.extend(fenced_escape(m.group(1)) for m in JSON_BLOCK_RE.finditer(text))
+    return blocks
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def best_of(fn, blocks, repeat):
+    """Best wall time of highlighting every block, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for block in blocks:
+            fn(block)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    blocks = load_blocks()
+    mismatches = sum(1 for b in blocks if legacy_highlight_json(b) != site.highlight_json(b))
+    if mismatches:
+        print(f"ERROR: {mismatches} of {len(blocks)} blocks highlight differently", file=sys.stderr)
+        sys.exit(1)
+
+    size = sum(len(b) for b in blocks)
+    print(f"{len(blocks)} JSON blocks, {size / 1024:.1f} KB escaped, outputs identical\n")
+    print(f"{'input':<18}  {'legacy':>10}  {'regex':>10}  {'speedup':>7}")
+
+    # All example blocks, then one concatenated block at growing sizes to
+    # show that both stay linear and how far apart their constants are
+    cases = [("docs blocks", blocks)]
+    joined = "\n".join(blocks)
+    for factor in (1, 10, 100):
+        cases.append((f"joined x{factor}", [joined * factor]))
+
+    for label, corpus in cases:
+        repeat = max(1, args.repeat // max(1, len(corpus[0]) // 100000))
+        legacy_ms = best_of(legacy_highlight_json, corpus, repeat)
+        regex_ms = best_of(site.highlight_json, corpus, repeat)
+        print(f"{label:<18}  {legacy_ms:>8.2f}ms  {regex_ms:>8.2f}ms  {legacy_ms / regex_ms:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: decoded OCPP messages as dicts vs __slots__ classes.
+
+Decodes N copies of a payload with json.loads() and keeps them, then does
+the same through the generated class's from_dict() (generate_models.py,
+built in memory), and reports the retained bytes per message (tracemalloc)
+and the decode time of each. Payloads come in two shapes: the extractor's
+required-only example and one with every optional property present, with
+every array filled to a few items (see schema_payloads.py). Fails if
+any payload does not round-trip through to_dict().
+
+Usage:
+    python scripts/bench_models.py [--message TransactionEventRequest] [--count N]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import types
+
+import generate_models
+import schema_ir
+import schema_payloads
+
+DEFAULT_MESSAGES = ["TransactionEventRequest", "MeterValuesRequest"]
+VERSION = "2.0.1"
+
+
+def payloads(ir, file_name):
+    """{shape label: payload} for one schema file."""
+    schema_file = ir.files[file_name]
+    minimal = schema_payloads.example_payload(VERSION, schema_file)
+    full = schema_payloads.sample(schema_file, schema_file)
+    return {
+        "required only": schema_payloads.fill_arrays(minimal, schema_file, schema_file),
+        "all fields": schema_payloads.fill_arrays(full, schema_file, schema_file),
+    }
+
+
+def retained(decode, texts):
+    """Bytes still allocated after decoding every text, and the seconds
+    decoding takes (timed separately, without tracemalloc)."""
+    gc.collect()
+    start = time.perf_counter()
+    kept = [decode(text) for text in texts]
+    elapsed = time.perf_counter() - start
+    del kept
+
+    gc.collect()
+    tracemalloc.start()
+    kept = [decode(text) for text in texts]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--message", action="append", metavar="NAME",
+                        help=f"2.0.1 schema file to measure (repeatable; default: {', '.join(DEFAULT_MESSAGES)})")
+    parser.add_argument("--count", type=int, default=100000, help="messages kept per measurement")
+    args = parser.parse_args()
+
+    schema_dir = schema_payloads.VERSIONS[VERSION]["schema_dir"]
+    if not schema_dir.exists():
+        print(f"ERROR: Schema directory not found: {schema_dir}", file=sys.stderr)
+        sys.exit(1)
+    ir = schema_ir.load(schema_dir)
+    module = types.ModuleType("models")
+    exec(compile(generate_models.generate_module(VERSION, ir), "models", "exec"), module.__dict__)
+
+    print(f"{args.count:,} messages each\n")
+    print(f"{'message':<26}  {'payload':<13}  {'bytes':>6}  {'dict B/msg':>10}  {'slots B/msg':>11}  "
+          f"{'saved':>5}  {'dict us':>7}  {'slots us':>8}")
+    for file_name in args.message or DEFAULT_MESSAGES:
+        if file_name not in ir.files:
+            print(f"ERROR: No schema named {file_name}", file=sys.stderr)
+            sys.exit(1)
+        cls = getattr(module, file_name)
+        for label, payload in payloads(ir, file_name).items():
+            text = json.dumps(payload)
+            if cls.from_dict(json.loads(text)).to_dict() != payload:
+                print(f"ERROR: {file_name} ({label}) does not round-trip", file=sys.stderr)
+                sys.exit(1)
+            texts = [text] * args.count
+
+            dict_bytes, dict_s = retained(json.loads, texts)
+            slots_bytes, slots_s = retained(lambda t: cls.from_dict(json.loads(t)), texts)
+            per_dict = dict_bytes / args.count
+            per_slots = slots_bytes / args.count
+            print(f"{file_name:<26}  {label:<13}  {len(text):>6}  {per_dict:>10,.0f}  {per_slots:>11,.0f}  "
+                  f"{1 - per_slots / per_dict:>5.0%}  {dict_s / args.count * 1e6:>7.2f}  "
+                  f"{slots_s / args.count * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
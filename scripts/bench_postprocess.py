@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark the site generator's post-processing per page.
+
+Compares the heading pass (PageTreeprocessor) plus the single link, id
+and table scan (PagePostprocessor) in generate_site.py against the chain
+of regex passes they replaced (reproduced below as the baseline). Only
+post-processing is timed: the regex chain runs on pre-converted HTML, and
+the two passes are timed inside the Markdown conversion. The new passes
+also collect every page's anchors and links, which the chain did not.
+
+Usage:
+    python scripts/bench_postprocess.py [--repeat N]
+
+Dependencies:
+    pip install markdown
+"""
+
+import argparse
+import html
+import os
+import re
+import time
+
+import markdown
+
+import generate_site as site
+
+# ---------------------------------------------------------------------------
+# Baseline: the regex post-processing chain
+# ---------------------------------------------------------------------------
+
+def legacy_convert(text):
+    md = markdown.Markdown(
+        extensions=['tables', 'fenced_code', 'toc', 'md_in_html'],
+        extension_configs={'toc': {'permalink': False, 'slugify': site._slugify}},
+    )
+    return md.convert(site.preprocess_markdown(text))
+
+
+def legacy_override_heading_ids(body, is_index):
+    if not is_index:
+        return body
+
+    def _override(m):
+        tag, attrs, content = m.group(1), m.group(2), m.group(3)
+        text = re.sub(r'<[^>]+>', '', content).strip()
+        lookup = site.INDEX_HEADING_IDS if tag == 'h2' else site.INDEX_SUBHEADING_IDS
+        if text in lookup:
+            attrs = re.sub(r'id="[^"]*"', f'id="{lookup[text]}"', attrs)
+            return f'<{tag}{attrs}>{content}</{tag}>'
+        return m.group(0)
+
+    for tag in ('h2', 'h3', 'h4'):
+        body = re.sub(rf'<({tag})([^>]*)>(.*?)</\1>', _override, body)
+    return body
+
+
+def legacy_wrap_tables(body):
+    return re.sub(r'(<table.*?</table>)', r'<div class="table-wrap">\1</div>', body, flags=re.DOTALL)
+
+
+def legacy_highlight_json_blocks(body):
+    return re.sub(
+        r'<code class="language-json">(.*?)</code>',
+        lambda m: f'<code class="language-json">{site.highlight_json(m.group(1))}</code>',
+        body,
+        flags=re.DOTALL,
+    )
+
+
+def legacy_rewrite_md_links(body, source_rel, source_url):
+    def _rewrite(m):
+        return m.group(1) + site.rewrite_md_link(m.group(2), source_rel, source_url) + m.group(3)
+    return re.sub(r'(href="|src=")(.*?)(")', _rewrite, body)
+
+
+def legacy_extract_title(body):
+    m = re.search(r'<h1[^>]*>(.*?)</h1>', body)
+    if not m:
+        return "OCPP.md", body
+    title = html.unescape(re.sub(r'<[^>]+>', '', m.group(1)))
+    body = body[:m.start()] + body[m.end():]
+    body = re.sub(r'^\s*<hr\s*/?>', '', body, count=1)
+    return title, body
+
+
+def legacy_add_heading_anchors(body):
+    def _add_anchor(m):
+        tag, attrs, content = m.group(1), m.group(2), m.group(3)
+        id_match = re.search(r'id="([^"]+)"', attrs)
+        if not id_match:
+            return m.group(0)
+        anchor = (f'<a class="heading-anchor" href="#{id_match.group(1)}" '
+                  f'aria-label="Link to this section">#</a>')
+        return f'<{tag}{attrs}>{anchor}{content}</{tag}>'
+    return re.sub(r'<(h[234])([^>]*)>(.*?)</\1>', _add_anchor, body)
+
+
+def legacy_extract_h2_toc(body):
+    toc = []
+    for m in re.finditer(r'<h2[^>]*id="([^"]+)"[^>]*>(?:<a[^>]*>.*?</a>)?(.*?)</h2>', body):
+        text = html.unescape(re.sub(r'<[^>]+>', '', m.group(2)).strip())
+        toc.append((m.group(1), re.sub(r'^\d+\.\s*', '', text)))
+    return toc
+
+
+def legacy_postprocess(body, source_rel, url_path, is_index):
+    body = legacy_override_heading_ids(body, is_index)
+    body = legacy_wrap_tables(body)
+    body = legacy_highlight_json_blocks(body)
+    body = legacy_rewrite_md_links(body, source_rel, url_path)
+    title, body = legacy_extract_title(body)
+    body = legacy_add_heading_anchors(body)
+    toc = legacy_extract_h2_toc(body)
+    return title, body, toc
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def best_of(fn, repeat):
+    """Best wall time of fn() over repeat runs, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def time_page_passes(text, source_rel, url_path, is_index, repeat):
+    """Best wall time of PageTreeprocessor.run plus PagePostprocessor.run,
+    in milliseconds."""
+    samples = []
+    processors = (site.PageTreeprocessor, site.PagePostprocessor)
+    runs = [cls.run for cls in processors]
+
+    def timed(run):
+        def timed_run(self, arg):
+            start = time.perf_counter()
+            result = run(self, arg)
+            samples.append(time.perf_counter() - start)
+            return result
+        return timed_run
+
+    for cls, run in zip(processors, runs):
+        cls.run = timed(run)
+    try:
+        totals = []
+        for _ in range(repeat):
+            del samples[:]
+            site.convert_markdown(text, source_rel, url_path, is_index)
+            totals.append(sum(samples))
+    finally:
+        for cls, run in zip(processors, runs):
+            cls.run = run
+    return min(totals) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="runs per page (best is reported)")
+    args = parser.parse_args()
+
+    pages = site.CONTENT_FILES + [(site.INDEX_SOURCE, ".")]
+    rows = []
+    for source_rel, url_path in pages:
+        text = (site.ROOT / source_rel).read_text(encoding='utf-8')
+        is_index = source_rel == site.INDEX_SOURCE
+        converted = legacy_convert(text)
+
+        regex_ms = best_of(
+            lambda: legacy_postprocess(converted, source_rel, url_path, is_index), args.repeat)
+        tree_ms = time_page_passes(text, source_rel, url_path, is_index, args.repeat)
+        rows.append((source_rel, len(text), regex_ms, tree_ms))
+
+    name_width = max(len(os.path.basename(r[0])) for r in rows)
+    print(f"{'page':<{name_width}}  {'KB':>6}  {'regex chain':>11}  {'new passes':>10}  {'speedup':>7}")
+    total_regex = total_tree = 0.0
+    for source_rel, size, regex_ms, tree_ms in sorted(rows, key=lambda r: -r[1]):
+        total_regex += regex_ms
+        total_tree += tree_ms
+        print(f"{os.path.basename(source_rel):<{name_width}}  {size / 1024:>6.1f}  "
+              f"{regex_ms:>9.2f}ms  {tree_ms:>8.2f}ms  {regex_ms / tree_ms:>6.1f}x")
+    print(f"\nTotal: regex chain {total_regex:.1f}ms, new passes {total_tree:.1f}ms "
+          f"({total_regex / total_tree:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
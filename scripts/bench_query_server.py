@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark the stdio query server.
+
+Builds a query mix over every message and type of both versions (message,
+direction and schema of each message; type and usages of each type; enum
+values of each enum type) and measures:
+
+  - the startup time of the server process, until its first answer
+  - the latency of each query answered in process (Server.handle_line)
+  - the round trip of each query over the pipes of a running server
+
+Fails if any query returns an error.
+
+Usage:
+    python scripts/bench_query_server.py [--rounds N]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import query_server
+
+
+def queries(server) -> list:
+    """Request lines of the query mix."""
+    requests = []
+    for version, registry in server.registries.items():
+        for name in registry.messages:
+            for method in ("message", "direction", "schema"):
+                requests.append({"method": method, "params": {"name": name, "version": version}})
+        for name, row in registry.types.items():
+            for method in ("type", "usages"):
+                requests.append({"method": method, "params": {"name": name, "version": version}})
+            if row["kind"] == "enum":
+                requests.append({"method": "enum", "params": {"name": name, "version": version}})
+    return [json.dumps(dict(request, id=i)) for i, request in enumerate(requests)]
+
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50 {statistics.median(samples) * 1e6:>7.1f} µs   p99 {p99 * 1e6:>7.1f} µs"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5, help="passes over the query mix")
+    args = parser.parse_args()
+
+    server = query_server.Server(query_server.INDEX_PATHS)
+    lines = queries(server)
+    for line in lines:
+        response = json.loads(server.handle_line(line))
+        if "error" in response:
+            print(f"ERROR: {line}: {response['error']['message']}", file=sys.stderr)
+            sys.exit(1)
+
+    in_process = []
+    for _ in range(args.rounds):
+        for line in lines:
+            start = time.perf_counter()
+            server.handle_line(line)
+            in_process.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, str(Path(query_server.__file__))],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding="utf-8")
+    try:
+        process.stdin.write('{"method": "versions"}\n')
+        process.stdin.flush()
+        process.stdout.readline()
+        startup = time.perf_counter() - start
+
+        round_trips = []
+        for _ in range(args.rounds):
+            for line in lines:
+                start = time.perf_counter()
+                process.stdin.write(line + "\n")
+                process.stdin.flush()
+                process.stdout.readline()
+                round_trips.append(time.perf_counter() - start)
+    finally:
+        process.stdin.close()
+        process.wait()
+
+    print(f"{len(lines)} queries x {args.rounds} rounds, all answered\n")
+    print(f"startup (first answer)   {startup * 1000:>7.1f} ms")
+    print(f"in process               {percentiles(in_process)}")
+    print(f"over stdio (round trip)  {percentiles(round_trips)}")
+
+
+if __name__ == "__main__":
+    main()
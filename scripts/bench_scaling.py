@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for the site generator on synthetic corpora.
+
+Generates markdown shaped like the real docs -- schema block pages with
+wide field tables, <details> JSON examples and dense links into a shared
+data-types page and into other blocks -- at several multiples of the real
+site's size (1x = one data-types page plus one page per 2.0.1 schema block
+per group, about the size of docs/). Each scale is built from scratch by
+generate_site.build() in a fresh process, so peak RSS is per run.
+
+Records pages, input size, wall time, time per page, throughput and peak
+RSS per scale, prints a table and saves everything as JSON. "vs 1x" is the
+time per page relative to the smallest scale: it stays near 1.0 while the
+pipeline scales linearly.
+
+Usage:
+    python scripts/bench_scaling.py [--scales 1,10,100] [--jobs N] [--output PATH]
+
+Dependencies:
+    pip install markdown
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import markdown
+
+import generate_site as site
+
+DEFAULT_OUTPUT = site.ROOT / "bench-scaling.json"
+
+# Shape of one group (1x): one shared data-types page and the block pages
+# that link into it, sized after docs/OCPP-2.0.1-DataTypes.md and
+# docs/OCPP-2.0.1-Schemas/
+BLOCKS_PER_GROUP = 27
+TYPES_PER_GROUP = 40
+MESSAGES_PER_BLOCK = 4
+LOCAL_TYPES_PER_BLOCK = 2
+FIELDS_PER_TABLE = 6
+SEE_ALSO_LINKS = 2
+
+WORDS = (
+    "charging station transaction meter value connector evse identifier status "
+    "request response profile schedule limit period reservation firmware update "
+    "certificate security event report variable component monitor display message "
+    "authorization token tariff cost energy power current voltage phase sampled "
+    "interval shall optional required maximum minimum configured local central"
+).split()
+PRIMITIVES = ["string", "integer", "number", "boolean", "string (date-time)"]
+CONSTRAINTS = ["", "", "maxLength: 36", "maxLength: 255", "minimum: 0", "minItems: 1"]
+
+
+# ---------------------------------------------------------------------------
+# Corpus generation
+# ---------------------------------------------------------------------------
+
+def _words(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _camel(rng, n):
+    return "".join(rng.choice(WORDS).capitalize() for _ in range(n))
+
+
+def _table(rng, type_cells):
+    rows = [
+        "| Field | Type | Required | Constraints | Description |",
+        "|-------|------|----------|-------------|-------------|",
+    ]
+    for _ in range(FIELDS_PER_TABLE):
+        field = _camel(rng, 2)
+        field = field[0].lower() + field[1:]
+        required = "**Yes**" if rng.random() < 0.4 else "No"
+        rows.append(f"| `{field}` | {rng.choice(type_cells)} | {required} | "
+                    f"{rng.choice(CONSTRAINTS)} | {_words(rng, rng.randint(4, 24)).capitalize()}. |")
+    return "\n".join(rows)
+
+
+def _example(rng, depth=0):
+    obj = {}
+    for _ in range(rng.randint(2, 5)):
+        key = _camel(rng, 2)
+        key = key[0].lower() + key[1:]
+        roll = rng.random()
+        if roll < 0.25 and depth < 2:
+            obj[key] = _example(rng, depth + 1)
+        elif roll < 0.4:
+            obj[key] = [rng.randint(0, 100) for _ in range(rng.randint(1, 3))]
+        elif roll < 0.7:
+            obj[key] = _words(rng, 1)
+        elif roll < 0.85:
+            obj[key] = rng.randint(-10, 10000)
+        else:
+            obj[key] = rng.random() < 0.5
+    return obj
+
+
+def generate_group(rng, g, docs):
+    """Write one group's pages below docs/ and return their CONTENT_FILES entries."""
+    group_dir = docs / f"g{g}"
+    (group_dir / "Schemas").mkdir(parents=True)
+
+    types = [f"{_camel(rng, 2)}{g}x{i}Type" for i in range(TYPES_PER_GROUP)]
+    blocks = [f"Block{b}" for b in range(BLOCKS_PER_GROUP)]
+    messages = {block: [f"{_camel(rng, 2)}{g}x{b}x{m}"
+                        for m in range(MESSAGES_PER_BLOCK)]
+                for b, block in enumerate(blocks)}
+
+    # Shared data types
+    lines = [f"# Synthetic Data Types {g}", "", "## Types", ""]
+    lines += [f"- [{name}](#{name.lower()})" for name in types]
+    for name in types:
+        cells = PRIMITIVES + [f"[{t}](#{t.lower()})" for t in rng.sample(types, 3)]
+        used_in = ", ".join(
+            f"[{block}](Schemas/{block}.md#{messages[block][0].lower()})"
+            for block in rng.sample(blocks, 3))
+        lines += ["", "---", "", f"## {name}", "", _words(rng, 20).capitalize() + ".",
+                  "", f"**Used in:** {used_in}", "", _table(rng, cells)]
+    (group_dir / "DataTypes.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    pages = [(f"docs/g{g}/DataTypes.md", f"g{g}/data-types")]
+
+    # Schema blocks
+    for block in blocks:
+        local = [f"{_camel(rng, 2)}{block}Local{i}Type" for i in range(LOCAL_TYPES_PER_BLOCK)]
+        cells = (PRIMITIVES
+                 + [f"[{t}](../DataTypes.md#{t.lower()})" for t in rng.sample(types, 12)]
+                 + [f"[{t}](#{t.lower()})" for t in local])
+        lines = [f"# Synthetic Schemas {g} — {block}", "",
+                 "> **Types Reference:** Shared types are defined in "
+                 "[DataTypes.md](../DataTypes.md).", "", "## Messages", ""]
+        lines += [f"- [{m}](#{m.lower()})" for m in messages[block]]
+        for message in messages[block]:
+            others = [b for b in blocks if b != block]
+            see_also = ", ".join(
+                f"[{m}]({b}.md#{m.lower()})"
+                for b in rng.sample(others, SEE_ALSO_LINKS)
+                for m in [rng.choice(messages[b])])
+            lines += ["", "---", "", f"## {message}", "", "**Direction:** CSMS → CS", "",
+                      f"**See also:** {see_also}"]
+            for kind in ("Request", "Response"):
+                lines += ["", f"### {message}{kind}", "", _table(rng, cells), "", "",
+                          "<details>", f"<summary>Example {message}{kind}</summary>", "",
+                          "```json", json.dumps(_example(rng), indent=2), "```", "",
+                          "</details>"]
+        lines += ["", "---", "", "## Local Types"]
+        for name in local:
+            lines += ["", f"### {name}", "", _table(rng, cells)]
+        (group_dir / "Schemas" / f"{block}.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        pages.append((f"docs/g{g}/Schemas/{block}.md", f"g{g}/schemas/{block.lower()}"))
+    return pages
+
+
+def generate_corpus(root: Path, scale: int, seed: int) -> list:
+    """Write a corpus of `scale` groups below root and return its CONTENT_FILES."""
+    rng = random.Random(seed)
+    docs = root / "docs"
+    docs.mkdir(parents=True)
+    pages = []
+    for g in range(scale):
+        pages += generate_group(rng, g, docs)
+
+    lines = ["# Synthetic corpus", "", "## Pages", ""]
+    lines += [f"- [{url}]({os.path.relpath(src, 'docs')})" for src, url in pages]
+    (docs / "index.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return pages
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def run_build(root: Path, jobs: int) -> dict:
+    """Build the corpus in root with generate_site, in this process.
+
+    Points generate_site's configuration at the corpus; the process is
+    expected to exit afterwards.
+    """
+    pages = [tuple(p) for p in json.loads((root / "pages.json").read_text(encoding="utf-8"))]
+    site.ROOT = root
+    site.OUTPUT_DIR = root / "public"
+    site.MANIFEST_PATH = root / ".site-manifest.json"
+    site.INDEX_SOURCE = "docs/index.md"
+    site.CONTENT_FILES = pages
+    site.MD_TO_URL = {os.path.normpath(src): url for src, url in pages}
+    site.ROUTES.clear()
+    site._RESOLVED_PATHS.clear()
+    site.STATIC_FILES = []
+    site.STANDALONE_PAGES = []
+
+    args = argparse.Namespace(
+        external_assets=False, precompress=False, watch=False, jobs=jobs, profile=None)
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        broken = site.build(args, incremental=False)
+    seconds = time.perf_counter() - start
+
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    return {
+        "seconds": seconds,
+        "broken_anchors": len(broken),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2**20,
+        "peak_worker_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 2**20,
+    }
+
+
+def bench_scale(scale: int, jobs: int, seed: int, workdir: Path) -> dict:
+    root = workdir / f"scale-{scale}"
+    pages = generate_corpus(root, scale, seed)
+    (root / "pages.json").write_text(json.dumps(pages), encoding="utf-8")
+    md_bytes = sum((root / src).stat().st_size for src, _url in pages)
+    md_bytes += (root / "docs" / "index.md").stat().st_size
+
+    proc = subprocess.run(
+        [sys.executable, __file__, "--run", str(root), "--jobs", str(jobs)],
+        check=True, capture_output=True, text=True)
+    result = json.loads(proc.stdout)
+
+    count = len(pages) + 1  # + root index
+    seconds = result["seconds"]
+    return {
+        "scale": scale,
+        "pages": count,
+        "markdown_mb": round(md_bytes / 2**20, 3),
+        "seconds": round(seconds, 3),
+        "ms_per_page": round(seconds * 1000 / count, 3),
+        "pages_per_second": round(count / seconds, 2),
+        "mb_per_second": round(md_bytes / 2**20 / seconds, 3),
+        "peak_rss_mb": round(result["peak_rss_mb"], 1),
+        "peak_worker_rss_mb": round(result["peak_worker_rss_mb"], 1),
+        "broken_anchors": result["broken_anchors"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", default="1,10,100",
+                        help="comma-separated corpus multiples (default: 1,10,100)")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="generate_site --jobs for every build (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT,
+                        help=f"JSON results file (default: {DEFAULT_OUTPUT.name})")
+    parser.add_argument("--run", type=Path, help=argparse.SUPPRESS)  # internal: one build
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_build(args.run, args.jobs)))
+        return
+
+    scales = [int(s) for s in args.scales.split(",")]
+    print(f"{'scale':>5}  {'pages':>6}  {'MB':>6}  {'seconds':>8}  {'ms/page':>8}  "
+          f"{'pages/s':>8}  {'MB/s':>6}  {'RSS MB':>7}  {'vs 1x':>5}")
+    results = []
+    with tempfile.TemporaryDirectory(prefix="ocpp-bench-") as tmp:
+        for scale in scales:
+            row = bench_scale(scale, args.jobs, args.seed, Path(tmp))
+            row["vs_smallest"] = round(row["ms_per_page"] / (results or [row])[0]["ms_per_page"], 2)
+            results.append(row)
+            rss = max(row["peak_rss_mb"], row["peak_worker_rss_mb"])
+            print(f"{scale:>4}x  {row['pages']:>6}  {row['markdown_mb']:>6.1f}  "
+                  f"{row['seconds']:>8.2f}  {row['ms_per_page']:>8.1f}  "
+                  f"{row['pages_per_second']:>8.1f}  {row['mb_per_second']:>6.2f}  "
+                  f"{rss:>7.1f}  {row['vs_smallest']:>5.2f}", flush=True)
+
+    report = {
+        "python": platform.python_version(),
+        "markdown": markdown.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "jobs": args.jobs,
+        "seed": args.seed,
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"\nSaved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
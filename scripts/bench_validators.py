@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Validator throughput benchmark on a synthetic OCPP traffic corpus.
+
+Builds a corpus of inbound frames shaped like CSMS traffic -- mostly
+MeterValues, TransactionEvent (1.6J: Start/StopTransaction),
+StatusNotification and Heartbeat, plus a tail of every other message --
+from the extractors' example payloads (generate_example_payload /
+generate_example, expanded past the docs' depth cap, with every array
+filled to a few items). Each payload is validated by the compiled
+validators of generate_validators.py and, if installed, by a generic
+jsonschema validator, checking that both agree.
+
+Records messages per second (best of --repeat passes over the corpus) and
+p50/p99 per-message latency, overall and per message, prints a table and
+saves everything as JSON so results can be tracked across releases.
+
+Usage:
+    python scripts/bench_validators.py [--version {2.0.1,1.6J}] [--messages N] [--output PATH]
+
+Dependencies:
+    pip install jsonschema  # optional, for the generic baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+
+import schema_ir
+import schema_payloads
+
+try:
+    import jsonschema
+    from importlib.metadata import version as _package_version
+except ImportError:  # optional: the generic baseline is then skipped
+    jsonschema = None
+
+DEFAULT_OUTPUT = schema_payloads.REPO_ROOT / "bench-validators.json"
+
+# Share of the corpus per request message; the rest is spread evenly over
+# both sides of every other message
+TRAFFIC_MIX = {
+    "2.0.1": {"MeterValues": 40, "TransactionEvent": 25, "StatusNotification": 15, "Heartbeat": 10},
+    "1.6J": {"MeterValues": 40, "StartTransaction": 8, "StopTransaction": 7,
+             "StatusNotification": 20, "Heartbeat": 15},
+}
+OTHER_SHARE = 10
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+def build_corpus(version, ir, size, seed):
+    """Return [(message, side, payload)], with payloads decoded from JSON
+    text one by one so that no two share objects."""
+    frames = {}
+    for msg in ir.messages.values():
+        for side in ("request", "response"):
+            schema_file = getattr(msg, side)
+            if schema_file is not None:
+                payload = schema_payloads.fill_arrays(
+                    schema_payloads.example_payload(version, schema_file), schema_file, schema_file)
+                frames[(msg.name, side)] = json.dumps(payload)
+
+    mix = TRAFFIC_MIX[version]
+    keys, weights = [], []
+    for name, share in mix.items():
+        if (name, "request") in frames:
+            keys.append((name, "request"))
+            weights.append(share)
+    others = [key for key in frames if key[0] not in mix]
+    for key in others:
+        keys.append(key)
+        weights.append(OTHER_SHARE / len(others))
+
+    rng = random.Random(seed)
+    return [(name, side, json.loads(frames[(name, side)]))
+            for name, side in rng.choices(keys, weights, k=size)]
+
+
+# ---------------------------------------------------------------------------
+# Validators
+# ---------------------------------------------------------------------------
+
+def jsonschema_validators(version, ir):
+    """{(message, side): validate} returning every jsonschema error, the
+    same work the compiled validators do."""
+    schema_dir = schema_payloads.VERSIONS[version]["schema_dir"]
+    validators = {}
+    for msg in ir.messages.values():
+        for side in ("request", "response"):
+            schema_file = getattr(msg, side)
+            if schema_file is None:
+                continue
+            with open(schema_dir / f"{schema_file.name}.json") as f:
+                schema = json.load(f)
+            validator = jsonschema.validators.validator_for(schema)(schema)
+            validators[(msg.name, side)] = lambda payload, v=validator: list(v.iter_errors(payload))
+    return validators
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_ns, fraction):
+    return sorted_ns[min(len(sorted_ns) - 1, int(len(sorted_ns) * fraction))] / 1000
+
+
+def bench(validators, corpus, repeat):
+    """Throughput over the whole corpus and per-message latency."""
+    calls = [(validators[(name, side)], payload) for name, side, payload in corpus]
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for validate, payload in calls:
+            validate(payload)
+        best = min(best, time.perf_counter() - start)
+
+    latencies = {}
+    clock = time.perf_counter_ns
+    for (name, _side, _payload), (validate, payload) in zip(corpus, calls):
+        start = clock()
+        validate(payload)
+        latencies.setdefault(name, []).append(clock() - start)
+
+    every = sorted(ns for samples in latencies.values() for ns in samples)
+    per_message = {}
+    for name, samples in sorted(latencies.items(), key=lambda item: -len(item[1])):
+        samples.sort()
+        per_message[name] = {
+            "count": len(samples),
+            "p50_us": round(percentile(samples, 0.50), 2),
+            "p99_us": round(percentile(samples, 0.99), 2),
+        }
+    return {
+        "messages_per_second": round(len(calls) / best),
+        "p50_us": round(percentile(every, 0.50), 2),
+        "p99_us": round(percentile(every, 0.99), 2),
+        "per_message": per_message,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--version", choices=sorted(schema_payloads.VERSIONS), action="append",
+                        help="benchmark only this OCPP version (repeatable; default: all)")
+    parser.add_argument("--messages", type=int, default=20000, help="corpus size per version")
+    parser.add_argument("--repeat", type=int, default=3, help="throughput passes (best is reported)")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT,
+                        help=f"JSON results file (default: {DEFAULT_OUTPUT.name})")
+    args = parser.parse_args()
+
+    if jsonschema is None:
+        print("jsonschema not installed; benchmarking the compiled validators only "
+              "(pip install jsonschema)\n")
+
+    results = {}
+    for version in args.version or list(schema_payloads.VERSIONS):
+        schema_dir = schema_payloads.VERSIONS[version]["schema_dir"]
+        if not schema_dir.exists():
+            print(f"ERROR: Schema directory not found: {schema_dir}", file=sys.stderr)
+            sys.exit(1)
+        ir = schema_ir.load(schema_dir)
+        corpus = build_corpus(version, ir, args.messages, args.seed)
+
+        candidates = {"compiled": schema_payloads.compiled_validators(version, ir)}
+        if jsonschema is not None:
+            candidates["jsonschema"] = jsonschema_validators(version, ir)
+
+        # Every validator must reach the same verdict on every frame
+        verdicts = [[not validators[(name, side)](payload) for name, side, payload in corpus]
+                    for validators in candidates.values()]
+        if any(v != verdicts[0] for v in verdicts):
+            print(f"ERROR: OCPP {version}: validators disagree on the corpus", file=sys.stderr)
+            sys.exit(1)
+
+        valid = sum(verdicts[0])
+        mix = {}
+        for name, _side, _payload in corpus:
+            mix[name] = mix.get(name, 0) + 1
+        print(f"OCPP {version}: {len(corpus)} frames ({valid} valid), "
+              + ", ".join(f"{name} {count}" for name, count in sorted(mix.items(), key=lambda i: -i[1])[:4]))
+        print(f"  {'validator':<12}  {'msgs/s':>10}  {'p50 us':>8}  {'p99 us':>8}  {'speedup':>7}")
+
+        rows = {label: bench(validators, corpus, args.repeat) for label, validators in candidates.items()}
+        baseline = rows.get("jsonschema")
+        for label, row in rows.items():
+            speedup = f"{row['messages_per_second'] / baseline['messages_per_second']:>6.1f}x" if baseline else ""
+            print(f"  {label:<12}  {row['messages_per_second']:>10,}  {row['p50_us']:>8.2f}  "
+                  f"{row['p99_us']:>8.2f}  {speedup:>7}")
+        results[version] = {"frames": len(corpus), "valid": valid, "mix": mix, "validators": rows}
+        print()
+
+    report = {
+        "python": platform.python_version(),
+        "jsonschema": _package_version("jsonschema") if jsonschema is not None else None,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "messages": args.messages,
+        "seed": args.seed,
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Per-message and per-type chunks of the generated schema docs.
+
+An agent answering "what fields does TransactionEvent have?" only needs
+one section of OCPP-2.0.1-Schemas-Transactions.md, not the whole block
+file. With --chunks the extractors split their markdown, after it is
+rendered, at the message and type headings and write each section to
+its own file:
+
+  <schemas dir>/chunks/messages/<Message>.md
+  <schemas dir>/chunks/types/<Type>.md      (2.0.1: local and shared types)
+
+Chunks are copies of the block file sections, with relative links
+rewritten: links to another chunked section point at its chunk, other
+links at the original file. A manifest next to the block files maps each
+message and type to its chunk, its source file, its line range there
+(1-based, inclusive) and its byte offset and length, and lists the types
+it links to:
+
+  {"version": "2.0.1",
+   "messages": {"Authorize": {"chunk": "chunks/messages/Authorize.md",
+                              "source": "OCPP-2.0.1-Schemas-Authorization.md",
+                              "lines": [17, 52], "offset": 822, "length": 2841,
+                              "types": ["IdTokenType", ...]}, ...},
+   "types": {...}}
+
+Run on a manifest, this script reports the token savings of a typical
+lookup (a message, alone or with the types it links to) read from chunks
+instead of whole files:
+
+Usage:
+    python scripts/doc_chunks.py docs/OCPP-2.0.1-Schemas/OCPP-2.0.1-Schemas-Chunks.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import generated_files
+
+CHUNKS_DIRNAME = "chunks"
+
+# Rough token estimate for markdown: bytes per token
+TOKEN_BYTES = 4
+
+LINK_RE = re.compile(r"\]\(([^)\s]+)\)")
+
+
+def slug(heading: str) -> str:
+    """GitHub-style anchor of a heading text."""
+    return re.sub(r"[^\w\- ]", "", heading.strip().lower()).replace(" ", "-")
+
+
+class Chunk:
+    """One section of a source markdown file."""
+
+    __slots__ = ("kind", "name", "source", "path", "lines", "offset", "length", "text", "types")
+
+    def __init__(self, kind, name, source, path, lines, offset, length, text):
+        self.kind = kind  # "messages" or "types"
+        self.name = name
+        self.source = source
+        self.path = path
+        self.lines = lines
+        self.offset = offset
+        self.length = length
+        self.text = text
+        self.types = []
+
+
+def split(source: Path, content: str, headings: dict, chunk_dir: Path) -> list:
+    """Chunks of content at the given headings.
+
+    headings maps a heading line ("## Authorize", "### IdTokenType") to
+    (kind, name). A section runs to the next heading of the same or a
+    higher level; trailing "---" rules and blank lines are left out.
+    """
+    lines = content.split("\n")
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line.encode()) + 1)
+
+    chunks = []
+    for start, line in enumerate(lines):
+        if line not in headings:
+            continue
+        kind, name = headings[line]
+        level = len(line) - len(line.lstrip("#"))
+        end = start + 1
+        while end < len(lines):
+            marks = len(lines[end]) - len(lines[end].lstrip("#"))
+            if 0 < marks <= level and lines[end][marks:marks + 1] == " ":
+                break
+            end += 1
+        while end > start + 1 and lines[end - 1].strip() in ("", "---"):
+            end -= 1
+        chunks.append(Chunk(kind, name, source, chunk_dir / kind / f"{name}.md",
+                            [start + 1, end], offsets[start], offsets[end] - 1 - offsets[start],
+                            "\n".join(lines[start:end])))
+    return chunks
+
+
+def _relpath(path: Path, start: Path) -> str:
+    return Path(os.path.relpath(path, start)).as_posix()
+
+
+def relink(chunk: Chunk, targets: dict) -> str:
+    """Chunk text with its relative links made valid from the chunk file.
+
+    targets maps (source path, anchor) of every chunked section to its
+    chunk; the chunk's types list collects the types it links to.
+    """
+    own = {slug(line.lstrip("#")) for line in chunk.text.split("\n") if line.startswith("#")}
+    chunk_dir = chunk.path.parent
+
+    def rewrite(m):
+        target = m.group(1)
+        if "://" in target or target.startswith("mailto:"):
+            return m.group(0)
+        path, _, anchor = target.partition("#")
+        if not path and anchor in own:
+            return m.group(0)
+        resolved = Path(os.path.normpath(chunk.source.parent / path)) if path else chunk.source
+        linked = targets.get((resolved, anchor))
+        if linked is not None and linked is not chunk:
+            if linked.kind == "types" and linked.name not in chunk.types:
+                chunk.types.append(linked.name)
+            return f"]({_relpath(linked.path, chunk_dir)})"
+        return f"]({_relpath(resolved, chunk_dir)}{'#' + anchor if anchor else ''})"
+
+    return LINK_RE.sub(rewrite, chunk.text)
+
+
+def write(version: str, manifest_path: Path, chunks: list) -> tuple:
+    """Write every chunk and the manifest; remove chunk files of sections
+    that no longer exist. Returns (written paths, removed paths, the
+    chunks without duplicates)."""
+    # A local type documented in two block files is chunked once, from
+    # the first; links into either section lead to that chunk
+    unique = {}
+    targets = {}
+    for chunk in chunks:
+        first = unique.setdefault((chunk.kind, chunk.name), chunk)
+        targets[(chunk.source, slug(chunk.name))] = first
+    chunks = list(unique.values())
+    base = manifest_path.parent
+    manifest = {"version": version, "messages": {}, "types": {}}
+    written, removed = [], []
+    for chunk in chunks:
+        chunk.path.parent.mkdir(parents=True, exist_ok=True)
+        start, end = chunk.lines
+        header = f"<!-- {chunk.source.name}, lines {start}-{end}. Generated; do not edit. -->"
+        if generated_files.write_if_changed(chunk.path, f"{header}\n\n{relink(chunk, targets)}\n"):
+            written.append(chunk.path)
+        manifest[chunk.kind][chunk.name] = {
+            "chunk": _relpath(chunk.path, base),
+            "source": _relpath(chunk.source, base),
+            "lines": chunk.lines,
+            "offset": chunk.offset,
+            "length": chunk.length,
+            "types": chunk.types,
+        }
+
+    paths = {chunk.path for chunk in chunks}
+    for chunk_dir in {chunk.path.parent for chunk in chunks}:
+        for path in sorted(chunk_dir.glob("*.md")):
+            if path not in paths:
+                path.unlink()
+                removed.append(path)
+
+    if generated_files.write_if_changed(manifest_path, json.dumps(manifest, indent=1, ensure_ascii=False) + "\n"):
+        written.append(manifest_path)
+    return written, removed, chunks
+
+
+# ---------------------------------------------------------------------------
+# Savings
+# ---------------------------------------------------------------------------
+
+def tokens(byte_count: int) -> int:
+    return -(-byte_count // TOKEN_BYTES)
+
+
+def savings(manifest_path: Path) -> dict:
+    """Average tokens read per message lookup, from whole files and from
+    chunks: the message alone, and with the types it links to (one level,
+    as a reader following the links would)."""
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    base = manifest_path.parent
+    size = {}
+
+    def file_bytes(relative):
+        if relative not in size:
+            size[relative] = (base / relative).stat().st_size
+        return size[relative]
+
+    totals = {"files": 0, "chunks": 0, "files_with_types": 0, "chunks_with_types": 0}
+    messages = manifest["messages"].values()
+    for entry in messages:
+        types = [manifest["types"][name] for name in entry["types"]]
+        totals["files"] += tokens(file_bytes(entry["source"]))
+        totals["chunks"] += tokens(file_bytes(entry["chunk"]))
+        sources = {entry["source"]} | {t["source"] for t in types}
+        totals["files_with_types"] += sum(tokens(file_bytes(source)) for source in sources)
+        totals["chunks_with_types"] += tokens(file_bytes(entry["chunk"])) + sum(
+            tokens(file_bytes(t["chunk"])) for t in types)
+    return {key: total / len(messages) for key, total in totals.items()} if messages else totals
+
+
+def format_savings(averages: dict) -> list:
+    lines = []
+    for label, suffix in (("message", ""), ("message + linked types", "_with_types")):
+        whole, chunked = averages["files" + suffix], averages["chunks" + suffix]
+        if whole and (not suffix or chunked != averages["chunks"]):
+            lines.append(f"{label}: ~{whole:,.0f} tokens from whole files, ~{chunked:,.0f} from chunks "
+                         f"({1 - chunked / whole:.0%} saved)")
+    return lines
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the token savings of chunked schema docs.")
+    parser.add_argument("manifest", type=Path, nargs="+", help="*-Chunks.json file written by an extractor")
+    args = parser.parse_args()
+
+    for manifest_path in args.manifest:
+        if not manifest_path.exists():
+            print(f"ERROR: Manifest not found: {manifest_path}", file=sys.stderr)
+            sys.exit(1)
+        print(f"{manifest_path.name} (average per message lookup, {TOKEN_BYTES} bytes/token):")
+        for line in format_savings(savings(manifest_path)):
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
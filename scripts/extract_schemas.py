@@ -2,12 +2,26 @@
 """
 Extract OCPP 2.0.1 JSON schemas and generate markdown documentation.
 
-Reads all *Request.json / *Response.json from the schema directory,
-deduplicates shared types, and outputs:
+Reads all *Request.json / *Response.json from the schema directory (via
+the cached schema IR, see schema_ir.py), deduplicates shared types, and
+outputs:
   - OCPP-2.0.1-DataTypes.md
   - OCPP-2.0.1-Schemas-{Block}.md  (10 files)
+
+Reruns only regenerate outputs whose schema files changed (see
+build_dependency_graph), and files are only written when their content
+differs.
+
+With --chunks, each message and type section is also written to its own
+file with a manifest of line ranges (see doc_chunks.py).
+
+Usage:
+    python scripts/extract_schemas.py [--force] [--jobs N] [--chunks]
 """
 
+import argparse
+import functools
+import hashlib
 import json
 import os
 import re
@@ -15,14 +29,31 @@ import sys
 from collections import defaultdict
 from pathlib import Path
 
+import doc_chunks
+import generated_files
+import schema_index
+import schema_ir
+import token_report
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 
 SCHEMA_DIR = Path(__file__).resolve().parent.parent / "OCPP-2.0.1_JSON_schemas"
 REPO_ROOT = Path(__file__).resolve().parent.parent
-SCHEMAS_OUTPUT_DIR = REPO_ROOT / "OCPP-2.0.1-Schemas"  # block files go here
-DATATYPES_OUTPUT_DIR = REPO_ROOT  # DataTypes.md stays at repo root
+SCHEMAS_OUTPUT_DIR = REPO_ROOT / "docs" / "OCPP-2.0.1-Schemas"  # block files, index and chunks go here
+DATATYPES_OUTPUT_DIR = REPO_ROOT / "docs"
+DATATYPES_FILENAME = "OCPP-2.0.1-DataTypes.md"
+INDEX_PATH = SCHEMAS_OUTPUT_DIR / "OCPP-2.0.1-Schemas-Index"  # .json and .sqlite
+CHUNKS_MANIFEST_PATH = SCHEMAS_OUTPUT_DIR / "OCPP-2.0.1-Schemas-Chunks.json"
+
+# Input hash of every output from the previous run (see output_input_hash)
+MANIFEST_PATH = schema_ir.CACHE_DIR / "extract_schemas-manifest.json"
+
+# Hash of the extractor and the IR as loaded: a change to either may change
+# every output
+GENERATOR_HASH = hashlib.sha256(
+    Path(__file__).read_bytes() + schema_ir.MODULE_HASH.encode()).hexdigest()
 
 # Message → functional block mapping
 BLOCK_MAP = {
@@ -166,6 +197,16 @@ BLOCK_CODES = {
     "Display": "L",
 }
 
+# Hand-written guides linked from a block file's header, relative to the
+# block files
+BLOCK_DEEP_DIVES = {
+    "SmartCharging": (
+        "For conceptual explanations, composite schedule calculation, worked examples, and "
+        "implementation guidance, see the [Smart Charging Deep-Dive]"
+        "(../OCPP-2.0.1-SmartCharging/OCPP-2.0.1-SmartCharging.md)."
+    ),
+}
+
 # Threshold: types appearing in >= this many files go into DataTypes.md
 SHARED_TYPE_THRESHOLD = 3
 
@@ -173,137 +214,71 @@ SHARED_TYPE_THRESHOLD = 3
 # Parsing
 # ---------------------------------------------------------------------------
 
-def load_schemas():
-    """Load all schema JSON files, return dict keyed by filename stem."""
-    schemas = {}
-    for f in sorted(SCHEMA_DIR.glob("*.json")):
-        with open(f) as fh:
-            schemas[f.stem] = json.load(fh)
-    return schemas
-
-
+# Description cleaning patterns, compiled once (see clean_description)
+# OCA URN lines like "urn:x-oca:ocpp:uid:1:569324" or "urn:x-enexis:ecdm:uid:1:569198"
+DESC_URN_RE = re.compile(r'urn:x-[\w:-]+\n?')
+# Spec-internal field/class path lines at the START of descriptions.
+# OCA descriptions follow the pattern:
+#   "Field_ Path. Sub. Name\n<URN removed>\nActual description.\n"
+# After URN removal, the first line is the field path. Match patterns like:
+#   "Sampled_ Value. Context. Reading_ Context_ Code\n"
+#   "ID_ Token. Status. Authorization_ Status\n"
+#   "Meter_ Value\n"
+#   "Transaction\n"
+# Only match at absolute string start to avoid stripping real description lines.
+# Match lines containing "_ " (underscore-space) or ". " (dot-space) patterns,
+# or short single-word type names (<=30 chars, no spaces except with underscore).
+DESC_PATH_RES = [
+    re.compile(r'\A[\w][\w_ ]*(\.\s*[\w][\w_ ]*)+\s*\n'),  # dotted paths
+    re.compile(r'\A[\w]+_\s[\w_ ]*\s*\n'),  # underscore-space type names like "Meter_ Value"
+    re.compile(r'\A[A-Z][\w]{0,29}\s*\n'),  # short single-word type names like "Transaction"
+]
+# Spec cross-references <<ref-RFC5646,[RFC5646]>> → RFC 5646
+DESC_REF_RE = re.compile(r'<<ref-([^,>]+),\[([^\]]+)\]>>')
+# <<identifier,Display Text>> → Display Text
+DESC_XREF_RE = re.compile(r'<<[^,>]+,\s*([^>]+?)>>')
+# Any remaining << >> fragments
+DESC_FRAGMENT_RE = re.compile(r'<<[^>]*>>')
+DESC_SPACE_RE = re.compile(r'\s+')
+
+
+@functools.lru_cache(maxsize=None)
 def clean_description(desc):
-    """Clean up OCA schema descriptions for markdown."""
+    """Clean up OCA schema descriptions for markdown.
+
+    Memoized: shared types repeat the same descriptions in every schema
+    file that embeds them. ``clean_description.cache_info()`` has the
+    hit/miss counts.
+    """
     if not desc:
         return ""
     # Strip \r
     desc = desc.replace("\r\n", "\n").replace("\r", "")
     # Convert HTML entities FIRST (so regexes can match << >> etc.)
     desc = desc.replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
-    # Remove OCA URN lines like "urn:x-oca:ocpp:uid:1:569324" or "urn:x-enexis:ecdm:uid:1:569198"
-    desc = re.sub(r'urn:x-[\w:-]+\n?', '', desc)
-    # Remove spec-internal field/class path lines at the START of descriptions.
-    # OCA descriptions follow the pattern:
-    #   "Field_ Path. Sub. Name\n<URN removed>\nActual description.\n"
-    # After URN removal, the first line is the field path. Match patterns like:
-    #   "Sampled_ Value. Context. Reading_ Context_ Code\n"
-    #   "ID_ Token. Status. Authorization_ Status\n"
-    #   "Meter_ Value\n"
-    #   "Transaction\n"
-    # Only match at absolute string start to avoid stripping real description lines.
-    # Match lines containing "_ " (underscore-space) or ". " (dot-space) patterns,
-    # or short single-word type names (<=30 chars, no spaces except with underscore).
-    desc = re.sub(
-        r'\A[\w][\w_ ]*(\.\s*[\w][\w_ ]*)+\s*\n',  # dotted paths
-        '', desc
-    )
-    desc = re.sub(
-        r'\A[\w]+_\s[\w_ ]*\s*\n',  # underscore-space type names like "Meter_ Value"
-        '', desc
-    )
-    desc = re.sub(
-        r'\A[A-Z][\w]{0,29}\s*\n',  # short single-word type names like "Transaction"
-        '', desc
-    )
-    # Convert spec cross-references <<ref-RFC5646,[RFC5646]>> → RFC 5646
-    desc = re.sub(r'<<ref-([^,>]+),\[([^\]]+)\]>>', r'\2', desc)
-    # Convert <<identifier,Display Text>> → Display Text
-    desc = re.sub(r'<<[^,>]+,\s*([^>]+?)>>', r'\1', desc)
-    # Remove any remaining << >> fragments
-    desc = re.sub(r'<<[^>]*>>', '', desc)
+    desc = DESC_URN_RE.sub('', desc)
+    for pattern in DESC_PATH_RES:
+        desc = pattern.sub('', desc)
+    desc = DESC_REF_RE.sub(r'\2', desc)
+    desc = DESC_XREF_RE.sub(r'\1', desc)
+    desc = DESC_FRAGMENT_RE.sub('', desc)
     # Strip backtick formatting from cleaned references
     desc = desc.replace('`', '')
-    # Collapse multiple newlines
-    desc = re.sub(r'\n{2,}', ' ', desc)
-    # Trim and collapse whitespace
-    desc = re.sub(r'\s+', ' ', desc).strip()
+    # Collapse newlines and whitespace runs, and trim
+    desc = DESC_SPACE_RE.sub(' ', desc).strip()
     return desc
 
 
-def extract_type_name_from_ref(ref):
-    """Extract type name from $ref like '#/definitions/FooType'."""
-    return ref.split("/")[-1]
-
-
-# ---------------------------------------------------------------------------
-# Type Registry
-# ---------------------------------------------------------------------------
-
-def build_type_registry(schemas):
-    """
-    Build a registry of all types across all schema files.
-    Returns: { type_name: { "definition": {...}, "files": [filenames], "is_enum": bool } }
-    """
-    registry = {}
-
-    for filename, schema in schemas.items():
-        defs = schema.get("definitions", {})
-        for type_name, type_def in defs.items():
-            if type_name not in registry:
-                registry[type_name] = {
-                    "definition": type_def,
-                    "files": [],
-                    "is_enum": "enum" in type_def,
-                }
-            else:
-                # Pick the definition with the longest description (most informative)
-                existing_desc = registry[type_name]["definition"].get("description", "")
-                new_desc = type_def.get("description", "")
-                if len(new_desc) > len(existing_desc):
-                    registry[type_name]["definition"] = type_def
-            registry[type_name]["files"].append(filename)
-
-    return registry
-
-
-def build_message_registry(schemas):
-    """
-    Build a registry of all messages.
-    Returns: { message_name: { "request": {...}, "response": {...} } }
-    """
-    messages = {}
-
-    for filename, schema in schemas.items():
-        if filename.endswith("Request"):
-            msg_name = filename[:-len("Request")]
-        elif filename.endswith("Response"):
-            msg_name = filename[:-len("Response")]
-        else:
-            continue
-
-        if msg_name not in messages:
-            messages[msg_name] = {}
-
-        side = "request" if filename.endswith("Request") else "response"
-        messages[msg_name][side] = {
-            "properties": schema.get("properties", {}),
-            "required": schema.get("required", []),
-            "definitions": schema.get("definitions", {}),
-        }
-
-    return messages
-
-
 # ---------------------------------------------------------------------------
 # Classify types: shared (DataTypes.md) vs local (inline in block file)
 # ---------------------------------------------------------------------------
 
 def classify_types(type_registry):
-    """Split types into shared (for DataTypes.md) and local."""
+    """Split types (schema_ir.TypeInfo by name) into shared (for DataTypes.md) and local."""
     shared = {}
     local = {}
     for type_name, info in type_registry.items():
-        if len(info["files"]) >= SHARED_TYPE_THRESHOLD:
+        if len(info.files) >= SHARED_TYPE_THRESHOLD:
             shared[type_name] = info
         else:
             local[type_name] = info
@@ -321,7 +296,7 @@ def build_type_usage_map(type_registry):
     """
     usage = defaultdict(set)
     for type_name, info in type_registry.items():
-        for filename in info["files"]:
+        for filename in info.files:
             # Extract message name from filename
             if filename.endswith("Request"):
                 msg = filename[:-len("Request")]
@@ -333,6 +308,71 @@ def build_type_usage_map(type_registry):
     return {k: sorted(v) for k, v in usage.items()}
 
 
+# ---------------------------------------------------------------------------
+# Dependency graph (incremental extraction)
+# ---------------------------------------------------------------------------
+
+def block_filename(block_name):
+    return f"OCPP-2.0.1-Schemas-{block_name}.md"
+
+
+def build_dependency_graph(message_registry, type_registry, shared_types):
+    """
+    Map each output filename to the schema files (stems) its content is
+    derived from.
+
+    A block file reads its messages' request/response files, plus every
+    file that defines a type those files embed: together they decide the
+    type's winning definition, whether it is shared (and so how it is
+    linked) and its "Used in" list. DataTypes.md reads every file that
+    defines a shared type. A type crossing SHARED_TYPE_THRESHOLD always
+    adds or removes a file from these sets.
+    """
+    graph = {}
+
+    shared_files = set()
+    for info in shared_types.values():
+        shared_files.update(info.files)
+    graph[DATATYPES_FILENAME] = shared_files
+
+    for block_name, messages_in_block in BLOCK_MAP.items():
+        files = set()
+        for msg_name in messages_in_block:
+            msg = message_registry.get(msg_name)
+            for side_data in (msg.request, msg.response) if msg else ():
+                if not side_data:
+                    continue
+                files.add(side_data.name)
+                for type_name in side_data.definitions:
+                    files.update(type_registry[type_name].files)
+        graph[block_filename(block_name)] = files
+
+    return graph
+
+
+def output_input_hash(schema_files, file_hashes):
+    """Hash the generator and the given schema files' contents."""
+    digest = hashlib.sha256(GENERATOR_HASH.encode())
+    for name in sorted(schema_files):
+        digest.update(f"{name}\0{file_hashes[name]}\n".encode())
+    return digest.hexdigest()
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2)
+        f.write("\n")
+
+
 # ---------------------------------------------------------------------------
 # Markdown generation helpers
 # ---------------------------------------------------------------------------
@@ -348,15 +388,15 @@ def format_type_ref(prop_def, type_name, is_shared, is_array=False):
     return link
 
 
-def resolve_field_type(prop_def, shared_types):
+def resolve_field_type(field, shared_types):
     """
-    Resolve a property definition to a display type string.
+    Resolve a schema_ir.Field to a display type string.
     Returns (type_string, constraints_string).
     """
     constraints = []
 
-    if "$ref" in prop_def:
-        type_name = extract_type_name_from_ref(prop_def["$ref"])
+    if field.ref is not None:
+        type_name = field.ref
         is_shared = type_name in shared_types
         if is_shared:
             type_str = f"[{type_name}](../OCPP-2.0.1-DataTypes.md#{type_name.lower()})"
@@ -364,52 +404,52 @@ def resolve_field_type(prop_def, shared_types):
             type_str = f"[{type_name}](#{type_name.lower()})"
         return type_str, ""
 
-    ptype = prop_def.get("type", "")
+    ptype = field.type or ""
 
     if ptype == "array":
-        items = prop_def.get("items", {})
-        if "$ref" in items:
-            type_name = extract_type_name_from_ref(items["$ref"])
+        items = field.items
+        if items.ref is not None:
+            type_name = items.ref
             is_shared = type_name in shared_types
             if is_shared:
                 inner = f"[{type_name}](../OCPP-2.0.1-DataTypes.md#{type_name.lower()})"
             else:
                 inner = f"[{type_name}](#{type_name.lower()})"
         else:
-            inner = items.get("type", "any")
+            inner = "any" if items.type is None else items.type
         type_str = f"{inner}[]"
 
-        if "minItems" in prop_def:
-            constraints.append(f"minItems: {prop_def['minItems']}")
-        if "maxItems" in prop_def:
-            constraints.append(f"maxItems: {prop_def['maxItems']}")
+        if field.min_items is not None:
+            constraints.append(f"minItems: {field.min_items}")
+        if field.max_items is not None:
+            constraints.append(f"maxItems: {field.max_items}")
         return type_str, ", ".join(constraints)
 
     if ptype == "string":
         type_str = "string"
-        fmt = prop_def.get("format")
+        fmt = field.format
         if fmt:
             type_str = f"string ({fmt})"
-        if "maxLength" in prop_def:
-            constraints.append(f"maxLength: {prop_def['maxLength']}")
-        if "minLength" in prop_def:
-            constraints.append(f"minLength: {prop_def['minLength']}")
+        if field.max_length is not None:
+            constraints.append(f"maxLength: {field.max_length}")
+        if field.min_length is not None:
+            constraints.append(f"minLength: {field.min_length}")
         return type_str, ", ".join(constraints)
 
     if ptype == "integer":
         type_str = "integer"
-        if "minimum" in prop_def:
-            constraints.append(f"min: {prop_def['minimum']}")
-        if "maximum" in prop_def:
-            constraints.append(f"max: {prop_def['maximum']}")
+        if field.minimum is not None:
+            constraints.append(f"min: {field.minimum}")
+        if field.maximum is not None:
+            constraints.append(f"max: {field.maximum}")
         return type_str, ", ".join(constraints)
 
     if ptype == "number":
         type_str = "number"
-        if "minimum" in prop_def:
-            constraints.append(f"min: {prop_def['minimum']}")
-        if "maximum" in prop_def:
-            constraints.append(f"max: {prop_def['maximum']}")
+        if field.minimum is not None:
+            constraints.append(f"min: {field.minimum}")
+        if field.maximum is not None:
+            constraints.append(f"max: {field.maximum}")
         return type_str, ", ".join(constraints)
 
     if ptype == "boolean":
@@ -418,66 +458,14 @@ def resolve_field_type(prop_def, shared_types):
     return ptype or "any", ", ".join(constraints)
 
 
-def resolve_field_type_for_datatype(prop_def, all_shared_types):
+def resolve_field_type_for_datatype(field, all_shared_types):
     """Same as resolve_field_type but links within DataTypes use local anchors."""
-    constraints = []
-
-    if "$ref" in prop_def:
-        type_name = extract_type_name_from_ref(prop_def["$ref"])
-        type_str = f"[{type_name}](#{type_name.lower()})"
-        return type_str, ""
-
-    ptype = prop_def.get("type", "")
-
-    if ptype == "array":
-        items = prop_def.get("items", {})
-        if "$ref" in items:
-            type_name = extract_type_name_from_ref(items["$ref"])
-            inner = f"[{type_name}](#{type_name.lower()})"
-        else:
-            inner = items.get("type", "any")
-        type_str = f"{inner}[]"
-        if "minItems" in prop_def:
-            constraints.append(f"minItems: {prop_def['minItems']}")
-        if "maxItems" in prop_def:
-            constraints.append(f"maxItems: {prop_def['maxItems']}")
-        return type_str, ", ".join(constraints)
-
-    if ptype == "string":
-        type_str = "string"
-        fmt = prop_def.get("format")
-        if fmt:
-            type_str = f"string ({fmt})"
-        if "maxLength" in prop_def:
-            constraints.append(f"maxLength: {prop_def['maxLength']}")
-        if "minLength" in prop_def:
-            constraints.append(f"minLength: {prop_def['minLength']}")
-        return type_str, ", ".join(constraints)
-
-    if ptype == "integer":
-        type_str = "integer"
-        if "minimum" in prop_def:
-            constraints.append(f"min: {prop_def['minimum']}")
-        if "maximum" in prop_def:
-            constraints.append(f"max: {prop_def['maximum']}")
-        return type_str, ", ".join(constraints)
-
-    if ptype == "number":
-        type_str = "number"
-        if "minimum" in prop_def:
-            constraints.append(f"min: {prop_def['minimum']}")
-        if "maximum" in prop_def:
-            constraints.append(f"max: {prop_def['maximum']}")
-        return type_str, ", ".join(constraints)
-
-    if ptype == "boolean":
-        return "boolean", ""
-
-    return ptype or "any", ", ".join(constraints)
+    # With no type counted as shared, every type link is a local anchor
+    return resolve_field_type(field, ())
 
 
 def generate_fields_table(properties, required_fields, shared_types, for_datatype=False):
-    """Generate a markdown table of fields for a message or type."""
+    """Generate a markdown table of fields ({name: schema_ir.Field}) for a message or type."""
     if not properties:
         return "*No fields (empty object).*\n"
 
@@ -492,18 +480,18 @@ def generate_fields_table(properties, required_fields, shared_types, for_datatyp
         return (is_custom, not is_required, field_name)
 
     for field_name in sorted(properties.keys(), key=sort_key):
-        prop_def = properties[field_name]
+        field = properties[field_name]
         is_required = field_name in required_fields
 
         if for_datatype:
-            type_str, constraint_str = resolve_field_type_for_datatype(prop_def, shared_types)
+            type_str, constraint_str = resolve_field_type_for_datatype(field, shared_types)
         else:
-            type_str, constraint_str = resolve_field_type(prop_def, shared_types)
+            type_str, constraint_str = resolve_field_type(field, shared_types)
 
-        desc = clean_description(prop_def.get("description", ""))
+        desc = clean_description(field.description)
 
         # Add default value to description if present
-        default = prop_def.get("default")
+        default = field.default
         if default is not None:
             desc_default = f"Default: `{default}`"
             if desc:
@@ -519,7 +507,11 @@ def generate_fields_table(properties, required_fields, shared_types, for_datatyp
 
 
 def generate_example_payload(properties, required_fields, definitions, depth=0):
-    """Generate a minimal valid JSON example with required fields only."""
+    """Generate a minimal valid JSON example with required fields only.
+
+    properties maps names to schema_ir.Field, definitions names to the
+    schema file's schema_ir.TypeDef.
+    """
     if depth > 3:
         return "{...}"
 
@@ -527,22 +519,22 @@ def generate_example_payload(properties, required_fields, definitions, depth=0):
     for field_name in sorted(required_fields):
         if field_name not in properties:
             continue
-        prop_def = properties[field_name]
-        obj[field_name] = _example_value(prop_def, definitions, depth)
+        field = properties[field_name]
+        obj[field_name] = _example_value(field, definitions, depth)
 
     return json.dumps(obj, indent=2)
 
 
-def _example_value(prop_def, definitions, depth):
-    """Generate an example value for a property."""
-    if "$ref" in prop_def:
-        type_name = extract_type_name_from_ref(prop_def["$ref"])
+def _example_value(field, definitions, depth):
+    """Generate an example value for a field."""
+    if field.ref is not None:
+        type_name = field.ref
         if type_name in definitions:
             sub_def = definitions[type_name]
-            if "enum" in sub_def:
-                return sub_def["enum"][0]
-            sub_props = sub_def.get("properties", {})
-            sub_req = sub_def.get("required", [])
+            if sub_def.enum is not None:
+                return sub_def.enum[0]
+            sub_props = sub_def.shape.fields
+            sub_req = sub_def.shape.required
             if depth < 2:
                 sub_obj = {}
                 for f in sub_req:
@@ -552,29 +544,28 @@ def _example_value(prop_def, definitions, depth):
             return "{...}"
         return "..."
 
-    ptype = prop_def.get("type", "")
+    ptype = field.type or ""
 
     if ptype == "string":
-        fmt = prop_def.get("format")
+        fmt = field.format
         if fmt == "date-time":
             return "2024-01-15T10:30:00Z"
-        enums = prop_def.get("enum")
+        enums = field.enum
         if enums:
             return enums[0]
         return "string"
 
     if ptype == "integer":
-        return prop_def.get("default", 0)
+        return 0 if field.default is None else field.default
 
     if ptype == "number":
-        return prop_def.get("default", 0.0)
+        return 0.0 if field.default is None else field.default
 
     if ptype == "boolean":
-        return prop_def.get("default", False)
+        return False if field.default is None else field.default
 
     if ptype == "array":
-        items = prop_def.get("items", {})
-        return [_example_value(items, definitions, depth + 1)]
+        return [_example_value(field.items, definitions, depth + 1)]
 
     return "..."
 
@@ -599,8 +590,8 @@ def generate_datatypes_md(shared_types, type_usage_map):
     lines.append("")
 
     # Separate enums and composite types
-    enums = {k: v for k, v in shared_types.items() if v["is_enum"]}
-    composites = {k: v for k, v in shared_types.items() if not v["is_enum"]}
+    enums = {k: v for k, v in shared_types.items() if v.is_enum}
+    composites = {k: v for k, v in shared_types.items() if not v.is_enum}
 
     lines.append(f"**{len(enums)} Enum Types** | **{len(composites)} Composite Types**")
     lines.append("")
@@ -629,8 +620,8 @@ def generate_datatypes_md(shared_types, type_usage_map):
 
     for name in sorted(enums.keys()):
         info = enums[name]
-        defn = info["definition"]
-        desc = clean_description(defn.get("description", ""))
+        defn = info.definition
+        desc = clean_description(defn.description)
 
         lines.append(f"### {name}")
         lines.append("")
@@ -639,14 +630,14 @@ def generate_datatypes_md(shared_types, type_usage_map):
             lines.append("")
 
         # Default value
-        default = defn.get("default")
+        default = defn.default
         if default is not None:
             lines.append(f"**Default:** `{default}`")
             lines.append("")
 
         lines.append("| Value |")
         lines.append("|-------|")
-        for val in defn["enum"]:
+        for val in defn.enum:
             lines.append(f"| `{val}` |")
         lines.append("")
 
@@ -665,10 +656,10 @@ def generate_datatypes_md(shared_types, type_usage_map):
 
     for name in sorted(composites.keys()):
         info = composites[name]
-        defn = info["definition"]
-        desc = clean_description(defn.get("description", ""))
-        props = defn.get("properties", {})
-        required = defn.get("required", [])
+        defn = info.definition
+        desc = clean_description(defn.description)
+        props = defn.shape.fields
+        required = defn.shape.required
 
         lines.append(f"### {name}")
         lines.append("")
@@ -704,6 +695,9 @@ def generate_block_md(block_name, messages_in_block, message_registry, shared_ty
     lines.append(f">")
     lines.append(f"> **Types Reference:** Shared types referenced below are defined in [OCPP-2.0.1-DataTypes.md](../OCPP-2.0.1-DataTypes.md).")
     lines.append(f"> Types used only within this block are documented [inline below](#local-types).")
+    if block_name in BLOCK_DEEP_DIVES:
+        lines.append(">")
+        lines.append(f"> **Deep-dive:** {BLOCK_DEEP_DIVES[block_name]}")
     lines.append("")
 
     # Table of contents
@@ -719,16 +713,15 @@ def generate_block_md(block_name, messages_in_block, message_registry, shared_ty
     # Collect local types for this block
     block_local_types = {}
     for msg_name in messages_in_block:
-        msg = message_registry.get(msg_name, {})
-        for side in ["request", "response"]:
-            side_data = msg.get(side, {})
-            for type_name in side_data.get("definitions", {}).keys():
+        msg = message_registry.get(msg_name)
+        for side_data in (msg.request, msg.response) if msg else ():
+            for type_name in side_data.definitions if side_data else ():
                 if type_name not in shared_types and type_name in local_types:
                     block_local_types[type_name] = local_types[type_name]
 
     # Messages
     for msg_name in messages_in_block:
-        msg = message_registry.get(msg_name, {})
+        msg = message_registry.get(msg_name)
         direction = DIRECTION_MAP.get(msg_name, "?")
 
         lines.append(f"## {msg_name}")
@@ -737,21 +730,20 @@ def generate_block_md(block_name, messages_in_block, message_registry, shared_ty
         lines.append("")
 
         # Request
-        req = msg.get("request", {})
+        req = msg.request if msg else None
         if req:
             lines.append(f"### {msg_name}Request")
             lines.append("")
 
-            props = {k: v for k, v in req["properties"].items()}
-            required = req["required"]
+            props = req.shape.fields
+            required = req.shape.required
 
             lines.append(generate_fields_table(props, required, shared_types))
             lines.append("")
 
             # Example
             if required:
-                example = generate_example_payload(
-                    req["properties"], required, req.get("definitions", {}))
+                example = generate_example_payload(props, required, req.definitions)
                 lines.append("<details>")
                 lines.append(f"<summary>Example {msg_name}Request</summary>")
                 lines.append("")
@@ -763,13 +755,13 @@ def generate_block_md(block_name, messages_in_block, message_registry, shared_ty
                 lines.append("")
 
         # Response
-        resp = msg.get("response", {})
+        resp = msg.response if msg else None
         if resp:
             lines.append(f"### {msg_name}Response")
             lines.append("")
 
-            props = {k: v for k, v in resp["properties"].items()}
-            required = resp["required"]
+            props = resp.shape.fields
+            required = resp.shape.required
 
             if not props or (len(props) == 1 and "customData" in props and not required):
                 lines.append("*No required fields. An empty `{}` is a valid response.*")
@@ -792,13 +784,13 @@ def generate_block_md(block_name, messages_in_block, message_registry, shared_ty
         lines.append("*Types used only within this block's messages.*")
         lines.append("")
 
-        local_enums = {k: v for k, v in block_local_types.items() if v["is_enum"]}
-        local_composites = {k: v for k, v in block_local_types.items() if not v["is_enum"]}
+        local_enums = {k: v for k, v in block_local_types.items() if v.is_enum}
+        local_composites = {k: v for k, v in block_local_types.items() if not v.is_enum}
 
         for name in sorted(local_enums.keys()):
             info = local_enums[name]
-            defn = info["definition"]
-            desc = clean_description(defn.get("description", ""))
+            defn = info.definition
+            desc = clean_description(defn.description)
 
             lines.append(f"### {name}")
             lines.append("")
@@ -806,14 +798,14 @@ def generate_block_md(block_name, messages_in_block, message_registry, shared_ty
                 lines.append(f"{desc}")
                 lines.append("")
 
-            default = defn.get("default")
+            default = defn.default
             if default is not None:
                 lines.append(f"**Default:** `{default}`")
                 lines.append("")
 
             lines.append("| Value |")
             lines.append("|-------|")
-            for val in defn["enum"]:
+            for val in defn.enum:
                 lines.append(f"| `{val}` |")
             lines.append("")
 
@@ -827,10 +819,10 @@ def generate_block_md(block_name, messages_in_block, message_registry, shared_ty
 
         for name in sorted(local_composites.keys()):
             info = local_composites[name]
-            defn = info["definition"]
-            desc = clean_description(defn.get("description", ""))
-            props = defn.get("properties", {})
-            required = defn.get("required", [])
+            defn = info.definition
+            desc = clean_description(defn.description)
+            props = defn.shape.fields
+            required = defn.shape.required
 
             lines.append(f"### {name}")
             lines.append("")
@@ -856,17 +848,35 @@ def generate_block_md(block_name, messages_in_block, message_registry, shared_ty
 # Main
 # ---------------------------------------------------------------------------
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate OCPP 2.0.1 schema docs from the OCA JSON schemas.")
+    parser.add_argument(
+        "--force", action="store_true",
+        help="regenerate every output, even if its schema files are unchanged",
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1, metavar="N",
+        help="render outputs in N worker processes (0 = one per CPU; default: 1)",
+    )
+    parser.add_argument(
+        "--chunks", action="store_true",
+        help="also write one file per message and type, with a manifest of their line ranges",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+
     print("Loading schemas...")
-    schemas = load_schemas()
-    print(f"  Loaded {len(schemas)} schema files")
+    ir = schema_ir.load(SCHEMA_DIR)
+    source = "cached IR" if ir.cached else "parsed"
+    print(f"  Loaded {len(ir.files)} schema files ({source})")
 
-    print("Building type registry...")
-    type_registry = build_type_registry(schemas)
+    type_registry = ir.types
     print(f"  Found {len(type_registry)} unique types")
 
-    print("Building message registry...")
-    message_registry = build_message_registry(schemas)
+    message_registry = ir.messages
     print(f"  Found {len(message_registry)} messages")
 
     # Verify all messages in BLOCK_MAP exist
@@ -889,33 +899,93 @@ def main():
 
     type_usage_map = build_type_usage_map(type_registry)
 
-    # Generate DataTypes.md (at repo root)
-    print("Generating OCPP-2.0.1-DataTypes.md...")
-    datatypes_content = generate_datatypes_md(shared_types, type_usage_map)
-    output_path = DATATYPES_OUTPUT_DIR / "OCPP-2.0.1-DataTypes.md"
-    with open(output_path, "w") as f:
-        f.write(datatypes_content)
-    print(f"  Written to {output_path}")
-
-    # Generate block files (in OCPP-2.0.1-Schemas/ subdirectory)
-    SCHEMAS_OUTPUT_DIR.mkdir(exist_ok=True)
+    # Every output, with a deferred render of its content
+    outputs = [(DATATYPES_OUTPUT_DIR / DATATYPES_FILENAME,
+                functools.partial(generate_datatypes_md, shared_types, type_usage_map))]
     for block_name, messages_in_block in BLOCK_MAP.items():
-        print(f"Generating OCPP-2.0.1-Schemas-{block_name}.md...")
-        content = generate_block_md(
-            block_name, messages_in_block, message_registry,
-            shared_types, local_types, type_usage_map)
-        output_path = SCHEMAS_OUTPUT_DIR / f"OCPP-2.0.1-Schemas-{block_name}.md"
-        with open(output_path, "w") as f:
-            f.write(content)
-        print(f"  Written to {output_path}")
+        outputs.append((SCHEMAS_OUTPUT_DIR / block_filename(block_name), functools.partial(
+            generate_block_md, block_name, messages_in_block, message_registry,
+            shared_types, local_types, type_usage_map)))
+
+    # Regenerate only outputs whose schema files changed since the last run
+    graph = build_dependency_graph(message_registry, type_registry, shared_types)
+    previous = {} if args.force else load_manifest()
+    manifest = {}
+    stale = []
+    for output_path, render in outputs:
+        key = os.path.relpath(output_path, REPO_ROOT)
+        manifest[key] = output_input_hash(graph[output_path.name], ir.hashes)
+        if previous.get(key) == manifest[key] and output_path.exists():
+            print(f"{output_path.name}: inputs unchanged, skipped")
+        else:
+            stale.append((output_path, render))
+
+    # Render (in parallel with --jobs), then log and write in output order
+    before = clean_description.cache_info()
+    contents = generated_files.render_all([render for _path, render in stale], args.jobs)
+    after = clean_description.cache_info()
+    rendered = len(stale)
+    written = 0
+    SCHEMAS_OUTPUT_DIR.mkdir(exist_ok=True)
+    for (output_path, _render), content in zip(stale, contents):
+        print(f"Generating {output_path.name}...")
+        if generated_files.write_if_changed(output_path, content):
+            written += 1
+            print(f"  Written to {output_path}")
+        else:
+            print(f"  Unchanged: {output_path}")
+    save_manifest(manifest)
+
+    # Machine-readable index of the same registries (cheap: always rebuilt)
+    print("Generating schema index...")
+    index = schema_index.build("2.0.1", ir, BLOCK_MAP, DIRECTION_MAP, clean_description, set(shared_types))
+    index_written = schema_index.write(INDEX_PATH, index)
+    for path in index_written:
+        print(f"  Written to {path}")
+    if not index_written:
+        print(f"  Unchanged: {INDEX_PATH}.json")
+
+    # Per-message and per-type chunks, split from the outputs as written
+    if args.chunks:
+        print("Generating chunks...")
+        chunk_dir = SCHEMAS_OUTPUT_DIR / doc_chunks.CHUNKS_DIRNAME
+        chunks = []
+        for output_path, _render in outputs:
+            if output_path.name == DATATYPES_FILENAME:
+                headings = {f"### {name}": ("types", name) for name in shared_types}
+            else:
+                block_name = output_path.stem.removeprefix("OCPP-2.0.1-Schemas-")
+                headings = {f"## {name}": ("messages", name) for name in BLOCK_MAP[block_name]}
+                headings.update({f"### {name}": ("types", name) for name in local_types})
+            chunks += doc_chunks.split(output_path, output_path.read_text(), headings, chunk_dir)
+        chunks_written, chunks_removed, chunks = doc_chunks.write(
+            "2.0.1", CHUNKS_MANIFEST_PATH, chunks)
+        print(f"  {len(chunks)} chunks in {chunk_dir} ({len(chunks_written)} written, "
+              f"{len(chunks_removed)} removed)")
+
+    # Token cost of the generated docs, checked against the budgets
+    pages = {SCHEMAS_OUTPUT_DIR / block_filename(block_name): msgs for block_name, msgs in BLOCK_MAP.items()}
+    within_budget = token_report.check_generated([path for path, _render in outputs], "2.0.1", pages)
 
     # Summary
-    enum_count = sum(1 for v in shared_types.values() if v["is_enum"])
-    composite_count = sum(1 for v in shared_types.values() if not v["is_enum"])
-    print(f"\nDone! Generated 11 files:")
+    enum_count = sum(1 for v in shared_types.values() if v.is_enum)
+    composite_count = sum(1 for v in shared_types.values() if not v.is_enum)
+    print(f"\nDone! Generated 11 files ({rendered} rendered, {written} written):")
     print(f"  - OCPP-2.0.1-DataTypes.md ({enum_count} enums, {composite_count} composite types)")
     for block_name, msgs in BLOCK_MAP.items():
         print(f"  - OCPP-2.0.1-Schemas-{block_name}.md ({len(msgs)} messages)")
+    print(f"  - {INDEX_PATH.name}.json/.sqlite ({len(index['messages'])} messages, "
+          f"{len(index['types'])} types, {len(index['fields'])} fields)")
+    if args.chunks:
+        print(f"  - {CHUNKS_MANIFEST_PATH.name} ({len(chunks)} chunks), per message lookup:")
+        for line in doc_chunks.format_savings(doc_chunks.savings(CHUNKS_MANIFEST_PATH)):
+            print(f"      {line}")
+    hits, misses = after.hits - before.hits, after.misses - before.misses
+    if hits + misses:  # workers keep their own caches: only blocks rendered in this process count
+        print(f"  Descriptions cleaned: {misses} unique of {hits + misses} "
+              f"({hits} cache hits, {hits / (hits + misses):.0%})")
+    if not within_budget:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -2,20 +2,35 @@
 """
 Extract OCPP 1.6J JSON schemas and generate markdown documentation.
 
-Reads all *.json from the schema directory (28 request/response pairs),
-groups by Feature Profile, and outputs:
+Reads all *.json from the schema directory (28 request/response pairs, via
+the cached schema IR, see schema_ir.py), groups by Feature Profile, and
+outputs:
   - OCPP-1.6J-Schemas-{Profile}.md  (6 files)
 
 Unlike OCPP 2.0.1 schemas, 1.6J schemas have no shared $ref definitions.
 Types are defined inline, so there is no separate DataTypes file.
 Nested objects (ChargingProfile, MeterValue, etc.) are documented as
 sub-tables under the field where they appear.
+
+With --chunks, each message section is also written to its own file
+with a manifest of line ranges (see doc_chunks.py).
+
+Usage:
+    python scripts/extract_schemas_16.py [--jobs N] [--chunks]
 """
 
+import argparse
+import functools
 import json
 import sys
 from pathlib import Path
 
+import doc_chunks
+import generated_files
+import schema_index
+import schema_ir
+import token_report
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -23,6 +38,8 @@ from pathlib import Path
 SCHEMA_DIR = Path(__file__).resolve().parent.parent / "OCPP_1.6_documentation" / "schemas" / "json"
 REPO_ROOT = Path(__file__).resolve().parent.parent
 OUTPUT_DIR = REPO_ROOT / "docs" / "OCPP-1.6J-Schemas"
+INDEX_PATH = OUTPUT_DIR / "OCPP-1.6J-Schemas-Index"  # .json and .sqlite
+CHUNKS_MANIFEST_PATH = OUTPUT_DIR / "OCPP-1.6J-Schemas-Chunks.json"
 
 # Message → Feature Profile mapping (from OCPP 1.6 spec section 3.3)
 PROFILE_MAP = {
@@ -124,94 +141,59 @@ MESSAGE_DESC = {
 }
 
 
-# ---------------------------------------------------------------------------
-# Schema loading
-# ---------------------------------------------------------------------------
-
-def load_schemas():
-    """Load all schema JSON files, return dict keyed by filename stem."""
-    schemas = {}
-    for f in sorted(SCHEMA_DIR.glob("*.json")):
-        with open(f) as fh:
-            schemas[f.stem] = json.load(fh)
-    return schemas
-
-
-def build_message_registry(schemas):
-    """
-    Build a registry of all messages.
-    Returns: { message_name: { "request": schema_dict, "response": schema_dict } }
-    """
-    messages = {}
-
-    for filename, schema in schemas.items():
-        if filename.endswith("Response"):
-            msg_name = filename[:-len("Response")]
-            side = "response"
-        else:
-            msg_name = filename
-            side = "request"
-
-        if msg_name not in messages:
-            messages[msg_name] = {}
-        messages[msg_name][side] = schema
-
-    return messages
-
-
 # ---------------------------------------------------------------------------
 # Field rendering
 # ---------------------------------------------------------------------------
 
-def resolve_field_type(prop_def):
+def resolve_field_type(field):
     """
-    Resolve a property to (type_string, constraints_list).
+    Resolve a schema_ir.Field to (type_string, constraints_list).
     For inline enums, type_string includes the enum name contextually.
     For inline objects, returns "object" (caller handles sub-table).
     """
     constraints = []
-    ptype = prop_def.get("type", "any")
+    ptype = "any" if field.type is None else field.type
 
     if ptype == "string":
-        fmt = prop_def.get("format")
-        if "enum" in prop_def:
+        fmt = field.format
+        if field.enum is not None:
             return "string (enum)", constraints
         if fmt:
             return f"string ({fmt})", constraints
-        if "maxLength" in prop_def:
-            constraints.append(f"maxLength: {prop_def['maxLength']}")
-        if "minLength" in prop_def:
-            constraints.append(f"minLength: {prop_def['minLength']}")
+        if field.max_length is not None:
+            constraints.append(f"maxLength: {field.max_length}")
+        if field.min_length is not None:
+            constraints.append(f"minLength: {field.min_length}")
         return "string", constraints
 
     if ptype == "integer":
-        if "minimum" in prop_def:
-            constraints.append(f"min: {prop_def['minimum']}")
-        if "maximum" in prop_def:
-            constraints.append(f"max: {prop_def['maximum']}")
+        if field.minimum is not None:
+            constraints.append(f"min: {field.minimum}")
+        if field.maximum is not None:
+            constraints.append(f"max: {field.maximum}")
         return "integer", constraints
 
     if ptype == "number":
-        if "multipleOf" in prop_def:
-            constraints.append(f"multipleOf: {prop_def['multipleOf']}")
-        if "minimum" in prop_def:
-            constraints.append(f"min: {prop_def['minimum']}")
-        if "maximum" in prop_def:
-            constraints.append(f"max: {prop_def['maximum']}")
+        if field.multiple_of is not None:
+            constraints.append(f"multipleOf: {field.multiple_of}")
+        if field.minimum is not None:
+            constraints.append(f"min: {field.minimum}")
+        if field.maximum is not None:
+            constraints.append(f"max: {field.maximum}")
         return "number", constraints
 
     if ptype == "boolean":
         return "boolean", constraints
 
     if ptype == "array":
-        items = prop_def.get("items", {})
-        if items.get("type") == "object":
+        items = field.items
+        if items.type == "object":
             return "object[]", constraints
         inner_type, _ = resolve_field_type(items)
-        if "minItems" in prop_def:
-            constraints.append(f"minItems: {prop_def['minItems']}")
-        if "maxItems" in prop_def:
-            constraints.append(f"maxItems: {prop_def['maxItems']}")
+        if field.min_items is not None:
+            constraints.append(f"minItems: {field.min_items}")
+        if field.max_items is not None:
+            constraints.append(f"maxItems: {field.max_items}")
         return f"{inner_type}[]", constraints
 
     if ptype == "object":
@@ -222,8 +204,8 @@ def resolve_field_type(prop_def):
 
 def render_fields_table(properties, required_fields, indent_prefix=""):
     """
-    Render a markdown fields table. For inline objects and arrays of objects,
-    recursively renders sub-tables.
+    Render a markdown fields table ({name: schema_ir.Field}). For inline
+    objects and arrays of objects, recursively renders sub-tables.
     Returns list of markdown lines.
     """
     if not properties:
@@ -238,36 +220,36 @@ def render_fields_table(properties, required_fields, indent_prefix=""):
         return (name not in required_fields, name)
 
     for field_name in sorted(properties.keys(), key=sort_key):
-        prop_def = properties[field_name]
+        field = properties[field_name]
         is_required = field_name in required_fields
-        type_str, constraints = resolve_field_type(prop_def)
+        type_str, constraints = resolve_field_type(field)
         constraint_str = ", ".join(constraints)
         req_str = "**Yes**" if is_required else "No"
 
         # For enum fields, show values in description
         desc = ""
-        if "enum" in prop_def:
-            vals = ", ".join(f"`{v}`" for v in prop_def["enum"])
+        if field.enum is not None:
+            vals = ", ".join(f"`{v}`" for v in field.enum)
             desc = f"Values: {vals}"
 
         lines.append(f"{indent_prefix}| `{field_name}` | {type_str} | {req_str} | {constraint_str} | {desc} |")
 
         # Render sub-table for inline objects
-        if prop_def.get("type") == "object" and "properties" in prop_def:
+        if field.type == "object" and field.shape is not None:
             lines.append("")
-            sub_props = prop_def["properties"]
-            sub_required = prop_def.get("required", [])
+            sub_props = field.shape.fields
+            sub_required = field.shape.required
             lines.append(f"{indent_prefix}**`{field_name}` object:**")
             lines.append("")
             lines.extend(render_fields_table(sub_props, sub_required, indent_prefix))
 
         # Render sub-table for arrays of inline objects
-        if prop_def.get("type") == "array":
-            items = prop_def.get("items", {})
-            if items.get("type") == "object" and "properties" in items:
+        if field.type == "array":
+            items = field.items
+            if items.type == "object" and items.shape is not None:
                 lines.append("")
-                sub_props = items["properties"]
-                sub_required = items.get("required", [])
+                sub_props = items.shape.fields
+                sub_required = items.shape.required
                 lines.append(f"{indent_prefix}**`{field_name}[]` items:**")
                 lines.append("")
                 lines.extend(render_fields_table(sub_props, sub_required, indent_prefix))
@@ -292,17 +274,17 @@ def generate_example(properties, required_fields, depth=0):
     return obj
 
 
-def _example_value(prop_def, depth):
-    """Generate an example value for a property."""
-    ptype = prop_def.get("type", "")
+def _example_value(field, depth):
+    """Generate an example value for a schema_ir.Field."""
+    ptype = field.type or ""
 
     if ptype == "string":
-        if "enum" in prop_def:
-            return prop_def["enum"][0]
-        fmt = prop_def.get("format")
+        if field.enum is not None:
+            return field.enum[0]
+        fmt = field.format
         if fmt == "date-time":
             return "2024-01-15T10:30:00Z"
-        max_len = prop_def.get("maxLength", 0)
+        max_len = field.max_length
         if max_len == 20:
             return "ABCDEF1234"
         return "string"
@@ -316,19 +298,19 @@ def _example_value(prop_def, depth):
     if ptype == "boolean":
         return False
 
-    if ptype == "object" and "properties" in prop_def:
+    if ptype == "object" and field.shape is not None:
         return generate_example(
-            prop_def["properties"],
-            prop_def.get("required", []),
+            field.shape.fields,
+            field.shape.required,
             depth + 1,
         )
 
     if ptype == "array":
-        items = prop_def.get("items", {})
-        if items.get("type") == "object" and "properties" in items:
+        items = field.items
+        if items.type == "object" and items.shape is not None:
             return [generate_example(
-                items["properties"],
-                items.get("required", []),
+                items.shape.fields,
+                items.shape.required,
                 depth + 1,
             )]
         return [_example_value(items, depth + 1)]
@@ -366,7 +348,7 @@ def generate_profile_md(profile_name, messages_in_profile, message_registry):
 
     # Each message
     for msg_name in messages_in_profile:
-        msg = message_registry.get(msg_name, {})
+        msg = message_registry.get(msg_name)
         direction = DIRECTION_MAP.get(msg_name, "?")
         desc = MESSAGE_DESC.get(msg_name, "")
 
@@ -379,10 +361,10 @@ def generate_profile_md(profile_name, messages_in_profile, message_registry):
             lines.append("")
 
         # Request
-        req = msg.get("request")
+        req = msg.request if msg else None
         if req:
-            props = req.get("properties", {})
-            required = req.get("required", [])
+            props = req.shape.fields
+            required = req.shape.required
 
             lines.append(f"### {msg_name}.req")
             lines.append("")
@@ -407,10 +389,10 @@ def generate_profile_md(profile_name, messages_in_profile, message_registry):
             lines.append("")
 
         # Response
-        resp = msg.get("response")
+        resp = msg.response if msg else None
         if resp:
-            props = resp.get("properties", {})
-            required = resp.get("required", [])
+            props = resp.shape.fields
+            required = resp.shape.required
 
             lines.append(f"### {msg_name}.conf")
             lines.append("")
@@ -444,7 +426,22 @@ def generate_profile_md(profile_name, messages_in_profile, message_registry):
 # Main
 # ---------------------------------------------------------------------------
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate OCPP 1.6J schema docs from the OCA JSON schemas.")
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1, metavar="N",
+        help="render profiles in N worker processes (0 = one per CPU; default: 1)",
+    )
+    parser.add_argument(
+        "--chunks", action="store_true",
+        help="also write one file per message, with a manifest of their line ranges",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+
     if not SCHEMA_DIR.exists():
         print(f"ERROR: Schema directory not found: {SCHEMA_DIR}", file=sys.stderr)
         print("Download the OCPP 1.6 JSON schemas from OCA and place them in", file=sys.stderr)
@@ -452,11 +449,11 @@ def main():
         sys.exit(1)
 
     print("Loading schemas...")
-    schemas = load_schemas()
-    print(f"  Loaded {len(schemas)} schema files")
+    ir = schema_ir.load(SCHEMA_DIR)
+    source = "cached IR" if ir.cached else "parsed"
+    print(f"  Loaded {len(ir.files)} schema files ({source})")
 
-    print("Building message registry...")
-    message_registry = build_message_registry(schemas)
+    message_registry = ir.messages
     print(f"  Found {len(message_registry)} messages")
 
     # Verify all messages in PROFILE_MAP exist in schemas
@@ -472,20 +469,55 @@ def main():
     if missing_from_schemas:
         print(f"  WARNING: Messages in PROFILE_MAP but not in schemas: {missing_from_schemas}", file=sys.stderr)
 
-    # Generate profile files
+    # Generate profile files (in parallel with --jobs), written in order
+    renders = [functools.partial(generate_profile_md, profile_name, messages_in_profile, message_registry)
+               for profile_name, messages_in_profile in PROFILE_MAP.items()]
+    contents = generated_files.render_all(renders, args.jobs)
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    for profile_name, messages_in_profile in PROFILE_MAP.items():
+    chunks = []
+    for profile_name, content in zip(PROFILE_MAP, contents):
         print(f"Generating OCPP-1.6J-Schemas-{profile_name}.md...")
-        content = generate_profile_md(profile_name, messages_in_profile, message_registry)
         output_path = OUTPUT_DIR / f"OCPP-1.6J-Schemas-{profile_name}.md"
         with open(output_path, "w") as f:
             f.write(content)
         print(f"  Written to {output_path}")
+        if args.chunks:
+            headings = {f"## {name}": ("messages", name) for name in PROFILE_MAP[profile_name]}
+            chunks += doc_chunks.split(output_path, content, headings, OUTPUT_DIR / doc_chunks.CHUNKS_DIRNAME)
+
+    # Per-message chunks of the profile files
+    if args.chunks:
+        print("Generating chunks...")
+        chunks_written, chunks_removed, chunks = doc_chunks.write(
+            "1.6J", CHUNKS_MANIFEST_PATH, chunks)
+        print(f"  {len(chunks)} chunks in {OUTPUT_DIR / doc_chunks.CHUNKS_DIRNAME} "
+              f"({len(chunks_written)} written, {len(chunks_removed)} removed)")
+
+    # Machine-readable index of the same registries
+    print("Generating schema index...")
+    index = schema_index.build("1.6J", ir, PROFILE_MAP, DIRECTION_MAP)
+    index_written = schema_index.write(INDEX_PATH, index)
+    for path in index_written:
+        print(f"  Written to {path}")
+    if not index_written:
+        print(f"  Unchanged: {INDEX_PATH}.json")
+
+    # Token cost of the generated docs, checked against the budgets
+    pages = {OUTPUT_DIR / f"OCPP-1.6J-Schemas-{profile_name}.md": msgs for profile_name, msgs in PROFILE_MAP.items()}
+    within_budget = token_report.check_generated(list(pages), "1.6J", pages)
 
     # Summary
     print(f"\nDone! Generated {len(PROFILE_MAP)} files:")
     for profile_name, msgs in PROFILE_MAP.items():
         print(f"  - OCPP-1.6J-Schemas-{profile_name}.md ({len(msgs)} messages)")
+    print(f"  - {INDEX_PATH.name}.json/.sqlite ({len(index['messages'])} messages, "
+          f"{len(index['fields'])} fields)")
+    if args.chunks:
+        print(f"  - {CHUNKS_MANIFEST_PATH.name} ({len(chunks)} chunks), per message lookup:")
+        for line in doc_chunks.format_savings(doc_chunks.savings(CHUNKS_MANIFEST_PATH)):
+            print(f"      {line}")
+    if not within_budget:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
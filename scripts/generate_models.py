@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Generate __slots__ message classes from the OCA JSON schemas.
+
+For every OCPP 2.0.1 and 1.6J message side and every composite type,
+writes a class with __slots__ named after the JSON properties, plus
+from_dict() / to_dict() conversions generated from the schema:
+  - models/ocpp201.py
+  - models/ocpp16.py
+
+Enumerations become classes of string constants. Decoded messages take a
+fraction of the memory of the equivalent dicts (see bench_models.py):
+
+    from models import ocpp201
+    msg = ocpp201.MeterValuesRequest.from_dict(payload)
+    msg.meterValue[0].sampledValue[0].value
+    payload = msg.to_dict()
+
+from_dict() expects a valid payload (see generate_validators.py). Absent
+optional properties are None. Classes of objects that allow additional
+properties (CustomDataType) keep unknown keys, so to_dict() returns the
+original payload. --check proves the round trip for every schema.
+
+Usage:
+    python scripts/generate_models.py [--version {2.0.1,1.6J}] [--check]
+"""
+
+import argparse
+import keyword
+import re
+import sys
+from pathlib import Path
+
+import generated_files
+import schema_ir
+import schema_payloads
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+OUTPUT_DIR = REPO_ROOT / "models"
+
+# Class name suffix per message side
+SIDE_SUFFIXES = {"request": "Request", "response": "Response"}
+
+# Slot holding the properties of an open object (additionalProperties not
+# false) that the schema does not name
+EXTRA_SLOT = "_extra"
+
+CAMEL_BOUNDARY_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+NON_IDENTIFIER_RE = re.compile(r"\W+")
+
+
+# ---------------------------------------------------------------------------
+# Naming
+# ---------------------------------------------------------------------------
+
+def class_name(field_name: str) -> str:
+    """Class name for an inline object held by field_name (meterValue -> MeterValue)."""
+    return field_name[:1].upper() + field_name[1:]
+
+
+def attribute_name(field_name: str) -> str:
+    return field_name + "_" if keyword.iskeyword(field_name) else field_name
+
+
+def constant_name(value: str) -> str:
+    """Constant name for an enum value (Energy.Active.Import.Register ->
+    ENERGY_ACTIVE_IMPORT_REGISTER, kWh -> K_WH)."""
+    name = NON_IDENTIFIER_RE.sub("_", CAMEL_BOUNDARY_RE.sub("_", value)).strip("_").upper()
+    if not name or name[0].isdigit() or keyword.iskeyword(name):
+        name = "V_" + name
+    return name
+
+
+# ---------------------------------------------------------------------------
+# Code generation
+# ---------------------------------------------------------------------------
+
+class ModelBuilder:
+    """Generated classes of one models module.
+
+    Types reached from several schema files (or inline objects with the
+    same field name) share one class when their generated code is
+    identical; a differing one is named after its owner class instead.
+    """
+
+    def __init__(self):
+        self.classes = {}     # class name -> source lines
+        self.order = []
+        self.constants = {}   # literal source -> constant name
+        self.resolved = {}    # (schema file, type name) -> class name
+        self.in_progress = set()
+
+    def constant(self, source: str) -> str:
+        if source not in self.constants:
+            self.constants[source] = f"_KEYS_{len(self.constants)}"
+        return self.constants[source]
+
+    def add(self, names: list, lines: list) -> str:
+        """Register a class under the first free candidate name (or the
+        one already holding identical code) and return that name."""
+        for name in names:
+            if name not in self.classes:
+                self.classes[name] = [line.replace("{name}", name) for line in lines]
+                self.order.append(name)
+                return name
+            if self.classes[name] == [line.replace("{name}", name) for line in lines]:
+                return name
+        base, suffix = names[-1], 2
+        while f"{base}{suffix}" in self.classes:
+            suffix += 1
+        return self.add([f"{base}{suffix}"], lines)
+
+    def enum_class(self, names: list, values: list) -> str:
+        lines = ["class {name}:", '    """{name} values."""', ""]
+        seen = set()
+        for value in values:
+            const = constant_name(value)
+            while const in seen:
+                const += "_"
+            seen.add(const)
+            lines.append(f"    {const} = {value!r}")
+        lines.append(f"    VALUES = {tuple(values)!r}")
+        return self.add(names, lines)
+
+    def object_class(self, names: list, shape, schema_file, label: str) -> str:
+        """Generate the class of an object shape; nested classes first."""
+        fields = []   # (attribute, json name, required, from expr, to expr)
+        for field_name, field in shape.fields.items():
+            decode, encode = self.converters(field, schema_file, field_name, names[0])
+            fields.append((attribute_name(field_name), field_name, field_name in shape.required,
+                           decode, encode))
+        open_object = shape.additional is not False
+
+        required = [f for f in fields if f[2]]
+        optional = [f for f in fields if not f[2]]
+        slots = [f[0] for f in fields] + ([EXTRA_SLOT] if open_object else [])
+        params = [f[0] for f in required] + [f"{f[0]}=None" for f in optional]
+
+        lines = ["class {name}:", f'    """{label}."""', ""]
+        lines.append(f"    __slots__ = {tuple(slots)!r}")
+        lines.append("")
+        lines.append(f"    def __init__({', '.join(['self'] + params)}):")
+        for attr, *_rest in fields:
+            lines.append(f"        self.{attr} = {attr}")
+        if open_object:
+            lines.append(f"        self.{EXTRA_SLOT} = None")
+        if not slots:
+            lines.append("        pass")
+
+        lines += ["", "    @classmethod", "    def from_dict(cls, data):", "        self = cls.__new__(cls)"]
+        for attr, json_name, is_required, decode, _encode in fields:
+            if is_required:
+                lines.append(f"        self.{attr} = {decode(f'data[{json_name!r}]')}")
+            elif decode("x") == "x":
+                lines.append(f"        self.{attr} = data.get({json_name!r})")
+            else:
+                lines.append(f"        value = data.get({json_name!r})")
+                lines.append(f"        self.{attr} = None if value is None else {decode('value')}")
+        if open_object:
+            keys = self.constant(f"frozenset({sorted(shape.fields)!r})")
+            lines.append(f"        if data.keys() <= {keys}:")
+            lines.append(f"            self.{EXTRA_SLOT} = None")
+            lines.append("        else:")
+            lines.append(f"            self.{EXTRA_SLOT} = {{k: v for k, v in data.items() if k not in {keys}}}")
+        lines.append("        return self")
+
+        lines += ["", "    def to_dict(self):", "        data = {}"]
+        for attr, json_name, is_required, _decode, encode in fields:
+            if is_required:
+                lines.append(f"        data[{json_name!r}] = {encode(f'self.{attr}')}")
+            else:
+                lines.append(f"        if self.{attr} is not None:")
+                lines.append(f"            data[{json_name!r}] = {encode(f'self.{attr}')}")
+        if open_object:
+            lines.append(f"        if self.{EXTRA_SLOT}:")
+            lines.append(f"            data.update(self.{EXTRA_SLOT})")
+        lines.append("        return data")
+        return self.add(names, lines)
+
+    def type_class(self, schema_file, type_name: str):
+        """Class of a named definition, or None for one that stays a plain
+        value (an enum, whose constants class is still generated)."""
+        key = (schema_file.name, type_name)
+        if key in self.resolved:
+            return self.resolved[key]
+        if key in self.in_progress:
+            raise ValueError(f"{schema_file.name}: recursive $ref to {type_name} is not supported")
+        self.in_progress.add(key)
+        type_def = schema_file.definitions[type_name]
+        if type_def.is_enum:
+            self.enum_class([type_name, f"{schema_file.name}{type_name}"], type_def.enum)
+            name = None
+        else:
+            name = self.object_class([type_name, f"{schema_file.name}{type_name}"], type_def.shape,
+                                     schema_file, type_name)
+        self.in_progress.discard(key)
+        self.resolved[key] = name
+        return name
+
+    def converters(self, node, schema_file, field_name: str, owner: str):
+        """(decode, encode): functions from a value expression to the
+        expression converting it from / to its JSON form."""
+        identity = (lambda x: x, lambda x: x)
+        if node is None:
+            return identity
+        if node.ref is not None:
+            name = self.type_class(schema_file, node.ref)
+            if name is None:
+                return identity
+            return (lambda x: f"{name}.from_dict({x})", lambda x: f"{x}.to_dict()")
+        if node.enum is not None:
+            self.enum_class([f"{owner}{class_name(field_name)}"], node.enum)
+            return identity
+        if node.type == "array":
+            decode, encode = self.converters(node.items, schema_file, field_name, owner)
+            if decode("x") == "x":
+                return identity
+            item = "item"
+            return (lambda x: f"[{decode(item)} for {item} in {x}]",
+                    lambda x: f"[{encode(item)} for {item} in {x}]")
+        if node.shape is not None and node.shape.fields:
+            name = self.object_class([class_name(field_name), f"{owner}{class_name(field_name)}"],
+                                     node.shape, schema_file, class_name(field_name))
+            return (lambda x: f"{name}.from_dict({x})", lambda x: f"{x}.to_dict()")
+        return identity
+
+    def render(self) -> list:
+        lines = [f"{name} = {source}" for source, name in self.constants.items()]
+        for name in self.order:
+            lines += ["", ""] + self.classes[name]
+        return lines
+
+
+def generate_module(version: str, ir) -> str:
+    """Return the source of the models module for one schema set."""
+    builder = ModelBuilder()
+    messages = []  # (message name, side, class name)
+    for msg in ir.messages.values():
+        for side, suffix in SIDE_SUFFIXES.items():
+            schema_file = getattr(msg, side)
+            if schema_file is None:
+                continue
+            name = f"{msg.name}{suffix}"
+            cls = builder.object_class([name, f"{name}Message"], schema_file.shape, schema_file,
+                                       f"{msg.name} {side} payload")
+            messages.append((msg.name, side, cls))
+
+    lines = [
+        '"""',
+        f"OCPP {version} message classes.",
+        "",
+        "Generated by scripts/generate_models.py from the OCA JSON schemas.",
+        "Do not edit by hand; rerun the generator instead.",
+        "",
+        "Every message side and composite type is a __slots__ class with",
+        "from_dict() and to_dict(); enumerations are classes of string",
+        "constants. Absent optional properties are None.",
+        '"""',
+        "",
+    ]
+    lines += builder.render()
+    for side, table in (("request", "REQUESTS"), ("response", "RESPONSES")):
+        lines += ["", "", f"{table} = {{"]
+        lines += [f"    {name!r}: {cls}," for name, msg_side, cls in messages if msg_side == side]
+        lines.append("}")
+    lines += [
+        "",
+        "",
+        "def from_dict(action, payload, response=False):",
+        '    """Decode the payload of a call (or, with response=True, of its',
+        '    result) for action. Raises KeyError for an unknown action."""',
+        "    return (RESPONSES if response else REQUESTS)[action].from_dict(payload)",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Round-trip check
+# ---------------------------------------------------------------------------
+
+def check_version(version: str, ir, module) -> int:
+    """Round-trip a full and a required-only payload of every schema, plus
+    one with vendor data in every open object. Returns the failures."""
+    failures = payloads = 0
+    for msg in ir.messages.values():
+        for side, suffix in SIDE_SUFFIXES.items():
+            schema_file = getattr(msg, side)
+            if schema_file is None:
+                continue
+            cls = getattr(module, f"{msg.name}{suffix}")
+            full = schema_payloads.sample(schema_file, schema_file)
+            required = {k: v for k, v in full.items() if k in schema_file.shape.required}
+            cases = [full, required]
+            if "customData" in full:
+                cases.append(dict(full, customData={"vendorId": "v", "vendorField": [1, {"a": None}]}))
+            for payload in cases:
+                payloads += 1
+                if cls.from_dict(payload).to_dict() != payload:
+                    failures += 1
+                    print(f"  MISMATCH {schema_file.name}: {payload!r:.200}", file=sys.stderr)
+    print(f"  {payloads} payloads: {'all round-trip' if not failures else f'{failures} differ'}")
+    return failures
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate __slots__ OCPP message classes from the OCA JSON schemas.")
+    parser.add_argument(
+        "--version", choices=sorted(schema_payloads.VERSIONS), action="append",
+        help="generate only this OCPP version (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="check that from_dict/to_dict round-trip payloads of every schema",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    failures = 0
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    for version in args.version or list(schema_payloads.VERSIONS):
+        config = schema_payloads.VERSIONS[version]
+        schema_dir = config["schema_dir"]
+        if not schema_dir.exists():
+            print(f"ERROR: Schema directory not found: {schema_dir}", file=sys.stderr)
+            sys.exit(1)
+
+        ir = schema_ir.load(schema_dir)
+        output_path = OUTPUT_DIR / f"{config['module']}.py"
+        print(f"Generating {output_path.name} ({len(ir.files)} schemas)...")
+        source = generate_module(version, ir)
+        compile(source, str(output_path), "exec")
+        if generated_files.write_if_changed(output_path, source):
+            print(f"  Written to {output_path}")
+        else:
+            print(f"  Unchanged: {output_path}")
+
+        if args.check:
+            print(f"Checking OCPP {version} round trips...")
+            failures += check_version(version, ir, schema_payloads.load_module(output_path))
+
+    if failures:
+        print(f"\nFAILED: {failures} payloads do not round-trip", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Generate seeded, schema-valid random OCPP payloads for load testing.
+
+Where the extractors' generate_example_payload() / generate_example()
+give one fixed minimal example per message, this streams any number of
+varied payloads, walking the schema IR with a seeded random generator:
+optional properties are included at random, strings get random lengths
+within minLength/maxLength, mostly short but occasionally exactly
+maxLength (date-time strings are timestamps, uri strings URLs), numbers
+fall within minimum/maximum, arrays get between minItems and maxItems
+items and enums take any of their values. The same arguments always
+produce the same output.
+
+Payloads are written one per line, as JSONL objects
+{"action": ..., "payload": ...} or as OCPP-J frames ([2, id, action,
+payload] calls, or [3, id, payload] results with --side response).
+Messages are interleaved round-robin. --check runs every payload through
+the compiled validators of generate_validators.py.
+
+Usage:
+    python scripts/generate_payloads.py [--version {2.0.1,1.6J}] [--message NAME ...]
+        [--count N] [--side {request,response}] [--format {jsonl,ocpp-j}]
+        [--seed N] [--optional P] [--output PATH] [--check]
+"""
+
+import argparse
+import json
+import random
+import string
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import schema_ir
+import schema_payloads
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+# Default probability that an optional property is present
+OPTIONAL_PROBABILITY = 0.5
+
+# Typical string length cap: longer maxLength values (identifiers of 36
+# characters, certificates of thousands) are reached only at the edge
+# probability, which produces exactly-maxLength strings
+STRING_CAP = 36
+EDGE_PROBABILITY = 0.05
+
+# Draws of a multipleOf value before giving up on a range with none that
+# the validators' floating-point check accepts
+MULTIPLE_OF_DRAWS = 100
+
+# Upper bounds where the schema sets none: array items and the span of
+# integers and numbers above their minimum (or 0)
+ARRAY_CAP = 4
+NUMBER_SPAN = 10000
+
+# Timestamps fall within a year from this date
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+TIMESTAMP_SPAN = 365 * 24 * 3600
+
+ALPHABET = string.ascii_letters + string.digits
+
+
+# ---------------------------------------------------------------------------
+# Payloads
+# ---------------------------------------------------------------------------
+
+class PayloadGenerator:
+    """Random valid values for the nodes of one schema file."""
+
+    def __init__(self, rng: random.Random, optional: float = OPTIONAL_PROBABILITY):
+        self.rng = rng
+        self.optional = optional
+
+    def value(self, node, schema_file):
+        ref = getattr(node, "ref", None)
+        if ref is not None:
+            return self.value(schema_file.definitions[ref], schema_file)
+        if node.enum:
+            return self.rng.choice(node.enum)
+        json_type = node.type[0] if isinstance(node.type, list) else node.type
+        if json_type == "string":
+            return self.string(node)
+        if json_type in ("integer", "number"):
+            return self.number(node, json_type)
+        if json_type == "boolean":
+            return self.rng.random() < 0.5
+        if json_type == "array":
+            return self.array(node, schema_file)
+        if json_type == "object" or node.shape is not None:
+            return self.object(node.shape, schema_file)
+        return self.string(node)
+
+    def string(self, node):
+        rng = self.rng
+        max_length = getattr(node, "max_length", None)
+        min_length = getattr(node, "min_length", None) or 0
+        fmt = getattr(node, "format", None)
+        if fmt == "date-time":
+            moment = EPOCH + timedelta(seconds=rng.randrange(TIMESTAMP_SPAN))
+            return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+        prefix = "https://example.com/" if fmt == "uri" else ""
+        low = max(min_length, len(prefix) + 1)
+        high = len(prefix) + STRING_CAP
+        if max_length is not None:
+            low = min(low, max_length)
+            high = min(high, max_length)
+        if max_length is not None and rng.random() < EDGE_PROBABILITY:
+            length = max_length
+        else:
+            length = rng.randint(low, high) if low < high else low
+        if length <= len(prefix):
+            prefix = ""
+        return prefix + "".join(rng.choices(ALPHABET, k=length - len(prefix)))
+
+    def number(self, node, json_type):
+        minimum = getattr(node, "minimum", None)
+        maximum = getattr(node, "maximum", None)
+        low = minimum if minimum is not None else min(0, maximum) if maximum is not None else 0
+        high = maximum if maximum is not None else low + NUMBER_SPAN
+        multiple_of = getattr(node, "multiple_of", None)
+        if multiple_of:
+            first, last = -int(-low // multiple_of), int(high // multiple_of)
+            if first > last:
+                if maximum is not None:
+                    raise ValueError(f"no multiple of {multiple_of} between {low} and {high}")
+                last = first  # the default span is narrower than one step
+            # Validators divide in floating point (0.3 / 0.1 is not integral),
+            # so draw until the quotient they compute is whole
+            for _ in range(MULTIPLE_OF_DRAWS):
+                value = round(self.rng.randint(first, last) * multiple_of, 10)
+                quotient = value / multiple_of
+                if int(quotient) == quotient:
+                    return int(value) if json_type == "integer" else value
+            raise ValueError(f"no multiple of {multiple_of} between {low} and {high} passes validation")
+        if json_type == "integer":
+            return self.rng.randint(int(-(-low // 1)), int(high // 1))
+        return min(max(round(self.rng.uniform(low, high), 1), low), high)
+
+    def array(self, node, schema_file):
+        min_items = node.min_items or 0
+        high = ARRAY_CAP if node.max_items is None else min(ARRAY_CAP, node.max_items)
+        count = self.rng.randint(min_items, max(min_items, high))
+        return [self.value(node.items, schema_file) for _ in range(count)]
+
+    def object(self, shape, schema_file):
+        if shape is None:
+            return {}
+        rng = self.rng
+        return {name: self.value(field, schema_file)
+                for name, field in shape.fields.items()
+                if name in shape.required or rng.random() < self.optional}
+
+    def payload(self, schema_file):
+        return self.object(schema_file.shape, schema_file)
+
+
+def stream(ir, names, side, count, seed, optional=OPTIONAL_PROBABILITY):
+    """Yield (unique id, action, payload) for count payloads of each named
+    message, interleaved round-robin."""
+    rng = random.Random(seed)
+    generator = PayloadGenerator(rng, optional)
+    schema_files = [(name, getattr(ir.messages[name], side)) for name in names]
+    for _ in range(count):
+        for name, schema_file in schema_files:
+            yield f"{rng.getrandbits(128):032x}", name, generator.payload(schema_file)
+
+
+def format_line(fmt, side, unique_id, action, payload) -> str:
+    if fmt == "jsonl":
+        record = {"action": action, "payload": payload}
+    elif side == "request":
+        record = [2, unique_id, action, payload]
+    else:
+        record = [3, unique_id, payload]
+    return json.dumps(record, separators=(",", ":"))
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate seeded, schema-valid random OCPP payloads.")
+    parser.add_argument("--version", choices=sorted(schema_payloads.VERSIONS), default="2.0.1",
+                        help="OCPP version (default: 2.0.1)")
+    parser.add_argument("--message", action="append", metavar="NAME",
+                        help="message to generate, e.g. MeterValues (repeatable; default: all)")
+    parser.add_argument("--count", type=int, default=1000, help="payloads per message (default: 1000)")
+    parser.add_argument("--side", choices=["request", "response"], default="request",
+                        help="generate requests (calls) or responses (results)")
+    parser.add_argument("--format", choices=["jsonl", "ocpp-j"], default="jsonl", dest="fmt",
+                        help="JSONL {action, payload} records or OCPP-J frames")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--optional", type=float, default=OPTIONAL_PROBABILITY,
+                        help=f"probability of each optional property (default: {OPTIONAL_PROBABILITY})")
+    parser.add_argument("--output", type=Path, help="output file (default: stdout)")
+    parser.add_argument("--check", action="store_true",
+                        help="validate every payload with the compiled validators")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    schema_dir = schema_payloads.VERSIONS[args.version]["schema_dir"]
+    if not schema_dir.exists():
+        print(f"ERROR: Schema directory not found: {schema_dir}", file=sys.stderr)
+        sys.exit(1)
+    ir = schema_ir.load(schema_dir)
+
+    names = args.message or [msg.name for msg in ir.messages.values()
+                             if getattr(msg, args.side) is not None]
+    for name in names:
+        if name not in ir.messages or getattr(ir.messages[name], args.side) is None:
+            print(f"ERROR: No {args.side} schema for {name}", file=sys.stderr)
+            sys.exit(1)
+    validators = schema_payloads.compiled_validators(args.version, ir) if args.check else None
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    invalid = written = 0
+    try:
+        for unique_id, action, payload in stream(ir, names, args.side, args.count, args.seed, args.optional):
+            if validators is not None:
+                errors = validators[(action, args.side)](payload)
+                if errors:
+                    invalid += 1
+                    print(f"  INVALID {action}: {errors[:3]}", file=sys.stderr)
+            out.write(format_line(args.fmt, args.side, unique_id, action, payload) + "\n")
+            written += 1
+    except ValueError as e:  # a schema no value can satisfy
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if args.output:
+            out.close()
+
+    target = args.output or "stdout"
+    print(f"{written} {args.side} payloads ({len(names)} messages, seed {args.seed}) written to {target}",
+          file=sys.stderr)
+    if validators is not None:
+        print(f"  {'all valid' if not invalid else f'{invalid} invalid'}", file=sys.stderr)
+        if invalid:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
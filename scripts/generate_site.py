@@ -7,18 +7,45 @@ index.html style. Outputs to public/ directory.
 
 Usage:
     python scripts/generate_site.py
+    python scripts/generate_site.py --incremental   # re-render changed pages only
+    python scripts/generate_site.py --jobs 0        # render on all CPUs
+    python scripts/generate_site.py --external-assets  # cacheable CSS/JS files
+    python scripts/generate_site.py --precompress   # .gz/.br siblings
+    python scripts/generate_site.py --watch         # dev server + rebuild on save
+    python scripts/generate_site.py --profile       # per-page, per-stage timings
 
 Dependencies:
     pip install markdown
+    pip install brotli      # optional, for .br variants with --precompress
 """
 
+import argparse
+import gzip
+import hashlib
 import html
+import http.server
+import json
 import os
 import re
 import shutil
+import threading
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from urllib.parse import unquote
 
 import markdown
+from markdown.extensions import Extension
+from markdown.postprocessors import Postprocessor
+from markdown.treeprocessors import Treeprocessor
+
+try:
+    import brotli
+except ImportError:  # optional: --precompress then writes .gz variants only
+    brotli = None
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -27,6 +54,11 @@ import markdown
 ROOT = Path(__file__).resolve().parent.parent
 OUTPUT_DIR = ROOT / "public"
 
+# Build manifest for --incremental: input hashes of every file in OUTPUT_DIR,
+# and of the --precompress variants found not worth writing. Kept outside
+# OUTPUT_DIR so it is never deployed.
+MANIFEST_PATH = ROOT / ".site-manifest.json"
+
 # Markdown files to convert: (source_path, clean_url_path)
 # Each page outputs to public/<url_path>/index.html
 INDEX_SOURCE = "docs/index.md"
@@ -46,6 +78,7 @@ CONTENT_FILES = [
     ("docs/OCPP-2.0.1-Schemas/OCPP-2.0.1-Schemas-Security.md", "ocpp-2.0.1/schemas/security"),
     ("docs/OCPP-2.0.1-Schemas/OCPP-2.0.1-Schemas-SmartCharging.md", "ocpp-2.0.1/schemas/smart-charging"),
     ("docs/OCPP-2.0.1-Schemas/OCPP-2.0.1-Schemas-Transactions.md", "ocpp-2.0.1/schemas/transactions"),
+    ("docs/OCPP-2.0.1-Schemas/OCPP-2.0.1-Schemas-Sizes.md", "ocpp-2.0.1/schemas/sizes"),
     ("docs/OCPP-2.0.1-Sequences/OCPP-2.0.1-Sequences.md", "ocpp-2.0.1/sequences"),
     ("docs/OCPP-2.0.1-Sequences/OCPP-2.0.1-Sequences-Operational.md", "ocpp-2.0.1/sequences/operational"),
     ("docs/OCPP-2.0.1-SmartCharging/OCPP-2.0.1-SmartCharging.md", "ocpp-2.0.1/smart-charging"),
@@ -59,6 +92,7 @@ CONTENT_FILES = [
     ("docs/OCPP-1.6J-Schemas/OCPP-1.6J-Schemas-LocalAuthList.md", "ocpp-1.6j/schemas/local-auth-list"),
     ("docs/OCPP-1.6J-Schemas/OCPP-1.6J-Schemas-Reservation.md", "ocpp-1.6j/schemas/reservation"),
     ("docs/OCPP-1.6J-Schemas/OCPP-1.6J-Schemas-RemoteTrigger.md", "ocpp-1.6j/schemas/remote-trigger"),
+    ("docs/OCPP-1.6J-Schemas/OCPP-1.6J-Schemas-Sizes.md", "ocpp-1.6j/schemas/sizes"),
     ("docs/OCPP-1.6J-Sequences/OCPP-1.6J-Sequences.md", "ocpp-1.6j/sequences"),
     ("docs/OCPP-1.6J-SmartCharging/OCPP-1.6J-SmartCharging.md", "ocpp-1.6j/smart-charging"),
 ]
@@ -73,6 +107,20 @@ STATIC_FILES = [
     "_headers",
 ]
 
+# --external-assets: SITE_CSS/SITE_JS are written once as content-hashed
+# files in this directory, and _headers gets an immutable cache rule for them
+ASSETS_DIR = "assets"
+ASSET_CACHE_HEADERS = f"""\
+/{ASSETS_DIR}/*
+  Cache-Control: public, max-age=31536000, immutable
+"""
+
+# --precompress: text outputs get .gz/.br siblings at maximum compression,
+# kept only when the file is big enough and the variant saves enough bytes
+PRECOMPRESS_EXTENSIONS = {".html", ".md", ".css", ".js", ".svg"}
+PRECOMPRESS_MIN_SIZE = 1024   # smaller responses fit in a single packet anyway
+PRECOMPRESS_MAX_RATIO = 0.9   # a variant must save at least 10%
+
 # Standalone HTML tools: (source_file, output_dir)
 # Each is copied as index.html into its output directory for clean URLs
 STANDALONE_PAGES = [
@@ -659,82 +707,160 @@ def url_to_output_path(url_path: str) -> str:
 
 
 # ---------------------------------------------------------------------------
-# JSON syntax highlighter (matches hand-crafted .tok-* classes)
+# Build profiling (--profile)
 # ---------------------------------------------------------------------------
 
-def highlight_json(code_text: str) -> str:
-    """Apply .tok-* span highlighting to JSON code."""
-    result = []
-    i = 0
-    text = code_text
-    length = len(text)
-
-    while i < length:
-        ch = text[i]
-
-        # String literal
-        if ch == '"' or ch == '&' and text[i:i+6] == '&quot;':
-            # Find the actual quote character
-            if ch == '&':
-                quote_str = '&quot;'
-                quote_len = 6
-            else:
-                quote_str = '"'
-                quote_len = 1
-
-            # Scan ahead to find the closing quote
-            j = i + quote_len
-            while j < length:
-                if text[j] == '\\':
-                    j += 2  # skip escaped char
-                    continue
-                if text[j:j+quote_len] == quote_str:
-                    j += quote_len
-                    break
-                if text[j] == '&':
-                    # HTML entity — check for &quot;
-                    if text[j:j+6] == '&quot;':
-                        j += 6
-                        break
-                j += 1
-            else:
-                j = length
+PROFILE_PATH = ROOT / ".site-profile.json"
+PROFILE_TOP_PAGES = 10  # slowest pages listed in the summary table
 
-            token = text[i:j]
 
-            # Check if this is a key (followed by optional whitespace then colon)
-            rest = text[j:j+10].lstrip()
-            if rest.startswith(':'):
-                result.append(f'<span class="tok-key">{token}</span>')
-            else:
-                result.append(f'<span class="tok-str">{token}</span>')
-            i = j
-            continue
+class StageProfiler:
+    """Record wall time and peak memory of named stages, per page.
 
-        # Number (after colon/comma/bracket or at start)
-        if ch in '0123456789' or (ch == '-' and i + 1 < length and text[i+1] in '0123456789'):
-            j = i + 1
-            while j < length and text[j] in '0123456789.eE+-':
-                j += 1
-            result.append(f'<span class="tok-num">{text[i:j]}</span>')
-            i = j
-            continue
+    Stages may nest: "self_ms" excludes time spent in nested stages, so the
+    self times of a page's stages add up to (nearly) the page total.
+    "peak_kb" is the highest tracemalloc reading above the memory in use
+    when the stage started, nested stages included. tracemalloc slows
+    Python down, so compare timings between profiled runs only.
 
-        # Booleans and null
-        for keyword in ['true', 'false', 'null']:
-            if text[i:i+len(keyword)] == keyword:
-                result.append(f'<span class="tok-num">{keyword}</span>')
-                i += len(keyword)
-                break
-        else:
-            # Brackets and braces
-            if ch in '{}[]':
-                result.append(f'<span class="tok-bracket">{ch}</span>')
-                i += 1
+    Disabled by default; every hook is then a no-op.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.pages = {}
+        self._page = None
+        self._stack = []
+
+    def reset(self, enabled: bool):
+        self.enabled = enabled
+        self.pages = {}
+
+    @contextmanager
+    def page(self, source_rel: str):
+        """Profile everything until exit as the stages of source_rel. A page
+        profiled again (build() writes it after every page is rendered)
+        adds to its record."""
+        if not self.enabled:
+            yield
+            return
+        self._page = self.pages.setdefault(source_rel, {"stages": {}})
+        tracemalloc.start()
+        try:
+            with self.stage(None):
+                yield
+        finally:
+            tracemalloc.stop()
+            self._page = None
+
+    @contextmanager
+    def stage(self, name: str):
+        if self._page is None:
+            yield
+            return
+        if self._stack:
+            # Save the parent's peak before this stage resets the counter
+            parent = self._stack[-1]
+            parent["peak"] = max(parent["peak"], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        frame = {"start": time.perf_counter(), "nested": 0.0, "mem": current, "peak": current}
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - frame["start"]
+            peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1]["nested"] += elapsed
+            record = {
+                "ms": round(elapsed * 1000, 3),
+                "self_ms": round((elapsed - frame["nested"]) * 1000, 3),
+                "peak_kb": round((peak - frame["mem"]) / 1024, 1),
+            }
+            if name is None:
+                for key in ("ms", "self_ms"):
+                    record[key] = round(record[key] + self._page.get(key, 0.0), 3)
+                record["peak_kb"] = max(record["peak_kb"], self._page.get("peak_kb", 0.0))
+                self._page.update(record)
             else:
-                result.append(ch)
-                i += 1
+                self._page["stages"][name] = record
+
+    def report(self) -> dict:
+        """Per-page records plus per-stage totals across pages."""
+        stages = {}
+        for source_rel, page in self.pages.items():
+            for name, record in page["stages"].items():
+                total = stages.setdefault(name, {
+                    "self_ms": 0.0, "max_self_ms": 0.0, "slowest_page": None, "peak_kb": 0.0})
+                total["self_ms"] = round(total["self_ms"] + record["self_ms"], 3)
+                total["peak_kb"] = max(total["peak_kb"], record["peak_kb"])
+                if record["self_ms"] >= total["max_self_ms"]:
+                    total["max_self_ms"] = record["self_ms"]
+                    total["slowest_page"] = source_rel
+        return {
+            "total_ms": round(sum(page["ms"] for page in self.pages.values()), 3),
+            "stages": dict(sorted(stages.items(), key=lambda item: -item[1]["self_ms"])),
+            "pages": dict(sorted(self.pages.items(), key=lambda item: -item[1]["ms"])),
+        }
+
 
+PROFILER = StageProfiler()
+
+
+def profile_stage(name: str):
+    """Context manager timing a stage of the page being profiled."""
+    return PROFILER.stage(name)
+
+
+def print_profile(report: dict):
+    """Print the summary tables of a StageProfiler report."""
+    total = report["total_ms"] or 1.0
+    print(f"  {'stage':<22} {'self ms':>9} {'share':>6} {'peak KB':>9}  slowest page")
+    for name, stage in report["stages"].items():
+        print(f"  {name:<22} {stage['self_ms']:>9.1f} {stage['self_ms'] / total:>6.1%} "
+              f"{stage['peak_kb']:>9.1f}  {stage['slowest_page']} ({stage['max_self_ms']:.1f} ms)")
+
+    print(f"\n  {'page':<62} {'ms':>8} {'peak KB':>9}")
+    for source_rel, page in list(report["pages"].items())[:PROFILE_TOP_PAGES]:
+        print(f"  {source_rel:<62} {page['ms']:>8.1f} {page['peak_kb']:>9.1f}")
+    print(f"\n  {len(report['pages'])} pages, {report['total_ms']:.1f} ms total")
+
+
+# ---------------------------------------------------------------------------
+# JSON syntax highlighter (matches hand-crafted .tok-* classes)
+# ---------------------------------------------------------------------------
+
+# One alternative per token class, tried in this order at each position.
+# Strings may open with a raw quote or the &quot; entity (the code is already
+# HTML-escaped); a backslash always consumes the following character. Every
+# alternative is a single left-to-right scan with no backtracking, so
+# highlighting is linear in the length of the code.
+JSON_TOKEN_RE = re.compile(
+    r'(?P<str>&quot;(?:\\[\s\S]?|[^\\&]|&(?!quot;))*(?:&quot;)?'
+    r'|"(?:\\[\s\S]?|[^\\"&]|&(?!quot;))*(?:"|&quot;)?)'
+    r'|(?P<num>-?[0-9][0-9.eE+-]*|true|false|null)'
+    r'|(?P<bracket>[{}\[\]])'
+)
+
+
+def highlight_json(code_text: str) -> str:
+    """Apply .tok-* span highlighting to HTML-escaped JSON code."""
+    result = []
+    pos = 0
+    for m in JSON_TOKEN_RE.finditer(code_text):
+        start, end = m.span()
+        if start > pos:
+            result.append(code_text[pos:start])
+        kind = m.lastgroup
+        if kind == 'str':
+            # A string followed by optional whitespace then a colon is a key
+            is_key = code_text[end:end + 10].lstrip().startswith(':')
+            kind = 'key' if is_key else 'str'
+        result.append(f'<span class="tok-{kind}">{m.group()}</span>')
+        pos = end
+    result.append(code_text[pos:])
     return ''.join(result)
 
 
@@ -770,26 +896,6 @@ def preprocess_markdown(text: str) -> str:
     return '\n'.join(result)
 
 
-def convert_markdown(text: str) -> str:
-    """Convert markdown text to HTML body using Python-Markdown."""
-    text = preprocess_markdown(text)
-    md = markdown.Markdown(
-        extensions=[
-            'tables',
-            'fenced_code',
-            'toc',
-            'md_in_html',
-        ],
-        extension_configs={
-            'toc': {
-                'permalink': False,
-                'slugify': _slugify,
-            },
-        },
-    )
-    return md.convert(text)
-
-
 def _slugify(value, separator):
     """Generate URL-friendly slug from heading text."""
     # Remove HTML tags
@@ -806,158 +912,312 @@ def _slugify(value, separator):
 
 
 # ---------------------------------------------------------------------------
-# Post-processing
+# Post-processing (a heading tree pass and one scan of the serialized page)
 # ---------------------------------------------------------------------------
 
-def wrap_tables(body: str) -> str:
-    """Wrap <table> elements in <div class="table-wrap">."""
-    return re.sub(
-        r'(<table.*?</table>)',
-        r'<div class="table-wrap">\1</div>',
-        body,
-        flags=re.DOTALL,
-    )
+HEADING_ANCHOR_LABEL = "Link to this section"
+JSON_CODE_OPEN = '<code class="language-json">'
 
 
-def add_heading_anchors(body: str) -> str:
-    """Add .heading-anchor links inside h2/h3/h4 tags that have ids."""
-    def _add_anchor(m):
-        tag = m.group(1)   # h2, h3, h4
-        attrs = m.group(2)  # everything between <hN and >
-        content = m.group(3)
-        # Extract id
-        id_match = re.search(r'id="([^"]+)"', attrs)
-        if not id_match:
-            return m.group(0)
-        heading_id = id_match.group(1)
-        anchor = f'<a class="heading-anchor" href="#{heading_id}" aria-label="Link to this section">#</a>'
-        return f'<{tag}{attrs}>{anchor}{content}</{tag}>'
-
-    return re.sub(
-        r'<(h[234])([^>]*)>(.*?)</\1>',
-        _add_anchor,
-        body,
-    )
+def _relative_url(target_url: str, source_url: str) -> str:
+    """Directory-style URL of the page at target_url, relative to source_url."""
+    rel = os.path.relpath(target_url, source_url).replace('\\', '/')
+    return './' if rel == '.' else rel + '/'
+
+
+# Route table: (source page URL, target .md source) -> relative URL, so
+# rewriting a link is a dictionary lookup. Filled on first use: a table of
+# every pair of pages up front grows with the square of the page count.
+ROUTES = {}
 
+# (source_rel, .md path as written) -> target .md source, or None if the path
+# is not a page in MD_TO_URL. Filled on first use; the same DataTypes link
+# appears hundreds of times across the schema pages.
+_RESOLVED_PATHS = {}
 
-def rewrite_md_links(body: str, source_rel: str, source_url: str) -> str:
-    """Rewrite .md links to clean URL paths using MD_TO_URL mapping."""
+
+def _resolve_path(path_part: str, source_rel: str):
+    # Resolve the target .md path relative to source file's directory
     source_dir = str(Path(source_rel).parent)
+    if source_dir and source_dir != '.':
+        resolved = os.path.normpath(os.path.join(source_dir, path_part))
+    else:
+        resolved = os.path.normpath(path_part)
+    return resolved if resolved in MD_TO_URL else None  # None: unknown .md file
 
-    def _rewrite(m):
-        prefix = m.group(1)  # href=" or src="
-        url = m.group(2)
-        suffix = m.group(3)  # closing quote
 
-        # Only rewrite relative .md links
-        if '://' in url or url.startswith('#') or url.startswith('mailto:'):
-            return m.group(0)
+def resolve_md_link(url: str, source_rel: str):
+    """Resolve a relative .md link to (target_source_rel, fragment).
 
-        # Split fragment
-        if '#' in url:
-            path_part, fragment = url.split('#', 1)
-            fragment = '#' + fragment
-        else:
-            path_part = url
-            fragment = ''
+    Returns None for anything that is not a link to a page in MD_TO_URL.
+    """
+    # Only rewrite relative .md links
+    if '://' in url or url.startswith('#') or url.startswith('mailto:'):
+        return None
+
+    # Split fragment
+    path_part, sep, fragment = url.partition('#')
+    if not path_part.endswith('.md'):
+        return None
+
+    key = (source_rel, path_part)
+    try:
+        resolved = _RESOLVED_PATHS[key]
+    except KeyError:
+        resolved = _RESOLVED_PATHS[key] = _resolve_path(path_part, source_rel)
+    if resolved is None:
+        return None
+    return resolved, sep + fragment
+
+
+def page_route(target_rel: str, source_url: str) -> str:
+    """Relative URL from the page at source_url to the page for target_rel."""
+    key = (source_url, target_rel)
+    try:
+        return ROUTES[key]
+    except KeyError:
+        route = ROUTES[key] = _relative_url(MD_TO_URL[target_rel], source_url)
+        return route
+
+
+def rewrite_md_link(url: str, source_rel: str, source_url: str) -> str:
+    """Rewrite a relative .md link to its clean URL path using MD_TO_URL."""
+    target = resolve_md_link(url, source_rel)
+    if target is None:
+        return url  # not a link to a known .md file, leave as-is
+    resolved, fragment = target
+    return page_route(resolved, source_url) + fragment
+
+
+def find_broken_anchors(page_info: dict) -> list:
+    """Return (source_rel, target_rel, fragment) for every link whose
+    #fragment is not an id on the target page.
+
+    page_info maps each rendered source to its anchors and links, as left by
+    PagePostprocessor in ``md.page_info``.
+    """
+    anchors = {source_rel: set(info["anchors"]) for source_rel, info in page_info.items()}
+    broken = []
+    for source_rel, info in sorted(page_info.items()):
+        for target_rel, fragment in info["links"]:
+            if fragment and unquote(fragment) not in anchors.get(target_rel, ()):
+                broken.append((source_rel, target_rel, fragment))
+    return broken
 
-        if not path_part.endswith('.md'):
-            return m.group(0)
 
-        # Resolve the target .md path relative to source file's directory
-        if source_dir and source_dir != '.':
-            resolved = os.path.normpath(os.path.join(source_dir, path_part))
-        else:
-            resolved = os.path.normpath(path_part)
+def _heading_text(inner_html: str) -> str:
+    """Plain text of a heading's rendered inner HTML."""
+    return re.sub(r'<[^>]+>', '', inner_html)
+
 
-        # Look up target's clean URL path
-        if resolved not in MD_TO_URL:
-            return m.group(0)  # unknown .md file, leave as-is
+def _iter_toc_tokens(tokens: list):
+    """Yield toc extension tokens depth-first, in document order."""
+    for token in tokens:
+        yield token
+        yield from _iter_toc_tokens(token['children'])
 
-        target_url = MD_TO_URL[resolved]
 
-        # Compute relative path from source page to target page
-        rel = os.path.relpath(target_url, source_url).replace('\\', '/')
+class PageTreeprocessor(Treeprocessor):
+    """Apply the heading transforms in one pass over the document's headings.
 
-        # Build directory-style URL with trailing slash
-        if rel == '.':
-            new_url = './' + fragment
+    Overrides index heading ids, removes the title h1, adds .heading-anchor
+    links and collects the h2 TOC. Only headings are visited, through
+    ElementTree's C-level iter(tag), not a Python walk over every element.
+    Runs after the toc extension, whose tokens supply the rendered heading
+    text. Fenced code blocks live in the raw-HTML stash rather than the
+    tree, so JSON blocks are highlighted there.
+
+    The title and TOC are left on the Markdown instance as
+    ``md.page_title`` and ``md.page_toc``; links and ids are handled by
+    PagePostprocessor on the serialized page.
+    """
+
+    def __init__(self, md, source_rel: str, url_path: str, is_index: bool):
+        super().__init__(md)
+        self.source_rel = source_rel
+        self.url_path = url_path
+        self.is_index = is_index
+
+    def run(self, root):
+        self.heading_html = {t['id']: t['html'] for t in _iter_toc_tokens(self.md.toc_tokens)}
+        self.title = None
+        self.toc = []
+
+        with profile_stage("post:headings"):
+            title_el = next(root.iter('h1'), None)
+            if title_el is not None:
+                self.title = html.unescape(self._text(title_el))  # decode &amp; etc. to avoid double-encoding later
+            for tag in ('h2', 'h3', 'h4'):
+                for el in root.iter(tag):
+                    self._heading(el)
+        if title_el is not None:
+            with profile_stage("post:remove_title"):
+                self._remove_title(root, title_el)
+        with profile_stage("post:highlight_json"):
+            self._highlight_json_blocks()
+
+        self.md.page_title = "OCPP.md" if self.title is None else self.title
+        self.md.page_toc = self.toc
+
+    def _text(self, el) -> str:
+        return _heading_text(self.heading_html.get(el.get('id'), ''))
+
+    def _heading(self, el):
+        heading_id = el.get('id')
+        text = self._text(el)
+
+        # Override auto-generated ids on the index to match the hand-crafted ones
+        if self.is_index:
+            lookup = INDEX_HEADING_IDS if el.tag == 'h2' else INDEX_SUBHEADING_IDS
+            heading_id = lookup.get(text.strip(), heading_id)
+            el.set('id', heading_id)
+
+        if not heading_id:
+            return
+
+        # Stashed as raw HTML: the serializer would reorder the attributes
+        anchor = self.md.htmlStash.store(
+            f'<a class="heading-anchor" href="#{html.escape(heading_id)}" '
+            f'aria-label="{HEADING_ANCHOR_LABEL}">#</a>')
+        el.text = anchor + (el.text or '')
+
+        if el.tag == 'h2':
+            label = html.unescape(text.strip())  # decode &amp; etc. to avoid double-encoding in TOC
+            # Strip leading number prefix like "1. " for cleaner TOC
+            self.toc.append((heading_id, re.sub(r'^\d+\.\s*', '', label)))
+
+    def _remove_title(self, root, el):
+        # The title is almost always a top-level element; search deeper only if not
+        parent = root if any(child is el for child in root) else next(
+            p for p in root.iter() if any(child is el for child in p))
+        index = list(parent).index(el)
+        tail = el.tail
+        parent.remove(el)
+
+        # Also remove an <hr> immediately after a leading h1 (common in markdown)
+        if (parent is root and index == 0 and not (root.text or '').strip()
+                and not (tail or '').strip() and len(root) and root[0].tag == 'hr'):
+            tail = root[0].tail
+            root.remove(root[0])
+
+        if index > 0:
+            parent[index - 1].tail = (parent[index - 1].tail or '') + (tail or '')
         else:
-            new_url = rel + '/' + fragment
+            parent.text = (parent.text or '') + (tail or '')
+
+    def _highlight_json_blocks(self):
+        blocks = self.md.htmlStash.rawHtmlBlocks
+        for i, block in enumerate(blocks):
+            if not isinstance(block, str):
+                continue
+            start = block.find(JSON_CODE_OPEN)
+            if start == -1:
+                continue
+            start += len(JSON_CODE_OPEN)
+            end = block.find('</code>', start)
+            blocks[i] = block[:start] + highlight_json(block[start:end]) + block[end:]
+
+
+# One compiled scan of the serialized page: href/src values to rewrite and
+# ids to index, from Markdown and raw HTML alike. The literal leading space
+# (the serializer's attribute separator) keeps the scan fast.
+PAGE_ATTR_RE = re.compile(r' (href|src|id)="([^"]*)"')
+
+
+class PagePostprocessor(Postprocessor):
+    """Rewrite .md links, collect ids and wrap tables in the final HTML.
+
+    Runs after the raw-HTML stash has been put back, so links and ids in
+    raw HTML blocks are covered like those Markdown generated. Leaves
+    ``md.page_info``: the ids the page defines ("anchors") and the
+    [target source, fragment] pairs of every .md link it makes ("links"),
+    for the cross-page anchor check.
+    """
 
-        return f'{prefix}{new_url}{suffix}'
+    def __init__(self, md, source_rel: str, url_path: str):
+        super().__init__(md)
+        self.source_rel = source_rel
+        self.url_path = url_path
+
+    def run(self, text):
+        # The toc extension also runs the postprocessors over each heading's
+        # text, before PageTreeprocessor; only the serialized page is scanned
+        if getattr(self.md, 'page_toc', None) is None:
+            return text
+        anchors = set()
+        links = set()
+
+        def attr(m):
+            name, value = m.groups()
+            if name == 'id':
+                anchors.add(html.unescape(value))
+                return m.group(0)
+            target = resolve_md_link(html.unescape(value), self.source_rel)
+            if target is None:
+                return m.group(0)
+            resolved, fragment = target
+            links.add((resolved, fragment[1:]))
+            escaped_fragment = value[value.index('#'):] if fragment else ''
+            return f' {name}="{page_route(resolved, self.url_path)}{escaped_fragment}"'
+
+        with profile_stage("post:links"):
+            text = PAGE_ATTR_RE.sub(attr, text)
+        with profile_stage("post:wrap_tables"):
+            text = text.replace('<table', '<div class="table-wrap"><table').replace('</table>', '</table></div>')
+
+        self.md.page_info = {
+            "anchors": sorted(anchors),
+            "links": [list(link) for link in sorted(links)],
+        }
+        return text
 
-    return re.sub(
-        r'(href="|src=")(.*?)(")',
-        _rewrite,
-        body,
-    )
 
+class PageExtension(Extension):
+    """Register PageTreeprocessor and PagePostprocessor for one page."""
 
-def highlight_json_blocks(body: str) -> str:
-    """Find <code class="language-json"> blocks and apply JSON syntax highlighting."""
-    def _highlight(m):
-        code_content = m.group(1)
-        highlighted = highlight_json(code_content)
-        return f'<code class="language-json">{highlighted}</code>'
+    def __init__(self, source_rel: str, url_path: str, is_index: bool = False):
+        super().__init__()
+        self.source_rel = source_rel
+        self.url_path = url_path
+        self.is_index = is_index
+
+    def extendMarkdown(self, md):
+        # Priority 4: after toc (5) has assigned heading ids, before unescape (0)
+        md.treeprocessors.register(
+            PageTreeprocessor(md, self.source_rel, self.url_path, self.is_index),
+            'ocpp_page', 4)
+        # Priority 25: after raw_html (30) has restored the stash, before
+        # amp_substitute (20)
+        md.postprocessors.register(
+            PagePostprocessor(md, self.source_rel, self.url_path), 'ocpp_page', 25)
 
-    return re.sub(
-        r'<code class="language-json">(.*?)</code>',
-        _highlight,
-        body,
-        flags=re.DOTALL,
-    )
 
+def convert_markdown(text: str, source_rel: str, url_path: str, is_index: bool = False) -> tuple:
+    """Convert markdown text to a page using Python-Markdown.
 
-def extract_title(body: str) -> tuple:
-    """Extract and remove the first <h1> from the body. Returns (title, body_without_h1)."""
-    m = re.search(r'<h1[^>]*>(.*?)</h1>', body)
-    if m:
-        title = re.sub(r'<[^>]+>', '', m.group(1))  # strip inner tags
-        title = html.unescape(title)  # decode &amp; etc. to avoid double-encoding later
-        body = body[:m.start()] + body[m.end():]
-        # Also remove any <hr> immediately after the h1 (common in markdown)
-        body = re.sub(r'^\s*<hr\s*/?>', '', body, count=1)
-        return title, body
-    return "OCPP.md", body
-
-
-def extract_h2_toc(body: str) -> list:
-    """Extract (id, text) pairs from h2 headings for TOC bar generation."""
-    toc = []
-    for m in re.finditer(r'<h2[^>]*id="([^"]+)"[^>]*>(?:<a[^>]*>.*?</a>)?(.*?)</h2>', body):
-        heading_id = m.group(1)
-        text = re.sub(r'<[^>]+>', '', m.group(2)).strip()
-        text = html.unescape(text)  # decode &amp; etc. to avoid double-encoding in TOC
-        # Strip leading number prefix like "1. " for cleaner TOC
-        short = re.sub(r'^\d+\.\s*', '', text)
-        toc.append((heading_id, short))
-    return toc
-
-
-def override_heading_ids(body: str, is_index: bool) -> str:
-    """For the index page, override auto-generated heading IDs to match the hand-crafted ones."""
-    if not is_index:
-        return body
-
-    def _override_h2(m):
-        full_tag = m.group(0)
-        tag = m.group(1)
-        attrs = m.group(2)
-        content = m.group(3)
-        # Get text content for lookup
-        text = re.sub(r'<[^>]+>', '', content).strip()
-        lookup = INDEX_HEADING_IDS if tag == 'h2' else INDEX_SUBHEADING_IDS
-        if text in lookup:
-            new_id = lookup[text]
-            attrs = re.sub(r'id="[^"]*"', f'id="{new_id}"', attrs)
-            return f'<{tag}{attrs}>{content}</{tag}>'
-        return full_tag
-
-    body = re.sub(r'<(h2)([^>]*)>(.*?)</\1>', _override_h2, body)
-    body = re.sub(r'<(h3)([^>]*)>(.*?)</\1>', _override_h2, body)
-    body = re.sub(r'<(h4)([^>]*)>(.*?)</\1>', _override_h2, body)
-    return body
+    Returns (title, body, toc_items, page_info); see PageTreeprocessor and
+    PagePostprocessor.
+    """
+    with profile_stage("preprocess"):
+        text = preprocess_markdown(text)
+    with profile_stage("markdown"):
+        md = markdown.Markdown(
+            extensions=[
+                'tables',
+                'fenced_code',
+                'toc',
+                'md_in_html',
+                PageExtension(source_rel, url_path, is_index),
+            ],
+            extension_configs={
+                'toc': {
+                    'permalink': False,
+                    'slugify': _slugify,
+                },
+            },
+        )
+        body = md.convert(text)
+    return md.page_title, body, md.page_toc, md.page_info
 
 
 # ---------------------------------------------------------------------------
@@ -996,8 +1256,13 @@ def build_page(
     url_path: str,
     is_index: bool = False,
     description: str = "",
+    assets: dict = None,
 ) -> str:
-    """Assemble a complete HTML page."""
+    """Assemble a complete HTML page.
+
+    With assets ({"css": url, "js": url}) the stylesheet and script are
+    referenced instead of inlined.
+    """
 
     # Raw markdown link: relative path from HTML page's directory to .md file
     raw_md_href = os.path.relpath(source_rel, url_path).replace('\\', '/')
@@ -1055,6 +1320,13 @@ def build_page(
 
     toc_bar_html = build_toc_bar_html(toc_items)
 
+    if assets:
+        style_html = f'<link rel="stylesheet" href="{assets["css"]}">'
+        script_html = f'<script src="{assets["js"]}"></script>'
+    else:
+        style_html = f"<style>\n{SITE_CSS}\n</style>"
+        script_html = f"<script>\n{SITE_JS}\n</script>"
+
     return f"""\
 <!DOCTYPE html>
 <html lang="en">
@@ -1062,9 +1334,7 @@ def build_page(
 {HEAD_COMMON}
 <title>{html.escape(page_title)}</title>
 <meta name="description" content="{html.escape(description)}">
-<style>
-{SITE_CSS}
-</style>
+{style_html}
 </head>
 <body>
 
@@ -1079,9 +1349,7 @@ def build_page(
 {body}
 </main>
 
-<script>
-{SITE_JS}
-</script>
+{script_html}
 
 </body>
 </html>
@@ -1089,116 +1357,541 @@ def build_page(
 
 
 # ---------------------------------------------------------------------------
-# Main
+# Build manifest (incremental builds)
 # ---------------------------------------------------------------------------
 
-def process_file(source_rel: str, url_path: str):
-    """Process a single markdown file and write the HTML output."""
-    source_path = ROOT / source_rel
-    is_index = (source_rel == INDEX_SOURCE)
-    out_rel = url_to_output_path(url_path)
+def _hash_bytes(data: bytes) -> str:
+    """Return the hex SHA-256 of raw bytes."""
+    return hashlib.sha256(data).hexdigest()
 
-    print(f"  {source_rel} -> {out_rel}")
 
-    # Read markdown
-    md_text = source_path.read_text(encoding='utf-8')
+def _hash_text(text: str) -> str:
+    """Return the hex SHA-256 of a UTF-8 string."""
+    return _hash_bytes(text.encode('utf-8'))
 
-    # Convert to HTML
-    body = convert_markdown(md_text)
 
-    # Override heading IDs for index page
-    body = override_heading_ids(body, is_index)
+# Hash of the generator as loaded, so a watch session that outlives an edit
+# to this file does not record output rendered by the old code as current
+GENERATOR_HASH = _hash_bytes(Path(__file__).read_bytes())
 
-    # Post-process
-    body = wrap_tables(body)
-    body = highlight_json_blocks(body)
-    body = rewrite_md_links(body, source_rel, url_path)
 
-    # Extract title (first h1)
-    title, body = extract_title(body)
+def build_fingerprint(external_assets: bool = False) -> dict:
+    """Hash every input shared by all pages.
 
-    # Add heading anchors (after title extraction)
-    body = add_heading_anchors(body)
+    A change to any of these invalidates every rendered page: the templates
+    are inlined into (or referenced by hash from) each page, the generator
+    source decides how pages are rendered, and the link-target set decides
+    how .md links are rewritten.
+    """
+    return {
+        "assets": "external" if external_assets else "inline",
+        "SITE_CSS": _hash_text(SITE_CSS),
+        "SITE_JS": _hash_text(SITE_JS),
+        "HEAD_COMMON": _hash_text(HEAD_COMMON),
+        "generator": GENERATOR_HASH,
+        "link_targets": _hash_text(json.dumps(sorted(MD_TO_URL.items()))),
+    }
+
+
+def load_manifest() -> dict:
+    """Load the previous build manifest, or an empty one if missing/corrupt."""
+    try:
+        manifest = json.loads(MANIFEST_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {"fingerprint": {}, "outputs": {}, "pages": {}, "skipped": {}}
+    manifest.setdefault("fingerprint", {})
+    manifest.setdefault("outputs", {})
+    manifest.setdefault("pages", {})
+    manifest.setdefault("skipped", {})
+    return manifest
+
+
+def save_manifest(fingerprint: dict, outputs: dict, page_info: dict, skipped: dict):
+    """Write the manifest for the build that just finished."""
+    manifest = {
+        "fingerprint": fingerprint,
+        "outputs": dict(sorted(outputs.items())),
+        "pages": dict(sorted(page_info.items())),
+        "skipped": dict(sorted(skipped.items())),
+    }
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2) + "\n", encoding='utf-8')
 
-    # Generate TOC
+
+def remove_orphans(previous: dict, outputs: dict) -> int:
+    """Delete outputs of the previous build that this build no longer produces."""
+    removed = 0
+    for out_rel in sorted(set(previous) - set(outputs)):
+        out_path = OUTPUT_DIR / out_rel
+        if out_path.is_file():
+            out_path.unlink()
+            removed += 1
+            print(f"  [removed] {out_rel}")
+        # Prune directories left empty, stopping at OUTPUT_DIR
+        parent = out_path.parent
+        while parent != OUTPUT_DIR and parent.is_dir() and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+    return removed
+
+
+def is_stale(out_rel: str, input_hash: str, previous: dict) -> bool:
+    """True if out_rel must be (re)generated for the given input hash."""
+    return previous.get(out_rel) != input_hash or not (OUTPUT_DIR / out_rel).exists()
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def render_page(source_rel: str, url_path: str, assets: dict = None) -> tuple:
+    """Render a single markdown file to a complete HTML page.
+
+    Returns (page_html, page_info); see PagePostprocessor. Pure function
+    of its inputs so it can run in a worker process.
+    """
+    source_path = ROOT / source_rel
+    is_index = (source_rel == INDEX_SOURCE)
+
+    # Read markdown
+    with profile_stage("read"):
+        md_text = source_path.read_text(encoding='utf-8')
+
+    # Convert to HTML and post-process in one tree walk
+    title, body, toc_items, page_info = convert_markdown(md_text, source_rel, url_path, is_index)
+
+    # The index page uses a hand-picked TOC
     if is_index:
         toc_items = INDEX_TOC
-    else:
-        toc_items = extract_h2_toc(body)
 
     # Assemble page
-    page_html = build_page(
-        title=title,
-        body=body,
-        toc_items=toc_items,
-        source_rel=source_rel,
-        url_path=url_path,
-        is_index=is_index,
-    )
+    with profile_stage("build_page"):
+        page_html = build_page(
+            title=title,
+            body=body,
+            toc_items=toc_items,
+            source_rel=source_rel,
+            url_path=url_path,
+            is_index=is_index,
+            assets=assets,
+        )
+    return page_html, page_info
+
 
-    # Write output
+def write_page(out_rel: str, page_html: str):
+    """Write a rendered page below OUTPUT_DIR."""
     out_path = OUTPUT_DIR / out_rel
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(page_html, encoding='utf-8')
 
 
-def copy_static_files():
+def process_file(source_rel: str, url_path: str, assets: dict = None) -> tuple:
+    """Process a single markdown file; the HTML is written by build() once
+    every page's anchors are checked.
+
+    Returns (page_html, page_info); see PagePostprocessor.
+    """
+    print(f"  {source_rel} -> {url_to_output_path(url_path)}")
+    with PROFILER.page(source_rel):
+        return render_page(source_rel, url_path, assets)
+
+
+def render_pages(
+    pages: list,
+    outputs: dict,
+    previous: dict,
+    pool=None,
+    assets: dict = None,
+    page_info: dict = None,
+) -> list:
+    """Render (source_rel, url_path) pages whose source changed since the
+    previous build. Records each page's source hash in outputs and returns
+    the rendered pages as (source_rel, out_rel, page_html), for build() to
+    write.
+
+    page_info maps source_rel to the anchors and links of every page built
+    so far; rendered pages are updated in it, and a page missing from it is
+    rendered even if its output is current.
+
+    With a process pool, pages render in parallel but are logged and
+    returned in input order, so output is identical to the serial build.
+    """
+    page_info = {} if page_info is None else page_info
+    stale = []
+    for source_rel, url_path in pages:
+        out_rel = os.path.normpath(url_to_output_path(url_path))
+        source_hash = _hash_bytes((ROOT / source_rel).read_bytes())
+        outputs[out_rel] = source_hash
+        if source_rel not in page_info or is_stale(out_rel, source_hash, previous):
+            stale.append((source_rel, url_path))
+
+    rendered = []
+    if pool is None or len(stale) < 2:
+        for source_rel, url_path in stale:
+            page_html, page_info[source_rel] = process_file(source_rel, url_path, assets)
+            rendered.append((source_rel, url_to_output_path(url_path), page_html))
+        return rendered
+
+    sources = [source_rel for source_rel, _url_path in stale]
+    urls = [url_path for _source_rel, url_path in stale]
+    results = pool.map(render_page, sources, urls, [assets] * len(stale))
+    for source_rel, url_path, (page_html, info) in zip(sources, urls, results):
+        out_rel = url_to_output_path(url_path)
+        print(f"  {source_rel} -> {out_rel}")
+        rendered.append((source_rel, out_rel, page_html))
+        page_info[source_rel] = info
+    return rendered
+
+
+def _copy(src: Path, out_rel: str, label: str, outputs: dict, previous: dict):
+    """Copy src to OUTPUT_DIR/out_rel unless the previous build already did."""
+    file_hash = _hash_bytes(src.read_bytes())
+    outputs[out_rel] = file_hash
+    if not is_stale(out_rel, file_hash, previous):
+        return
+    dst = OUTPUT_DIR / out_rel
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(src, dst)
+    print(f"  {label}")
+
+
+def _write(out_rel: str, data: bytes, label: str, outputs: dict, previous: dict):
+    """Write generated data to OUTPUT_DIR/out_rel unless it is unchanged."""
+    file_hash = _hash_bytes(data)
+    outputs[out_rel] = file_hash
+    if not is_stale(out_rel, file_hash, previous):
+        return
+    dst = OUTPUT_DIR / out_rel
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    dst.write_bytes(data)
+    print(f"  {label}")
+
+
+def _asset_files():
+    """Yield (kind, out_rel, data) of SITE_CSS and SITE_JS as content-hashed files."""
+    for kind, content in (("css", SITE_CSS), ("js", SITE_JS)):
+        data = (content + "\n").encode('utf-8')
+        yield kind, f"{ASSETS_DIR}/site.{_hash_bytes(data)[:12]}.{kind}", data
+
+
+def asset_urls() -> dict:
+    """URLs of the files write_assets() writes, for rendering pages first."""
+    return {kind: "/" + out_rel for kind, out_rel, _data in _asset_files()}
+
+
+def write_assets(outputs: dict, previous: dict) -> dict:
+    """Write SITE_CSS and SITE_JS as content-hashed files. Returns their URLs."""
+    assets = {}
+    for kind, out_rel, data in _asset_files():
+        _write(out_rel, data, f"[asset] {out_rel}", outputs, previous)
+        assets[kind] = "/" + out_rel
+    return assets
+
+
+def build_headers(src: Path) -> bytes:
+    """_headers contents: the checked-in file (if any) plus asset cache rules."""
+    headers = src.read_text(encoding='utf-8') if src.exists() else ""
+    if headers and not headers.endswith("\n"):
+        headers += "\n"
+    if headers:
+        headers += "\n"
+    return (headers + ASSET_CACHE_HEADERS).encode('utf-8')
+
+
+def copy_static_files(outputs: dict = None, previous: dict = None, assets: dict = None):
     """Copy static files and raw .md sources to public/."""
+    outputs = {} if outputs is None else outputs
+    previous = previous or {}
+
     # Static files (favicons, _headers)
     for f in STATIC_FILES:
         src = ROOT / f
-        if src.exists():
-            dst = OUTPUT_DIR / f
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
-            print(f"  [static] {f}")
+        if f == "_headers" and assets:
+            _write(f, build_headers(src), f"[static] {f} (+ asset cache rules)", outputs, previous)
+        elif src.exists():
+            _copy(src, f, f"[static] {f}", outputs, previous)
 
     # Standalone HTML pages (tools, generators)
     for src_file, out_dir in STANDALONE_PAGES:
         src = ROOT / src_file
         if src.exists():
-            dst = OUTPUT_DIR / out_dir / "index.html"
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
-            print(f"  [standalone] {src_file} -> {out_dir}/")
+            out_rel = os.path.join(out_dir, "index.html")
+            _copy(src, out_rel, f"[standalone] {src_file} -> {out_dir}/", outputs, previous)
 
     # Raw .md copies (keep original names and directory structure)
     for source_rel, _url_path in CONTENT_FILES:
-        src = ROOT / source_rel
-        dst = OUTPUT_DIR / source_rel
-        dst.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src, dst)
-        print(f"  [md] {source_rel}")
+        _copy(ROOT / source_rel, source_rel, f"[md] {source_rel}", outputs, previous)
 
 
-def generate_root_index():
-    """Generate a root index.html with links resolved relative to site root."""
-    process_file(INDEX_SOURCE, ".")
+def compress_variant(ext: str, data: bytes) -> bytes:
+    """Compress data for the .gz or .br sibling at maximum compression."""
+    if ext == ".br":
+        return brotli.compress(data, quality=11)
+    # mtime=0 keeps the output reproducible across builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
 
 
-def main():
-    print(f"Generating site into {OUTPUT_DIR}/\n")
+def precompress_outputs(outputs: dict, previous: dict, skipped: dict, previous_skipped: dict):
+    """Write .gz/.br siblings for every text output and report the ratios.
 
-    # Clean output directory
-    if OUTPUT_DIR.exists():
-        shutil.rmtree(OUTPUT_DIR)
-    OUTPUT_DIR.mkdir(parents=True)
+    A sibling is keyed to the input hash of the file it compresses, so
+    incremental builds only recompress files that were regenerated. A
+    sibling not worth writing (file too small, or too little saved) is
+    recorded in skipped under the same hash, so it is not retried either.
+    """
+    exts = [".gz", ".br"] if brotli is not None else [".gz"]
+    if brotli is None:
+        print("  brotli not installed; writing .gz only (pip install brotli)")
+
+    total_in = 0
+    total_out = dict.fromkeys(exts, 0)
+    for out_rel in sorted(outputs):
+        if Path(out_rel).suffix not in PRECOMPRESS_EXTENSIONS:
+            continue
+        input_hash = outputs[out_rel]
+        data = None
+        ratios = []
+        for ext in exts:
+            sibling = out_rel + ext
+            if not is_stale(sibling, input_hash, previous):
+                outputs[sibling] = input_hash
+                continue
+            if previous_skipped.get(sibling) == input_hash:
+                skipped[sibling] = input_hash
+                continue
+            if data is None:
+                data = (OUTPUT_DIR / out_rel).read_bytes()
+            compressed = compress_variant(ext, data) if len(data) >= PRECOMPRESS_MIN_SIZE else None
+            if compressed is None or len(compressed) > len(data) * PRECOMPRESS_MAX_RATIO:
+                skipped[sibling] = input_hash
+                continue
+            (OUTPUT_DIR / sibling).write_bytes(compressed)
+            outputs[sibling] = input_hash
+            total_out[ext] += len(compressed)
+            ratios.append(f"{ext[1:]} {len(compressed) / len(data):.0%}")
+        if ratios:
+            total_in += len(data)
+            print(f"  {out_rel}  {len(data) / 1024:.1f} KB -> {', '.join(ratios)}")
+
+    if total_in:
+        sizes = ", ".join(f"{ext[1:]} {size / 1024:.1f} KB" for ext, size in total_out.items())
+        print(f"  Total: {total_in / 1024:.1f} KB -> {sizes}")
+
+
+# ---------------------------------------------------------------------------
+# Watch mode and local dev server
+# ---------------------------------------------------------------------------
+
+WATCH_INTERVAL = 0.25  # seconds between polls
 
-    # Process markdown files
-    print("Converting markdown to HTML:")
-    for source_rel, url_path in CONTENT_FILES:
-        process_file(source_rel, url_path)
 
-    # Copy index to site root
-    print("\nRoot index:")
-    generate_root_index()
+class DevRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serve OUTPUT_DIR uncached and without per-request log lines."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=str(OUTPUT_DIR), **kwargs)
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def watched_files() -> list:
+    """Every input file of the site, relative to ROOT."""
+    files = [source_rel for source_rel, _url_path in CONTENT_FILES] + [INDEX_SOURCE]
+    files += [src_file for src_file, _out_dir in STANDALONE_PAGES]
+    files += STATIC_FILES
+    return files
+
+
+def _mtimes(files: list) -> dict:
+    mtimes = {}
+    for f in files:
+        try:
+            mtimes[f] = (ROOT / f).stat().st_mtime_ns
+        except OSError:
+            mtimes[f] = None
+    return mtimes
+
+
+def watch(args):
+    """Serve OUTPUT_DIR on localhost and rebuild whenever an input changes.
+
+    Only changed pages are re-rendered; links into them from other pages
+    are re-checked against the manifest's anchors (see
+    find_broken_anchors). Static files and raw .md copies are refreshed by
+    the incremental build's content hashes.
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", args.port), DevRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"\nServing {OUTPUT_DIR}/ at http://127.0.0.1:{args.port}/")
+    print("Watching for changes (Ctrl+C to stop)")
+
+    files = watched_files()
+    mtimes = _mtimes(files)
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            current = _mtimes(files)
+            changed = {f for f in files if current[f] != mtimes[f]}
+            if not changed:
+                continue
+            mtimes = current
+
+            print(f"\nChanged: {', '.join(sorted(changed))}")
+            start = time.perf_counter()
+            build(args, incremental=True)
+            print(f"Rebuilt in {(time.perf_counter() - start) * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        server.shutdown()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the ocpp.md static site.")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="reuse public/ from the previous build; re-render only pages whose "
+             "source, templates or link targets changed and remove orphans",
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1, metavar="N",
+        help="render pages in N worker processes (0 = one per CPU; default: 1)",
+    )
+    parser.add_argument(
+        "--external-assets", action="store_true",
+        help=f"write SITE_CSS/SITE_JS once as content-hashed files in /{ASSETS_DIR}/ "
+             "instead of inlining them into every page",
+    )
+    parser.add_argument(
+        "--precompress", action="store_true",
+        help="write .gz (and .br, if brotli is installed) siblings of every text output",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="after building, serve public/ on localhost and rebuild affected pages on change",
+    )
+    parser.add_argument(
+        "--port", type=int, default=8000,
+        help="port for the --watch dev server (default: 8000)",
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const=PROFILE_PATH, type=Path, metavar="PATH",
+        help="record wall time and peak memory of every rendering stage per page, "
+             f"print a summary and write a JSON report (default: {PROFILE_PATH.name}); "
+             "renders serially",
+    )
+    return parser.parse_args()
+
+
+def report_broken_anchors(broken: list):
+    """Print find_broken_anchors() results to stderr, grouped by page."""
+    print(f"\nERROR: {len(broken)} broken cross-page anchor(s):", file=sys.stderr)
+    current = None
+    for source_rel, target_rel, fragment in broken:
+        if source_rel != current:
+            current = source_rel
+            print(f"  {source_rel}", file=sys.stderr)
+        print(f"    -> {target_rel}#{fragment}", file=sys.stderr)
+
+
+def build(args, incremental: bool) -> list:
+    """Build the site into OUTPUT_DIR.
+
+    Returns the broken cross-page anchors found (see find_broken_anchors).
+    Pages are rendered in memory and checked before anything is written: if
+    an anchor is broken, it is reported and the build stops, leaving
+    OUTPUT_DIR and the manifest as the previous build left them.
+    """
+    print(f"Generating site into {OUTPUT_DIR}/\n")
+
+    fingerprint = build_fingerprint(args.external_assets)
+    previous = {}
+    previous_skipped = {}
+    page_info = {}
+    clean = not (incremental and OUTPUT_DIR.exists())
+    if not clean:
+        manifest = load_manifest()
+        changed = sorted(k for k in fingerprint if manifest["fingerprint"].get(k) != fingerprint[k])
+        if changed:
+            print(f"Full rebuild: changed {', '.join(changed)}\n")
+        else:
+            previous = manifest["outputs"]
+            previous_skipped = manifest["skipped"]
+            page_info = manifest["pages"]
+    outputs = {}
+    skipped = {}
+    assets = asset_urls() if args.external_assets else None
+
+    # Profiled pages render in this process, one at a time
+    PROFILER.reset(enabled=args.profile is not None)
+    jobs = 1 if PROFILER.enabled else args.jobs or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        # Process markdown files
+        print("Converting markdown to HTML:")
+        rendered = render_pages(CONTENT_FILES, outputs, previous, pool, assets, page_info)
+
+        # Copy index to site root
+        print("\nRoot index:")
+        rendered += render_pages([(INDEX_SOURCE, ".")], outputs, previous, pool, assets, page_info)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Every page's anchors are known now, whether rendered or carried over
+    broken = find_broken_anchors(page_info)
+    if broken:
+        report_broken_anchors(broken)
+        print(f"\nNothing written to {OUTPUT_DIR}/", file=sys.stderr)
+        return broken
+
+    if clean and OUTPUT_DIR.exists():
+        shutil.rmtree(OUTPUT_DIR)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    if assets is not None:
+        print("\nWriting assets:")
+        write_assets(outputs, previous)
+    for source_rel, out_rel, page_html in rendered:
+        with PROFILER.page(source_rel), profile_stage("write"):
+            write_page(out_rel, page_html)
 
     # Copy static files
     print("\nCopying static files:")
-    copy_static_files()
+    copy_static_files(outputs, previous, assets)
+
+    if args.precompress:
+        print("\nPrecompressing:")
+        precompress_outputs(outputs, previous, skipped, previous_skipped)
+
+    if incremental:
+        print("\nRemoving orphans:")
+        remove_orphans(load_manifest()["outputs"], outputs)
+    save_manifest(fingerprint, outputs, page_info, skipped)
+
+    if PROFILER.enabled:
+        report = PROFILER.report()
+        args.profile.write_text(json.dumps(report, indent=2) + "\n", encoding='utf-8')
+        print(f"\nProfile ({args.profile}):")
+        print_profile(report)
 
     total = len(CONTENT_FILES)
-    print(f"\nDone! {total} pages generated in {OUTPUT_DIR}/")
+    if incremental:
+        print(f"\nDone! {len(rendered)} of {total + 1} pages re-rendered in {OUTPUT_DIR}/")
+    else:
+        print(f"\nDone! {total} pages generated in {OUTPUT_DIR}/")
+    return broken
+
+
+def main():
+    args = parse_args()
+    if build(args, args.incremental) and not args.watch:
+        sys.exit(1)
+    if args.watch:
+        watch(args)
 
 
 if __name__ == '__main__':
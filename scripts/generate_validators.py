@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+"""
+Generate compiled payload validators from the OCA JSON schemas.
+
+For every OCPP 2.0.1 Request/Response and every OCPP 1.6J .req/.conf,
+writes a straight-line Python function that checks a decoded payload
+against its schema without interpreting the schema at run time:
+  - validators/ocpp201.py
+  - validators/ocpp16.py
+
+Each validator returns a list of (json_pointer, message) errors, empty
+for a valid payload. The modules have no dependencies:
+
+    from validators import ocpp201
+    errors = ocpp201.validate("BootNotification", payload)
+    errors = ocpp201.validate("BootNotification", payload, response=True)
+
+The validators accept exactly what a JSON Schema validator accepts for
+the same schema, with `format` treated as an annotation (the JSON Schema
+default). --check proves this against the jsonschema library: every
+schema is run against a corpus of valid payloads and single-point
+mutations of them (wrong types, missing and extra properties, length,
+bound and item-count edges, unknown enum values).
+
+Usage:
+    python scripts/generate_validators.py [--version {2.0.1,1.6J}] [--check]
+
+Dependencies:
+    pip install jsonschema  # only for --check
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import generated_files
+import schema_ir
+import schema_payloads
+
+try:
+    import jsonschema
+except ImportError:  # optional: only the --check conformance run needs it
+    jsonschema = None
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+OUTPUT_DIR = REPO_ROOT / "validators"
+
+# JSON type → check of a value held in {v}. `integer` follows the schema's
+# draft: draft 4 rejects 1.0, later drafts accept any integral number.
+TYPE_CHECKS = {
+    "string": "isinstance({v}, str)",
+    "number": "isinstance({v}, (int, float)) and not isinstance({v}, bool)",
+    "integer": "isinstance({v}, int) and not isinstance({v}, bool)",
+    "boolean": "isinstance({v}, bool)",
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "null": "{v} is None",
+}
+INTEGRAL_FLOAT_CHECK = "isinstance({v}, int) and not isinstance({v}, bool) or isinstance({v}, float) and {v}.is_integer()"
+
+# Drafts whose `integer` excludes floats with a zero fractional part
+DRAFT4_URIS = ("http://json-schema.org/draft-03/schema#", "http://json-schema.org/draft-04/schema#")
+
+# Runtime helpers every generated module starts with
+MODULE_PRELUDE = '''
+class _Missing:
+    __slots__ = ()
+
+
+_MISSING = _Missing()
+
+
+def _escape(key):
+    """Escape a property name for a JSON pointer (RFC 6901)."""
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _not_multiple_of(value, divisor):
+    """multipleOf as JSON Schema validators evaluate it (float quotient)."""
+    if isinstance(divisor, float):
+        quotient = value / divisor
+        try:
+            return int(quotient) != quotient
+        except OverflowError:
+            return True
+    return value % divisor != 0
+'''
+
+
+# ---------------------------------------------------------------------------
+# Code generation
+# ---------------------------------------------------------------------------
+
+def is_unconstrained(node):
+    """True for a schema that accepts any value (e.g. {} or items: {})."""
+    return not any(getattr(node, attr, None) is not None for attr in (
+        "type", "ref", "enum", "shape", "max_length", "min_length", "minimum",
+        "maximum", "multiple_of", "min_items", "max_items",
+    )) and getattr(node, "items", None) is None
+
+
+def _object_shape(node):
+    """The Shape checked for an object node, or None."""
+    shape = getattr(node, "shape", None)
+    if shape is None:
+        return None
+    if not shape.fields and not shape.required and shape.additional is True:
+        return None
+    return shape
+
+
+class Pointer:
+    """A JSON pointer under construction, from literal segments and code
+    evaluated by the generated function (an index, an unknown key)."""
+
+    def __init__(self, parts=()):
+        self.parts = tuple(parts)
+
+    def key(self, name: str) -> "Pointer":
+        escaped = name.replace("~", "~0").replace("/", "~1")
+        return Pointer(self.parts + (("lit", "/" + escaped),))
+
+    def code(self, expr: str) -> "Pointer":
+        return Pointer(self.parts + (("lit", "/"), ("code", expr)))
+
+    def expr(self) -> str:
+        """Python expression building the pointer; literals are merged."""
+        pieces = []
+        for kind, value in self.parts:
+            if kind == "lit" and pieces and pieces[-1][0] == "lit":
+                pieces[-1] = ("lit", pieces[-1][1] + value)
+            else:
+                pieces.append((kind, value))
+        if not pieces:
+            return "''"
+        return " + ".join(repr(value) if kind == "lit" else value for kind, value in pieces)
+
+
+class ModuleBuilder:
+    """Generated source of one validators module.
+
+    Named definitions become shared check functions, one per distinct
+    body: identical definitions repeated across schema files (e.g.
+    CustomDataType) compile to a single function.
+    """
+
+    def __init__(self):
+        self.constants = {}   # literal source -> constant name
+        self.functions = {}   # (type name, body lines) -> function name
+        self.function_order = []
+        self.resolved = {}    # (schema file, type name) -> function name
+        self.in_progress = set()
+
+    def constant(self, prefix: str, source: str) -> str:
+        if source not in self.constants:
+            self.constants[source] = f"_{prefix}_{len(self.constants)}"
+        return self.constants[source]
+
+    def type_function(self, schema_file, type_name: str, integral_floats: bool) -> str:
+        key = (schema_file.name, type_name)
+        if key in self.resolved:
+            return self.resolved[key]
+        if key in self.in_progress:
+            raise ValueError(f"{schema_file.name}: recursive $ref to {type_name} is not supported")
+        self.in_progress.add(key)
+
+        type_def = schema_file.definitions[type_name]
+        emitter = Emitter(self, schema_file, integral_floats)
+        emitter.node(type_def, "value", Pointer([("code", "path")]), 1)
+        function = (type_name, tuple(emitter.lines) or ("    pass",))
+
+        if function not in self.functions:
+            name = f"_check_{type_name}"
+            taken = set(self.functions.values())
+            suffix = 2
+            while name in taken:
+                name = f"_check_{type_name}_{suffix}"
+                suffix += 1
+            self.functions[function] = name
+            self.function_order.append(function)
+
+        self.in_progress.discard(key)
+        self.resolved[key] = self.functions[function]
+        return self.resolved[key]
+
+    def render_functions(self) -> list:
+        lines = []
+        for function in self.function_order:
+            lines.append("")
+            lines.append("")
+            lines.append(f"def {self.functions[function]}(value, path, errors):")
+            lines.extend(function[1])
+        return lines
+
+    def render_constants(self) -> list:
+        return [f"{name} = {source}" for source, name in self.constants.items()]
+
+
+class Emitter:
+    """Emits the check of one value against a schema node as Python lines."""
+
+    def __init__(self, module: ModuleBuilder, schema_file, integral_floats: bool):
+        self.module = module
+        self.schema_file = schema_file
+        self.integral_floats = integral_floats
+        self.lines = []
+        self.counter = 0
+
+    def var(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def emit(self, indent: int, line: str):
+        self.lines.append("    " * indent + line)
+
+    def error(self, indent: int, path: Pointer, message_expr: str):
+        self.emit(indent, f"errors.append(({path.expr()}, {message_expr}))")
+
+    def type_check(self, json_type: str, v: str) -> str:
+        if json_type == "integer" and self.integral_floats:
+            return INTEGRAL_FLOAT_CHECK.format(v=v)
+        return TYPE_CHECKS[json_type].format(v=v)
+
+    def node(self, node, v: str, path: Pointer, indent: int):
+        """Check the value in variable v against node (Field, TypeDef or SchemaFile)."""
+        ref = getattr(node, "ref", None)
+        if ref is not None:
+            # Draft 4/6: keywords next to $ref are ignored
+            func = self.module.type_function(self.schema_file, ref, self.integral_floats)
+            self.emit(indent, f"{func}({v}, {path.expr()}, errors)")
+            return
+
+        json_type = node.type
+        if isinstance(json_type, list):
+            check = " or ".join(f"({self.type_check(t, v)})" for t in json_type)
+            self.emit(indent, f"if not ({check}):")
+            self.error(indent + 1, path, repr(f"expected {' or '.join(json_type)}"))
+            self.keywords(node, v, path, indent, guarded=True)
+        elif json_type is not None:
+            check = self.type_check(json_type, v)
+            self.emit(indent, f"if not ({check}):" if " and " in check else f"if not {check}:")
+            self.error(indent + 1, path, repr(f"expected {json_type}"))
+            self.emit(indent, "else:")
+            before = len(self.lines)
+            self.keywords(node, v, path, indent + 1, guarded=False, json_type=json_type)
+            if len(self.lines) == before:
+                del self.lines[before - 1]  # no keyword checks: drop the else
+        else:
+            self.keywords(node, v, path, indent, guarded=True)
+
+    def keywords(self, node, v, path, indent, guarded, json_type=None):
+        """Emit the checks of every keyword that applies to the value.
+
+        Unguarded checks run under a passed type check; guarded ones first
+        test that the value has the type the keyword applies to.
+        """
+        def applies(kind):
+            return guarded or json_type == kind or (json_type == "integer" and kind == "number")
+
+        def guard(kind, emit_checks):
+            if not applies(kind):
+                return
+            if guarded:
+                self.emit(indent, f"if {self.type_check(kind, v)}:")
+                before = len(self.lines)
+                emit_checks(indent + 1)
+                if len(self.lines) == before:
+                    self.lines.pop()
+            else:
+                emit_checks(indent)
+
+        enum = getattr(node, "enum", None)
+        if enum is not None:
+            if all(isinstance(item, str) for item in enum) and json_type == "string":
+                name = self.module.constant("ENUM", f"frozenset({sorted(enum)!r})")
+            else:
+                name = self.module.constant("ENUM", repr(tuple(enum)))
+            self.emit(indent, f"if {v} not in {name}:")
+            self.error(indent + 1, path, f'f"{{{v}!r}} is not an allowed value"')
+
+        def string_checks(ind):
+            max_length = getattr(node, "max_length", None)
+            min_length = getattr(node, "min_length", None)
+            if max_length is not None:
+                self.emit(ind, f"if len({v}) > {max_length!r}:")
+                self.error(ind + 1, path, repr(f"longer than {max_length} characters"))
+            if min_length is not None:
+                self.emit(ind, f"if len({v}) < {min_length!r}:")
+                self.error(ind + 1, path, repr(f"shorter than {min_length} characters"))
+
+        def number_checks(ind):
+            minimum = getattr(node, "minimum", None)
+            maximum = getattr(node, "maximum", None)
+            multiple_of = getattr(node, "multiple_of", None)
+            if minimum is not None:
+                self.emit(ind, f"if {v} < {minimum!r}:")
+                self.error(ind + 1, path, repr(f"less than the minimum {minimum}"))
+            if maximum is not None:
+                self.emit(ind, f"if {v} > {maximum!r}:")
+                self.error(ind + 1, path, repr(f"greater than the maximum {maximum}"))
+            if multiple_of is not None:
+                self.emit(ind, f"if _not_multiple_of({v}, {multiple_of!r}):")
+                self.error(ind + 1, path, repr(f"not a multiple of {multiple_of}"))
+
+        def array_checks(ind):
+            min_items = getattr(node, "min_items", None)
+            max_items = getattr(node, "max_items", None)
+            items = getattr(node, "items", None)
+            if min_items is not None:
+                self.emit(ind, f"if len({v}) < {min_items!r}:")
+                self.error(ind + 1, path, repr(f"fewer than {min_items} items"))
+            if max_items is not None:
+                self.emit(ind, f"if len({v}) > {max_items!r}:")
+                self.error(ind + 1, path, repr(f"more than {max_items} items"))
+            if items is not None and not is_unconstrained(items):
+                index, item = self.var("i"), self.var("v")
+                self.emit(ind, f"for {index}, {item} in enumerate({v}):")
+                self.node(items, item, path.code(f"str({index})"), ind + 1)
+
+        def object_checks(ind):
+            shape = _object_shape(node)
+            if shape is not None:
+                self.object(shape, v, path, ind)
+
+        guard("string", string_checks)
+        guard("number", number_checks)
+        guard("array", array_checks)
+        guard("object", object_checks)
+
+    def object(self, shape, v, path, indent):
+        """Check required, additional and per-property constraints."""
+        for name in shape.required:
+            if name not in shape.fields:
+                self.emit(indent, f"if {name!r} not in {v}:")
+                self.error(indent + 1, path, repr(f"missing required property '{name}'"))
+
+        if shape.additional is not True:
+            known = self.module.constant("KEYS", f"frozenset({sorted(shape.fields)!r})")
+            key = self.var("k")
+            self.emit(indent, f"if not {v}.keys() <= {known}:")
+            self.emit(indent + 1, f"for {key} in {v}:")
+            self.emit(indent + 2, f"if {key} not in {known}:")
+            extra_path = path.code(f"_escape({key})")
+            if shape.additional is False:
+                self.error(indent + 3, extra_path, repr("unexpected property"))
+            else:
+                self.node(shape.additional, f"{v}[{key}]", extra_path, indent + 3)
+
+        for name, field in shape.fields.items():
+            required = name in shape.required
+            if is_unconstrained(field):
+                if required:
+                    self.emit(indent, f"if {name!r} not in {v}:")
+                    self.error(indent + 1, path, repr(f"missing required property '{name}'"))
+                continue
+            item = self.var("v")
+            self.emit(indent, f"{item} = {v}.get({name!r}, _MISSING)")
+            if required:
+                self.emit(indent, f"if {item} is _MISSING:")
+                self.error(indent + 1, path, repr(f"missing required property '{name}'"))
+                self.emit(indent, "else:")
+            else:
+                self.emit(indent, f"if {item} is not _MISSING:")
+            self.node(field, item, path.key(name), indent + 1)
+
+
+def generate_module(version: str, ir) -> str:
+    """Return the source of the validators module for one schema set."""
+    config = schema_payloads.VERSIONS[version]
+    module = ModuleBuilder()
+    validators = []  # (message name, side, function name, body)
+
+    for msg in ir.messages.values():
+        for side in ("request", "response"):
+            schema_file = getattr(msg, side)
+            if schema_file is None:
+                continue
+            integral_floats = schema_file.draft not in DRAFT4_URIS
+            emitter = Emitter(module, schema_file, integral_floats)
+            emitter.node(schema_file, "payload", Pointer(), 1)
+            func = f"validate_{msg.name}{config['suffixes'][side]}"
+            validators.append((msg.name, side, func, emitter.lines))
+
+    lines = [
+        '"""',
+        f"OCPP {version} payload validators.",
+        "",
+        "Generated by scripts/generate_validators.py from the OCA JSON schemas.",
+        "Do not edit by hand; rerun the generator instead.",
+        "",
+        "Each validate_* function returns a list of (json_pointer, message)",
+        "errors, empty if the payload is valid. `format` is not checked.",
+        '"""',
+    ]
+    lines.extend(MODULE_PRELUDE.rstrip("\n").split("\n"))
+    lines.append("")
+    lines.append("")
+    lines.extend(module.render_constants())
+    lines.extend(module.render_functions())
+
+    for msg_name, side, func, body in validators:
+        label = f"{msg_name}{config['suffixes'][side]}".replace("_", ".")
+        lines.append("")
+        lines.append("")
+        lines.append(f"def {func}(payload):")
+        lines.append(f'    """Validate a {label} payload."""')
+        lines.append("    errors = []")
+        lines.extend(body)
+        lines.append("    return errors")
+
+    for side, table in (("request", "REQUEST_VALIDATORS"), ("response", "RESPONSE_VALIDATORS")):
+        lines.append("")
+        lines.append("")
+        lines.append(f"{table} = {{")
+        for msg_name, func_side, func, _body in validators:
+            if func_side == side:
+                lines.append(f"    {msg_name!r}: {func},")
+        lines.append("}")
+
+    lines.extend([
+        "",
+        "",
+        "def validate(action, payload, response=False):",
+        '    """Validate the payload of a call (or, with response=True, of its',
+        '    result) for action. Raises KeyError for an unknown action."""',
+        "    validators = RESPONSE_VALIDATORS if response else REQUEST_VALIDATORS",
+        "    return validators[action](payload)",
+        "",
+    ])
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Conformance check
+# ---------------------------------------------------------------------------
+
+# Values of every JSON type, swapped in at each location of a payload
+WRONG_TYPE_VALUES = [None, True, 0, 1.5, "x", [], {}]
+
+def _resolve(node, schema_file):
+    while getattr(node, "ref", None) is not None:
+        node = schema_file.definitions[node.ref]
+    return node
+
+
+_REMOVE = object()
+
+
+def _replace(root, pointer_parts, value):
+    """Copy of root with the value at pointer_parts set to value (or
+    removed, for _REMOVE)."""
+    if not pointer_parts:
+        return value
+    head, rest = pointer_parts[0], pointer_parts[1:]
+    copy = list(root) if isinstance(root, list) else dict(root)
+    if rest:
+        copy[head] = _replace(root[head], rest, value)
+    elif value is _REMOVE:
+        del copy[head]
+    else:
+        copy[head] = value
+    return copy
+
+
+def mutations(node, schema_file, value, parts=()):
+    """Yield (pointer parts, replacement) edits around every location of a
+    valid value: all single-point changes the schema constrains."""
+    node = _resolve(node, schema_file)
+    for wrong in WRONG_TYPE_VALUES:
+        yield parts, wrong
+
+    enum = getattr(node, "enum", None)
+    if enum:
+        yield parts, "NotAnAllowedValue"
+        for allowed in enum:
+            yield parts, allowed
+
+    if isinstance(value, str):
+        for attr in ("max_length", "min_length"):
+            bound = getattr(node, attr, None)
+            if bound is not None:
+                for length in (bound - 1, bound, bound + 1):
+                    if length >= 0:
+                        yield parts, "é" * length
+        yield parts, ""
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        for attr in ("minimum", "maximum"):
+            bound = getattr(node, attr, None)
+            if bound is not None:
+                for delta in (-1, -0.5, 0, 0.5, 1):
+                    yield parts, bound + delta
+        yield parts, float(value)
+        yield parts, value + 0.25
+        yield parts, -1
+        yield parts, 10 ** 20
+
+    if isinstance(value, list):
+        items = getattr(node, "items", None)
+        for attr in ("min_items", "max_items"):
+            bound = getattr(node, attr, None)
+            if bound is not None and value:
+                for count in (bound - 1, bound, bound + 1):
+                    if count >= 0:
+                        yield parts, [value[0]] * count
+        yield parts, []
+        yield parts, value + [{}]
+        if value and items is not None:
+            yield from mutations(items, schema_file, value[0], parts + (0,))
+
+    if isinstance(value, dict):
+        shape = getattr(node, "shape", None)
+        fields = shape.fields if shape is not None else {}
+        for name in value:
+            yield parts + (name,), _REMOVE
+        for extra in ("extraProperty", "a/b~c"):
+            yield parts + (extra,), 1
+        for name, field in fields.items():
+            if name in value:
+                yield from mutations(field, schema_file, value[name], parts + (name,))
+
+
+def pointer(parts) -> str:
+    return "".join("/" + str(p).replace("~", "~0").replace("/", "~1") for p in parts)
+
+
+def check_version(version: str, ir, module, schema_dir: Path) -> int:
+    """Compare the generated validators with jsonschema on a mutation corpus.
+    Returns the number of disagreements."""
+    config = schema_payloads.VERSIONS[version]
+    failures = accepted = rejected = 0
+    for msg in ir.messages.values():
+        for side in ("request", "response"):
+            schema_file = getattr(msg, side)
+            if schema_file is None:
+                continue
+            with open(schema_dir / f"{schema_file.name}.json") as f:
+                schema = json.load(f)
+            reference = jsonschema.validators.validator_for(schema)(schema)
+            validate = getattr(module, f"validate_{msg.name}{config['suffixes'][side]}")
+
+            seed = schema_payloads.sample(schema_file, schema_file)
+            cases = [((), seed)]
+            for parts, replacement in mutations(schema_file, schema_file, seed):
+                cases.append((parts, _replace(seed, parts, replacement)))
+
+            for parts, instance in cases:
+                expected = reference.is_valid(instance)
+                errors = validate(instance)
+                ok = expected == (not errors)
+                if ok and errors:
+                    # An error must point at or under the mutated location
+                    # (or at its parent, for a removed property)
+                    where, parent = pointer(parts), pointer(parts[:-1])
+                    ok = any(p == parent or p == where or p.startswith(where + "/")
+                             for p, _message in errors)
+                if not ok:
+                    failures += 1
+                    if failures <= 10:
+                        print(f"  MISMATCH {schema_file.name} at '{pointer(parts)}': "
+                              f"jsonschema {'accepts' if expected else 'rejects'}, "
+                              f"generated returned {errors[:3]}", file=sys.stderr)
+                if expected:
+                    accepted += 1
+                else:
+                    rejected += 1
+    total = accepted + rejected
+    print(f"  {total} payloads ({accepted} valid, {rejected} invalid): "
+          f"{'all agree' if not failures else f'{failures} disagree'}")
+    return failures
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate compiled OCPP payload validators from the OCA JSON schemas.")
+    parser.add_argument(
+        "--version", choices=sorted(schema_payloads.VERSIONS), action="append",
+        help="generate only this OCPP version (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="compare the generated validators with jsonschema on a mutation corpus",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    versions = args.version or list(schema_payloads.VERSIONS)
+
+    if args.check and jsonschema is None:
+        print("ERROR: --check needs the jsonschema package (pip install jsonschema)", file=sys.stderr)
+        sys.exit(1)
+
+    failures = 0
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    for version in versions:
+        config = schema_payloads.VERSIONS[version]
+        schema_dir = config["schema_dir"]
+        if not schema_dir.exists():
+            print(f"ERROR: Schema directory not found: {schema_dir}", file=sys.stderr)
+            sys.exit(1)
+
+        ir = schema_ir.load(schema_dir)
+        output_path = OUTPUT_DIR / f"{config['module']}.py"
+        print(f"Generating {output_path.name} ({len(ir.files)} schemas)...")
+        source = generate_module(version, ir)
+        compile(source, str(output_path), "exec")
+        if generated_files.write_if_changed(output_path, source):
+            print(f"  Written to {output_path}")
+        else:
+            print(f"  Unchanged: {output_path}")
+
+        if args.check:
+            print(f"Checking OCPP {version} validators against jsonschema...")
+            failures += check_version(version, ir, schema_payloads.load_module(output_path), schema_dir)
+
+    if failures:
+        print(f"\nFAILED: {failures} payloads validate differently", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
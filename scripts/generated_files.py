@@ -0,0 +1,64 @@
+"""
+Rendering and writing of generated files, shared by the extractors and
+the generate_* scripts.
+
+render_all() runs an extractor's output renders, optionally across a
+process pool (--jobs in both extractors), and write_if_changed() writes
+them and every other generated file, as UTF-8, leaving unchanged files
+untouched.
+
+Usage (from another script in scripts/):
+    import generated_files
+    contents = generated_files.render_all(renders, jobs)
+    generated_files.write_if_changed(path, content)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# The renders of the pool this worker process belongs to
+_WORKER_RENDERS = ()
+
+
+def _init_worker(renders):
+    global _WORKER_RENDERS
+    _WORKER_RENDERS = renders
+
+
+def _render_in_worker(index):
+    return _WORKER_RENDERS[index]()
+
+
+def render_all(renders: list, jobs: int = 1) -> list:
+    """Call each render (a picklable zero-argument callable, e.g. a
+    functools.partial of a generator) and return the results in order.
+
+    With jobs > 1 they run in a pool of up to jobs worker processes (0 = one
+    per CPU). Each worker receives the renders, and so the registries they
+    close over, once when it starts; tasks are just indexes into them.
+    Renders are pure functions of those registries, so the results are
+    identical to the serial ones.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs < 2 or len(renders) < 2:
+        return [render() for render in renders]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(renders)), initializer=_init_worker,
+                             initargs=(renders,)) as pool:
+        return list(pool.map(_render_in_worker, range(len(renders))))
+
+
+def write_if_changed(path, content):
+    """Write content to path unless it already holds exactly that.
+
+    Returns True if the file was written. Unchanged files keep their
+    mtime, so the site build does not see them as modified.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return True
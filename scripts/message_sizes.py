@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Compute the worst-case serialized size of every OCPP message.
+
+Walks the schema IR and adds up the longest JSON text each message side
+can serialize to, for sizing receive buffers and the frame limits a CSMS
+enforces (e.g. the BytesPerMessage variables of OCPP 2.0.1):
+every optional property present, strings at maxLength, arrays at
+maxItems, enums at their longest value, through every $ref. Fields
+without such a bound -- arrays without maxItems, strings without
+maxLength -- make the message unbounded; they are listed with their
+per-item bound instead.
+
+Sizes are of compact JSON (no whitespace) in two character models:
+  - plain: free-text strings of ASCII characters needing no escape
+  - escaped: every free-text character written as an escaped surrogate
+    pair (12 bytes, the longest JSON encoding of one code point)
+Enum values and date-time strings are plain in both. Objects that allow
+additional properties (CustomDataType) count their declared properties
+only. The sizes bound compact encodings of the declared fields, not every
+valid frame: insignificant whitespace (json.dumps() with its default
+separators adds some) and vendor extensions add to them.
+
+Every size is computed twice: analytically, by summing the bounds of the
+schema tree, and by building the maximal payload, validating it with the
+compiled validators of generate_validators.py and serializing it with
+json.dumps(). The two must agree.
+
+Writes, per version, a machine-readable table and a generated page of the
+schema docs:
+  - docs/OCPP-2.0.1-Schemas/OCPP-2.0.1-Schemas-Sizes.json / .md
+  - docs/OCPP-1.6J-Schemas/OCPP-1.6J-Schemas-Sizes.json / .md
+
+Usage:
+    python scripts/message_sizes.py [--version {2.0.1,1.6J}]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import extract_schemas
+import extract_schemas_16
+import generated_files
+import schema_ir
+import schema_payloads
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Version → docs directory, page prefix and the message → docs page map
+VERSIONS = {
+    "2.0.1": {
+        "docs_dir": REPO_ROOT / "docs" / "OCPP-2.0.1-Schemas",
+        "prefix": "OCPP-2.0.1-Schemas",
+        "pages": {msg: extract_schemas.block_filename(block)
+                  for block, msgs in extract_schemas.BLOCK_MAP.items() for msg in msgs},
+    },
+    "1.6J": {
+        "docs_dir": REPO_ROOT / "docs" / "OCPP-1.6J-Schemas",
+        "prefix": "OCPP-1.6J-Schemas",
+        "pages": {msg: f"OCPP-1.6J-Schemas-{profile}.md"
+                  for profile, msgs in extract_schemas_16.PROFILE_MAP.items() for msg in msgs},
+    },
+}
+
+# Bytes per free-text character in each model
+CHAR_BYTES = {"plain": 1, "escaped": 12}
+PLAIN_CHAR = "a"
+ESCAPED_CHAR = "\U0001F600"  # json.dumps writes "😀"
+
+# The OCPP-J unique message id is at most 36 characters
+UNIQUE_ID_LENGTH = 36
+
+# Assumptions where the schema gives no bound. date-time: RFC 3339 with
+# nanoseconds and a numeric offset. integer: 32 bits, as the OCPP
+# specifications define it. number: the shortest round-trip repr of a
+# double, at most 24 characters.
+LONGEST_DATE_TIME = "2024-01-01T00:00:00.000000000+00:00"
+INT_RANGE = (-2**31, 2**31 - 1)
+LONGEST_NUMBERS = [-1.2345678901234567e-100, -1.2345678901234567e+100,
+                   1.2345678901234567e-100, 1.2345678901234567e+100]
+
+
+# ---------------------------------------------------------------------------
+# Worst case
+# ---------------------------------------------------------------------------
+
+def _not_multiple_of(value, divisor):
+    """multipleOf as the validators evaluate it (float quotient)."""
+    if isinstance(divisor, float):
+        quotient = value / divisor
+        return int(quotient) != quotient
+    return value % divisor != 0
+
+
+def longest_integer(node):
+    minimum = node.minimum if node.minimum is not None else INT_RANGE[0]
+    maximum = node.maximum if node.maximum is not None else INT_RANGE[1]
+    return max(int(-(-minimum // 1)), int(maximum // 1), key=lambda value: len(str(value)))
+
+
+def longest_number(node):
+    """The allowed number with the longest repr (a bound if none of the
+    longest doubles fits)."""
+    candidates = [value for value in LONGEST_NUMBERS
+                  if (node.minimum is None or value >= node.minimum)
+                  and (node.maximum is None or value <= node.maximum)
+                  and not (node.multiple_of and _not_multiple_of(value, node.multiple_of))]
+    candidates += [bound for bound in (node.minimum, node.maximum) if bound is not None]
+    return max(candidates or [0], key=lambda value: len(repr(value)))
+
+
+def max_bytes(node, schema_file, char_bytes: int):
+    """Analytic worst case: the most bytes node can serialize to, or None
+    if it has no bound."""
+    ref = getattr(node, "ref", None)
+    if ref is not None:
+        return max_bytes(schema_file.definitions[ref], schema_file, char_bytes)
+    if getattr(node, "enum", None):
+        return max(len(json.dumps(value)) for value in node.enum)
+    json_type = node.type[0] if isinstance(node.type, list) else node.type
+    if json_type == "string":
+        if getattr(node, "format", None) == "date-time":
+            return len(LONGEST_DATE_TIME) + 2
+        return None if node.max_length is None else node.max_length * char_bytes + 2
+    if json_type == "integer":
+        return len(str(longest_integer(node)))
+    if json_type == "number":
+        return len(repr(longest_number(node)))
+    if json_type == "boolean":
+        return len("false")
+    if json_type == "array":
+        item = max_bytes(node.items, schema_file, char_bytes)
+        if node.max_items is None or item is None:
+            return None
+        return 2 + node.max_items * item + max(node.max_items - 1, 0)
+    shape = getattr(node, "shape", None)
+    if shape is None:
+        return None
+    total = 2 + max(len(shape.fields) - 1, 0)
+    for name, field in shape.fields.items():
+        size = max_bytes(field, schema_file, char_bytes)
+        if size is None:
+            return None
+        total += len(json.dumps(name)) + 1 + size
+    return total
+
+
+class WorstCase:
+    """The maximal payload of one schema file, and where it has no bound.
+
+    maximal() returns the longest valid value of a node; arrays without
+    maxItems get one item and strings without maxLength one character,
+    and their paths are recorded in ``unbounded`` as (path, reason, bytes
+    each further item or character adds, or None). Open objects are
+    recorded in ``open``.
+    """
+
+    def __init__(self, schema_file, char: str):
+        self.schema_file = schema_file
+        self.char = char
+        self.unbounded = []
+        self.open = []
+
+    def flag(self, path, reason, item_bytes):
+        if all(path != flagged for flagged, _reason, _bytes in self.unbounded):
+            self.unbounded.append((path, reason, item_bytes))
+
+    def maximal(self, node, path=""):
+        ref = getattr(node, "ref", None)
+        if ref is not None:
+            return self.maximal(self.schema_file.definitions[ref], path)
+        if getattr(node, "enum", None):
+            return max(node.enum, key=lambda value: len(json.dumps(value)))
+        json_type = node.type[0] if isinstance(node.type, list) else node.type
+        if json_type == "string":
+            if getattr(node, "format", None) == "date-time":
+                return LONGEST_DATE_TIME
+            if node.max_length is None:
+                self.flag(path, "string without maxLength", CHAR_BYTES["plain"])
+                return self.char
+            return self.char * node.max_length
+        if json_type == "integer":
+            return longest_integer(node)
+        if json_type == "number":
+            return longest_number(node)
+        if json_type == "boolean":
+            return False
+        if json_type == "array":
+            if node.max_items is None:
+                inner = WorstCase(self.schema_file, PLAIN_CHAR)
+                item = inner.maximal(node.items, f"{path}/*")
+                item_bytes = None if inner.unbounded else len(dumps(item)) + 1  # with its comma
+                self.flag(path, "array without maxItems", item_bytes)
+                return [self.maximal(node.items, f"{path}/*")]
+            return [self.maximal(node.items, f"{path}/*") for _ in range(node.max_items)]
+        shape = getattr(node, "shape", None)
+        if shape is None:
+            # Untyped (DataTransfer data): any JSON value, so no bound
+            self.flag(path, "untyped value", None)
+            return ""
+        if shape.additional is not False and (path or "/") not in self.open:
+            self.open.append(path or "/")
+        return {name: self.maximal(field, f"{path}/{name}") for name, field in shape.fields.items()}
+
+
+def dumps(value) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def frame_overhead(action: str, side: str) -> int:
+    """Bytes a CALL / CALLRESULT frame adds around its payload."""
+    unique_id = f'"{"0" * UNIQUE_ID_LENGTH}"'
+    if side == "request":
+        return len(f'[2,{unique_id},{dumps(action)},]')
+    return len(f"[3,{unique_id},]")
+
+
+def message_sizes(version: str, ir, validators) -> dict:
+    """{message: {side: row}} with the worst case of every message side.
+    Exits if a maximal payload is invalid."""
+    rows = {}
+    for msg in ir.messages.values():
+        if msg.name not in VERSIONS[version]["pages"]:
+            continue  # not in the schema docs (e.g. 1.6J security extension)
+        for side in ("request", "response"):
+            schema_file = getattr(msg, side)
+            if schema_file is None:
+                continue
+            sizes = {}
+            for model, char in (("plain", PLAIN_CHAR), ("escaped", ESCAPED_CHAR)):
+                worst = WorstCase(schema_file, char)
+                payload = worst.maximal(schema_file)
+                errors = validators[(msg.name, side)](payload)
+                if errors:
+                    print(f"ERROR: {schema_file.name}: maximal payload is invalid: {errors[:3]}", file=sys.stderr)
+                    sys.exit(1)
+                analytic = max_bytes(schema_file, schema_file, CHAR_BYTES[model])
+                if analytic != (None if worst.unbounded else len(dumps(payload))):
+                    print(f"ERROR: {schema_file.name}: computed {analytic} bytes ({model}), "
+                          f"maximal payload is {len(dumps(payload))}", file=sys.stderr)
+                    sys.exit(1)
+                sizes[model] = analytic
+
+            overhead = frame_overhead(msg.name, side)
+            frames = {model: None if size is None else size + overhead for model, size in sizes.items()}
+            rows.setdefault(msg.name, {})[side] = {
+                "schema": schema_file.name,
+                "max_bytes": sizes["plain"],
+                "max_bytes_escaped": sizes["escaped"],
+                "max_frame_bytes": frames["plain"],
+                "max_frame_bytes_escaped": frames["escaped"],
+                "unbounded": [{"path": path, "reason": reason, "item_bytes": item_bytes}
+                              for path, reason, item_bytes in worst.unbounded],
+                "open": worst.open,
+            }
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def _bytes(value) -> str:
+    return "unbounded" if value is None else f"{value:,}"
+
+
+def render_md(version: str, rows: dict) -> str:
+    config = VERSIONS[version]
+    bounded = sum(1 for sides in rows.values() for row in sides.values() if row["max_bytes"] is not None)
+    total = sum(len(sides) for sides in rows.values())
+    lines = [
+        f"# OCPP {version} Schemas — Message Sizes",
+        "",
+        "> **Generated** by `scripts/message_sizes.py` from the OCA JSON schemas; do not edit by hand.",
+        f"> Machine-readable: `{config['prefix']}-Sizes.json` in the same directory.",
+        "",
+        "Worst-case serialized size of every message payload, as compact JSON (no whitespace):",
+        "every optional field present, strings at `maxLength`, arrays at `maxItems`, enums at their",
+        "longest value.",
+        "",
+        "- **Max payload:** free-text strings of plain ASCII characters.",
+        "- **Escaped:** every free-text character written as an escaped surrogate pair (12 bytes),",
+        "  the longest JSON encoding of a character.",
+        f"- **Max frame / Escaped frame:** the payload inside an OCPP-J frame with a "
+        f"{UNIQUE_ID_LENGTH}-character message id.",
+        f"- date-time strings are at most {len(LONGEST_DATE_TIME)} characters (RFC 3339 with nanoseconds),",
+        f"  integers without bounds 32-bit, numbers a double's shortest repr (at most "
+        f"{max(len(repr(n)) for n in LONGEST_NUMBERS)} characters).",
+        "- Objects allowing additional properties (e.g. `customData`) count their declared fields only.",
+        "",
+        "These bound compact encodings of the declared fields, not every valid frame: JSON allows",
+        "whitespace between tokens (`json.dumps` with its default separators adds a space after every",
+        "`,` and `:`), and objects allowing additional properties may carry undeclared fields. Use the",
+        "sizes to dimension buffers and frame limits, not to reject frames.",
+        "",
+        f"{bounded} of {total} message payloads are bounded. Unbounded fields (arrays without `maxItems`,",
+        "strings without `maxLength`) are listed with the most bytes each further array item adds.",
+        "",
+        "| Message | Payload | Max payload (B) | Escaped (B) | Max frame (B) | Escaped frame (B) | Unbounded fields |",
+        "|---------|---------|-----------------|-------------|---------------|-------------------|------------------|",
+    ]
+    for name in sorted(rows):
+        page = config["pages"].get(name)
+        link = f"[{name}]({page}#{name.lower()})" if page else name
+        for side, row in rows[name].items():
+            unbounded = "; ".join(
+                f"`{item['path']}` ({item['reason']})" if item["item_bytes"] is None
+                or not item["reason"].startswith("array")
+                else f"`{item['path']}` (+{item['item_bytes']:,} B/item)"
+                for item in row["unbounded"])
+            lines.append(f"| {link} | {row['schema']} | {_bytes(row['max_bytes'])} | "
+                         f"{_bytes(row['max_bytes_escaped'])} | {_bytes(row['max_frame_bytes'])} | "
+                         f"{_bytes(row['max_frame_bytes_escaped'])} | {unbounded} |")
+    return "\n".join(lines) + "\n"
+
+
+def render_json(version: str, rows: dict) -> str:
+    report = {
+        "version": version,
+        "encoding": "compact JSON (no whitespace), declared fields only",
+        "assumptions": {
+            "unique_id_length": UNIQUE_ID_LENGTH,
+            "date_time_length": len(LONGEST_DATE_TIME),
+            "integer_range": list(INT_RANGE),
+            "number_length": max(len(repr(n)) for n in LONGEST_NUMBERS),
+            "escaped_char_bytes": CHAR_BYTES["escaped"],
+        },
+        "messages": rows,
+    }
+    return json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compute the worst-case serialized size of every OCPP message.")
+    parser.add_argument(
+        "--version", choices=sorted(VERSIONS), action="append",
+        help="compute only this OCPP version (repeatable; default: all)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    for version in args.version or list(VERSIONS):
+        config = VERSIONS[version]
+        schema_dir = schema_payloads.VERSIONS[version]["schema_dir"]
+        if not schema_dir.exists():
+            print(f"ERROR: Schema directory not found: {schema_dir}", file=sys.stderr)
+            sys.exit(1)
+
+        ir = schema_ir.load(schema_dir)
+        print(f"Computing OCPP {version} message sizes ({len(ir.files)} schemas)...")
+        rows = message_sizes(version, ir, schema_payloads.compiled_validators(version, ir))
+        bounded = [row for sides in rows.values() for row in sides.values() if row["max_bytes"] is not None]
+        largest = max(bounded, key=lambda row: row["max_bytes"], default=None)
+        print(f"  {len(bounded)} bounded payloads, each matching a valid maximal payload"
+              + (f"; largest {largest['schema']} ({largest['max_bytes']:,} B)" if largest else ""))
+
+        config["docs_dir"].mkdir(parents=True, exist_ok=True)
+        for suffix, content in ((".md", render_md(version, rows)), (".json", render_json(version, rows))):
+            path = config["docs_dir"] / f"{config['prefix']}-Sizes{suffix}"
+            if generated_files.write_if_changed(path, content):
+                print(f"  Written to {path}")
+            else:
+                print(f"  Unchanged: {path}")
+
+
+if __name__ == "__main__":
+    main()
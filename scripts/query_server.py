@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Local query server over the schema registries, speaking JSON over stdio.
+
+Loads the schema indexes written by the extractors (the committed
+*-Schemas-Index.json files, see schema_index.py) once, builds in-memory
+lookup tables, then answers one request per line on stdin with one
+response per line on stdout:
+
+    {"id": 1, "method": "schema", "params": {"name": "TransactionEvent"}}
+    {"id": 1, "result": {"request": {"name": "TransactionEventRequest", "fields": [...]}, ...}}
+
+Errors are {"id": ..., "error": {"message": ...}}, with close matches of
+an unknown name; a request that fails in any other way is answered with
+an error too, and the server keeps running. Every method takes an optional "version" parameter
+("2.0.1", the default, or "1.6J"):
+
+  versions                      loaded versions
+  messages  [block]             message names, optionally of one block/profile
+  message   name                block, direction, payload names and doc chunk
+  direction name                direction of a message
+  schema    name [side] [expand]
+                                fields of a message (both sides, or side
+                                "request"/"response"), a payload or a type;
+                                expand inlines referenced types
+  type      name                kind, description, fields or enum values
+  usages    name                messages and payloads that use a type
+  enum      name [field]        values of an enum type, or of a field's
+                                inline enum ("<owner>.<field>" also works)
+  field     name                payloads and types with a field of that name
+
+The indexes are never re-read: restart the server after regenerating
+them. For a single query, pipe one line in:
+
+    echo '{"method": "enum", "params": {"name": "ChargingStateEnumType"}}' \\
+        | python scripts/query_server.py
+
+Usage:
+    python scripts/query_server.py [INDEX.json ...]
+"""
+
+import argparse
+import difflib
+import json
+import os
+import posixpath
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+INDEX_PATHS = [
+    REPO_ROOT / "docs" / "OCPP-2.0.1-Schemas" / "OCPP-2.0.1-Schemas-Index.json",
+    REPO_ROOT / "docs" / "OCPP-1.6J-Schemas" / "OCPP-1.6J-Schemas-Index.json",
+]
+DEFAULT_VERSION = "2.0.1"
+
+VERSION_ALIASES = {"2.0.1": "2.0.1", "201": "2.0.1", "2": "2.0.1",
+                   "1.6j": "1.6J", "1.6": "1.6J", "16": "1.6J"}
+
+# Index field columns left out of schema responses (implied by the query)
+HIDDEN_COLUMNS = ("owner", "position")
+
+
+class QueryError(Exception):
+    """A request that cannot be answered; its message is sent back."""
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+class Registry:
+    """Lookup tables of one version's schema index."""
+
+    def __init__(self, index: dict, chunks: dict = None, chunks_dir: str = ""):
+        self.version = next(row["value"] for row in index["meta"] if row["key"] == "version")
+        self.messages = {row["name"]: row for row in index["messages"]}
+        self.types = {row["name"]: row for row in index["types"]}
+        self.blocks = defaultdict(list)
+        self.payloads = {}
+        for row in index["messages"]:
+            self.blocks[row["block"]].append(row["name"])
+            for side in ("request", "response"):
+                if row[side] is not None:
+                    self.payloads[row[side]] = (row["name"], side)
+
+        self.enums = defaultdict(list)
+        for row in index["enum_values"]:
+            self.enums[(row["owner"], row["field"])].append(row["value"])
+
+        self.fields = defaultdict(list)
+        self.field_owners = defaultdict(list)
+        for row in index["fields"]:
+            field = {key: value for key, value in row.items()
+                     if value is not None and key not in HIDDEN_COLUMNS}
+            field["required"] = bool(row["required"])
+            if "default_value" in field:
+                field["default"] = json.loads(field.pop("default_value"))
+            values = self.enums.get((row["owner"], row["name"]))
+            if values is not None:
+                field["enum"] = values
+            self.fields[row["owner"]].append(field)
+            self.field_owners[row["name"]].append(row["owner"])
+
+        # 2.0.1 lists the payloads defining each type; a 1.6J inline
+        # object belongs to the payload its name starts with
+        self.usages = defaultdict(list)
+        for row in index["type_usage"]:
+            self.usages[row["type"]].append(row["payload"])
+        for name, row in self.types.items():
+            if row["inline"]:
+                self.usages[name].append(name.split(".", 1)[0])
+
+        # Doc chunks (see doc_chunks.py), with paths relative to chunks_dir
+        self.chunks = {}
+        for kind in ("messages", "types"):
+            for name, entry in (chunks or {}).get(kind, {}).items():
+                self.chunks[name] = {"chunk": posixpath.join(chunks_dir, entry["chunk"]),
+                                     "source": posixpath.normpath(posixpath.join(chunks_dir, entry["source"])),
+                                     "lines": entry["lines"]}
+
+    # -- name resolution ----------------------------------------------------
+
+    def _unknown(self, what: str, name: str, names) -> QueryError:
+        close = difflib.get_close_matches(name, list(names), n=3, cutoff=0.6)
+        hint = f" (did you mean {', '.join(close)}?)" if close else ""
+        return QueryError(f"unknown {what} {name!r} in {self.version}{hint}")
+
+    def message(self, name) -> dict:
+        row = self.messages.get(name)
+        if row is None:
+            raise self._unknown("message", name, self.messages)
+        return row
+
+    def type(self, name) -> dict:
+        row = self.types.get(name)
+        if row is None:
+            raise self._unknown("type", name, self.types)
+        return row
+
+    # -- queries ------------------------------------------------------------
+
+    def payload_schema(self, name: str, expand: bool) -> dict:
+        message, side = self.payloads[name]
+        return {"name": name, "message": message, "side": side, "fields": self.owner_fields(name, expand)}
+
+    def owner_fields(self, owner: str, expand: bool, seen: tuple = ()) -> list:
+        fields = self.fields.get(owner, [])
+        if not expand:
+            return fields
+        result = []
+        for field in fields:
+            ref = field.get("ref")
+            if ref is not None and ref in self.types and ref not in seen:
+                field = dict(field)
+                if self.types[ref]["kind"] == "enum":
+                    field["enum"] = self.enums[(ref, "")]
+                else:
+                    field["fields"] = self.owner_fields(ref, expand, seen + (ref,))
+            result.append(field)
+        return result
+
+    def type_info(self, name: str, expand: bool = False) -> dict:
+        row = self.type(name)
+        info = {"name": name, "kind": row["kind"], "description": row["description"]}
+        if row["kind"] == "enum":
+            info["values"] = self.enums[(name, "")]
+        else:
+            info["fields"] = self.owner_fields(name, expand, (name,))
+        if name in self.chunks:
+            info["doc"] = self.chunks[name]
+        return info
+
+
+# ---------------------------------------------------------------------------
+# Methods
+# ---------------------------------------------------------------------------
+
+def _name(params) -> str:
+    name = params.get("name")
+    if not isinstance(name, str):
+        raise QueryError("missing or invalid 'name' parameter")
+    return name
+
+
+def _optional(params, key: str):
+    """A string parameter, or None if absent."""
+    value = params.get(key)
+    if value is not None and not isinstance(value, str):
+        raise QueryError(f"parameter {key!r} must be a string")
+    return value
+
+
+def _versions(server, registry, params):
+    return sorted(server.registries)
+
+
+def _messages(server, registry, params):
+    block = _optional(params, "block")
+    if block is None:
+        return list(registry.messages)
+    if block not in registry.blocks:
+        raise registry._unknown("block", block, registry.blocks)
+    return registry.blocks[block]
+
+
+def _message(server, registry, params):
+    row = registry.message(_name(params))
+    result = {key: value for key, value in row.items() if value is not None}
+    if row["name"] in registry.chunks:
+        result["doc"] = registry.chunks[row["name"]]
+    return result
+
+
+def _direction(server, registry, params):
+    row = registry.message(_name(params))
+    return {"name": row["name"], "direction": row["direction"]}
+
+
+def _schema(server, registry, params):
+    name = _name(params)
+    expand = bool(params.get("expand"))
+    if name in registry.payloads:
+        return registry.payload_schema(name, expand)
+    if name in registry.types:
+        return registry.type_info(name, expand)
+    row = registry.message(name)
+    side = _optional(params, "side")
+    sides = [side] if side is not None else ["request", "response"]
+    result = {}
+    for side in sides:
+        if side not in ("request", "response"):
+            raise QueryError(f"side must be 'request' or 'response', not {side!r}")
+        if row[side] is not None:
+            result[side] = registry.payload_schema(row[side], expand)
+    return result
+
+
+def _type(server, registry, params):
+    return registry.type_info(_name(params))
+
+
+def _usages(server, registry, params):
+    name = _name(params)
+    registry.type(name)
+    payloads = registry.usages.get(name, [])
+    messages = dict.fromkeys(registry.payloads[payload][0] for payload in payloads)
+    return {"name": name, "messages": list(messages), "payloads": payloads}
+
+
+def _enum(server, registry, params):
+    name = _name(params)
+    field = _optional(params, "field")
+    if field is None and name not in registry.types and "." in name:
+        name, field = name.rsplit(".", 1)
+    if field is None:
+        if registry.type(name)["kind"] != "enum":
+            raise QueryError(f"{name} is not an enum type; pass the field with an inline enum")
+        return registry.enums[(name, "")]
+    values = registry.enums.get((name, field))
+    if values is None:
+        raise registry._unknown("enum field", f"{name}.{field}",
+                                [f"{owner}.{f}" for owner, f in registry.enums if f])
+    return values
+
+
+def _field(server, registry, params):
+    name = _name(params)
+    owners = registry.field_owners.get(name)
+    if owners is None:
+        raise registry._unknown("field", name, registry.field_owners)
+    return owners
+
+
+METHODS = {
+    "versions": _versions,
+    "messages": _messages,
+    "message": _message,
+    "direction": _direction,
+    "schema": _schema,
+    "type": _type,
+    "usages": _usages,
+    "enum": _enum,
+    "field": _field,
+}
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+class Server:
+    """Registries of every loaded version, answering request objects."""
+
+    def __init__(self, index_paths: list):
+        self.registries = {}
+        for index_path in index_paths:
+            with open(index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            chunks_path = index_path.with_name(index_path.name.replace("-Index.json", "-Chunks.json"))
+            chunks = None
+            if chunks_path.exists():
+                with open(chunks_path, encoding="utf-8") as f:
+                    chunks = json.load(f)
+            chunks_dir = Path(os.path.relpath(chunks_path.parent, REPO_ROOT)).as_posix()
+            registry = Registry(index, chunks, chunks_dir)
+            self.registries[registry.version] = registry
+
+    def handle(self, request) -> dict:
+        """The response object to a request object."""
+        if not isinstance(request, dict):
+            return {"id": None, "error": {"message": "request must be a JSON object"}}
+        response = {"id": request.get("id")}
+        try:
+            method = METHODS.get(request.get("method"))
+            if method is None:
+                raise QueryError(f"unknown method {request.get('method')!r}; methods: {', '.join(METHODS)}")
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise QueryError("params must be a JSON object")
+            version = _optional(params, "version") or DEFAULT_VERSION
+            registry = self.registries.get(VERSION_ALIASES.get(version.lower(), version))
+            if registry is None:
+                raise QueryError(f"version {version!r} not loaded; versions: {', '.join(self.registries)}")
+            response["result"] = method(self, registry, params)
+        except QueryError as e:
+            response["error"] = {"message": str(e)}
+        except Exception as e:
+            # A bug must not end the session: report it as this request's error
+            response["error"] = {"message": f"internal error: {type(e).__name__}: {e}"}
+        return response
+
+    def handle_line(self, line: str) -> str:
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {"id": None, "error": {"message": f"invalid JSON: {e}"}}
+        else:
+            response = self.handle(request)
+        return json.dumps(response, ensure_ascii=False, separators=(",", ":"))
+
+    def serve(self, stdin, stdout):
+        for line in stdin:
+            if line.strip():
+                stdout.write(self.handle_line(line) + "\n")
+                stdout.flush()
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer schema registry queries, one JSON line per request.")
+    parser.add_argument("index", type=Path, nargs="*", default=INDEX_PATHS,
+                        help="*-Index.json files to load (default: both versions)")
+    args = parser.parse_args()
+
+    for index_path in args.index:
+        if not index_path.exists():
+            print(f"ERROR: Index not found: {index_path}", file=sys.stderr)
+            sys.exit(1)
+    server = Server(args.index)
+    try:
+        server.serve(sys.stdin, sys.stdout)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+
+
+if __name__ == "__main__":
+    main()
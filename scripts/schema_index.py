@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Machine-readable index of one OCPP schema set, as JSON and SQLite.
+
+The extractors write this next to their markdown, so tools can look up
+"the required fields of TransactionEventRequest" without scanning a
+block file. The index is normalized into tables, the same in both forms:
+
+  meta         key, value (version, hash of the schema files)
+  messages     name, block (2.0.1 functional block / 1.6J profile),
+               direction, request, response (payload names)
+  types        name, kind (enum / object), description, shared,
+               inline (1 for 1.6J inline objects, named
+               "<payload>.<field>[.<field>...]"), files
+  type_usage   type, payload -- every payload schema that defines a type
+  fields       owner (payload or type), position, name, required,
+               type and item_type (JSON types, NULL for a $ref), ref
+               (named or inline type, also of array items), description,
+               every constraint keyword and default_value (as JSON)
+  enum_values  owner, field ("" for a named enum type), position, value
+
+The JSON holds each table as a list of row objects; the SQLite database
+has the same tables with indexes on every lookup key:
+
+    SELECT name FROM fields WHERE owner = 'TransactionEventRequest' AND required
+
+The SQLite file is derived data: the extractors rebuild it whenever the
+JSON changes, and this script rebuilds it from a JSON index alone (the
+OCA schemas are not needed):
+
+Usage:
+    python scripts/schema_index.py docs/OCPP-2.0.1-Schemas/OCPP-2.0.1-Schemas-Index.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import generated_files
+
+# ---------------------------------------------------------------------------
+# Tables
+# ---------------------------------------------------------------------------
+
+# Table → [(column, SQLite type)], in row order
+TABLES = {
+    "meta": [("key", "TEXT PRIMARY KEY"), ("value", "TEXT")],
+    "messages": [
+        ("name", "TEXT PRIMARY KEY"), ("block", "TEXT"), ("direction", "TEXT"),
+        ("request", "TEXT"), ("response", "TEXT"),
+    ],
+    "types": [
+        ("name", "TEXT PRIMARY KEY"), ("kind", "TEXT"), ("description", "TEXT"),
+        ("shared", "INTEGER"), ("inline", "INTEGER"), ("files", "INTEGER"),
+    ],
+    "type_usage": [("type", "TEXT"), ("payload", "TEXT")],
+    "fields": [
+        ("owner", "TEXT"), ("position", "INTEGER"), ("name", "TEXT"), ("required", "INTEGER"),
+        ("type", "TEXT"), ("item_type", "TEXT"), ("ref", "TEXT"), ("description", "TEXT"),
+        ("format", "TEXT"), ("max_length", "INTEGER"), ("min_length", "INTEGER"),
+        ("minimum", "REAL"), ("maximum", "REAL"), ("multiple_of", "REAL"),
+        ("min_items", "INTEGER"), ("max_items", "INTEGER"), ("default_value", "TEXT"),
+    ],
+    "enum_values": [("owner", "TEXT"), ("field", "TEXT"), ("position", "INTEGER"), ("value", "TEXT")],
+}
+
+# Index name → (table, columns)
+INDEXES = {
+    "messages_request": ("messages", "request"),
+    "messages_response": ("messages", "response"),
+    "type_usage_type": ("type_usage", "type"),
+    "type_usage_payload": ("type_usage", "payload"),
+    "fields_owner": ("fields", "owner, position"),
+    "fields_name": ("fields", "name"),
+    "fields_ref": ("fields", "ref"),
+    "enum_values_owner": ("enum_values", "owner, field, position"),
+    "enum_values_value": ("enum_values", "value"),
+}
+
+CONSTRAINTS = ("format", "max_length", "min_length", "minimum", "maximum",
+               "multiple_of", "min_items", "max_items")
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def _json_type(node):
+    json_type = None if node is None else node.type
+    return "|".join(json_type) if isinstance(json_type, list) else json_type
+
+
+class IndexBuilder:
+    """Rows of every table for one schema set."""
+
+    def __init__(self, clean):
+        self.clean = clean
+        self.rows = {table: [] for table in TABLES}
+
+    def add(self, table: str, **row):
+        self.rows[table].append(row)
+
+    def enum(self, owner: str, field: str, values: list):
+        for position, value in enumerate(values):
+            self.add("enum_values", owner=owner, field=field, position=position, value=value)
+
+    def inline_object(self, name: str, node):
+        self.add("types", name=name, kind="object", description=self.clean(node.description or ""),
+                 shared=None, inline=1, files=1)
+        self.fields(name, node.shape)
+
+    def fields(self, owner: str, shape):
+        for position, (name, field) in enumerate(shape.fields.items()):
+            items = field.items
+            nodes = [node for node in (field, items) if node is not None]
+            inline = next((node for node in nodes if node.ref is None and node.shape is not None), None)
+            ref = f"{owner}.{name}" if inline is not None else field.ref or (items.ref if items is not None else None)
+            row = {
+                "owner": owner, "position": position, "name": name,
+                "required": int(name in shape.required),
+                "type": _json_type(field),
+                "item_type": _json_type(items),
+                "ref": ref,
+                "description": self.clean(field.description or ""),
+            }
+            for keyword in CONSTRAINTS:
+                row[keyword] = getattr(field, keyword)
+            row["default_value"] = None if field.default is None else json.dumps(field.default)
+            self.add("fields", **row)
+            for node in nodes:
+                if node.enum is not None:
+                    self.enum(owner, name, node.enum)
+            if inline is not None:
+                self.inline_object(ref, inline)
+
+
+def build(version: str, ir, blocks: dict, directions: dict, clean=lambda text: text,
+          shared: set = None) -> dict:
+    """The index tables of a loaded schema IR.
+
+    blocks maps a block/profile name to its messages (BLOCK_MAP,
+    PROFILE_MAP), directions a message to its direction (DIRECTION_MAP),
+    clean cleans a description and shared (2.0.1) names the shared types.
+    """
+    builder = IndexBuilder(clean)
+    builder.add("meta", key="version", value=version)
+    digest = hashlib.sha256()
+    for stem, file_hash in ir.hashes.items():
+        digest.update(f"{stem}\0{file_hash}\n".encode())
+    builder.add("meta", key="schemas_sha256", value=digest.hexdigest())
+
+    block_of = {msg: block for block, msgs in blocks.items() for msg in msgs}
+    for msg in ir.messages.values():
+        builder.add("messages", name=msg.name, block=block_of.get(msg.name),
+                    direction=directions.get(msg.name),
+                    request=msg.request.name if msg.request is not None else None,
+                    response=msg.response.name if msg.response is not None else None)
+
+    for type_name, info in ir.types.items():
+        definition = info.definition
+        builder.add("types", name=type_name, kind="enum" if info.is_enum else "object",
+                    description=clean(definition.description or ""),
+                    shared=None if shared is None else int(type_name in shared),
+                    inline=0, files=len(info.files))
+        for payload in info.files:
+            builder.add("type_usage", type=type_name, payload=payload)
+        if info.is_enum:
+            builder.enum(type_name, "", definition.enum)
+        else:
+            builder.fields(type_name, definition.shape)
+
+    for schema_file in ir.files.values():
+        builder.fields(schema_file.name, schema_file.shape)
+    return builder.rows
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def render_json(index: dict) -> str:
+    return json.dumps(index, indent=1, ensure_ascii=False) + "\n"
+
+
+def write_sqlite(path: Path, index: dict):
+    """(Re)create the SQLite database at path from the index tables."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    db = sqlite3.connect(tmp_path)
+    try:
+        for table, columns in TABLES.items():
+            names = [name for name, _type in columns]
+            db.execute(f"CREATE TABLE {table} ("
+                       + ", ".join(f"{name} {sql_type}" for name, sql_type in columns) + ")")
+            db.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * len(names))})",
+                           [[row.get(name) for name in names] for row in index[table]])
+        for index_name, (table, columns) in INDEXES.items():
+            db.execute(f"CREATE INDEX {index_name} ON {table} ({columns})")
+        db.commit()
+    finally:
+        db.close()
+    os.replace(tmp_path, path)
+
+
+def write(base_path: Path, index: dict) -> list:
+    """Write <base_path>.json (if changed) and <base_path>.sqlite (if the
+    JSON changed or the database is missing). Returns the written paths."""
+    json_path = base_path.with_name(base_path.name + ".json")
+    sqlite_path = base_path.with_name(base_path.name + ".sqlite")
+    written = []
+    if generated_files.write_if_changed(json_path, render_json(index)):
+        written.append(json_path)
+    if written or not sqlite_path.exists():
+        write_sqlite(sqlite_path, index)
+        written.append(sqlite_path)
+    return written
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the SQLite schema index from its JSON form.")
+    parser.add_argument("index", type=Path, nargs="+", help="*-Index.json file written by an extractor")
+    args = parser.parse_args()
+
+    for json_path in args.index:
+        if not json_path.exists():
+            print(f"ERROR: Index not found: {json_path}", file=sys.stderr)
+            sys.exit(1)
+        with open(json_path, encoding="utf-8") as f:
+            index = json.load(f)
+        sqlite_path = json_path.with_suffix(".sqlite")
+        write_sqlite(sqlite_path, index)
+        counts = ", ".join(f"{len(index[table])} {table}" for table in ("messages", "types", "fields"))
+        print(f"Written {sqlite_path} ({counts})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Compact intermediate representation (IR) of the OCA JSON schemas.
+
+Both extractors (extract_schemas.py for 2.0.1, extract_schemas_16.py for
+1.6J) work from the same typed objects instead of re-walking the raw
+JSON: schema files, messages, fields, types and their constraints, built
+from __slots__ classes. The IR is built once per schema directory and
+pickled under .schema-cache/, keyed by a hash of every schema file (and
+of this module), so later runs and other tools load it in milliseconds.
+
+Usage (from another script in scripts/):
+    import schema_ir
+    ir = schema_ir.load(SCHEMA_DIR)
+
+    python scripts/schema_ir.py SCHEMA_DIR...   # build/refresh the cache
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = REPO_ROOT / ".schema-cache"
+
+# Hash of this module as loaded: a change to the IR classes or to how they
+# are built invalidates every cached IR
+MODULE_HASH = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# IR classes
+# ---------------------------------------------------------------------------
+
+class Field:
+    """One property of an object, or the items of an array.
+
+    Keywords absent from the schema are None; ``type`` is the raw JSON
+    Schema type. ``ref`` is the referenced type name for a $ref. ``items``
+    is set for every array (an empty Field if the schema omits it) and
+    ``shape`` for inline objects that declare properties.
+    """
+
+    __slots__ = (
+        "name", "type", "ref", "items", "shape", "description", "enum",
+        "format", "default", "max_length", "min_length", "minimum",
+        "maximum", "multiple_of", "min_items", "max_items",
+    )
+
+    def __init__(self, name: str, prop: dict):
+        self.name = name
+        self.type = prop.get("type")
+        ref = prop.get("$ref")
+        self.ref = None if ref is None else ref.split("/")[-1]
+        self.items = Field("", prop.get("items", {})) if self.type == "array" else None
+        self.shape = Shape(prop) if "properties" in prop else None
+        self.description = prop.get("description", "")
+        self.enum = prop.get("enum")
+        self.format = prop.get("format")
+        self.default = prop.get("default")
+        self.max_length = prop.get("maxLength")
+        self.min_length = prop.get("minLength")
+        self.minimum = prop.get("minimum")
+        self.maximum = prop.get("maximum")
+        self.multiple_of = prop.get("multipleOf")
+        self.min_items = prop.get("minItems")
+        self.max_items = prop.get("maxItems")
+
+
+class Shape:
+    """The properties of an object: {name: Field} in schema order, plus the
+    names of the required ones. ``additional`` is the additionalProperties
+    keyword: True (the default), False, or a Field for a schema."""
+
+    __slots__ = ("fields", "required", "additional")
+
+    def __init__(self, obj: dict):
+        self.fields = {name: Field(name, prop) for name, prop in obj.get("properties", {}).items()}
+        self.required = list(obj.get("required", []))
+        additional = obj.get("additionalProperties", True)
+        self.additional = Field("", additional) if isinstance(additional, dict) else additional
+
+
+class TypeDef:
+    """A named entry of a schema file's "definitions": an enum or an object."""
+
+    __slots__ = ("name", "type", "description", "enum", "default", "shape")
+
+    def __init__(self, name: str, type_def: dict):
+        self.name = name
+        self.type = type_def.get("type")
+        self.description = type_def.get("description", "")
+        self.enum = type_def.get("enum")
+        self.default = type_def.get("default")
+        self.shape = Shape(type_def)
+
+    @property
+    def is_enum(self) -> bool:
+        return self.enum is not None
+
+
+class SchemaFile:
+    """One *.json schema: its top-level payload and its definitions.
+    ``draft`` is the $schema URI ("" if absent)."""
+
+    __slots__ = ("name", "draft", "type", "shape", "definitions")
+
+    def __init__(self, name: str, schema: dict):
+        self.name = name
+        self.draft = schema.get("$schema", "")
+        self.type = schema.get("type")
+        self.shape = Shape(schema)
+        self.definitions = {n: TypeDef(n, d) for n, d in schema.get("definitions", {}).items()}
+
+
+class Message:
+    """A request/response pair of schema files (either may be None)."""
+
+    __slots__ = ("name", "request", "response")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.request = None
+        self.response = None
+
+
+class TypeInfo:
+    """A type across all schema files: the definition with the longest
+    description, and every file that defines it."""
+
+    __slots__ = ("definition", "files")
+
+    def __init__(self, definition: TypeDef):
+        self.definition = definition
+        self.files = []
+
+    @property
+    def is_enum(self) -> bool:
+        return self.definition.is_enum
+
+
+class SchemaIR:
+    """Everything the extractors need from one schema directory.
+
+    ``files`` maps filename stem to SchemaFile, ``messages`` message name to
+    Message and ``types`` definition name to TypeInfo, all in filename
+    order. ``hashes`` maps filename stem to the SHA-256 of the file.
+    ``cached`` tells whether this run loaded it from the cache.
+    """
+
+    __slots__ = ("key", "hashes", "files", "messages", "types", "cached")
+
+    def __init__(self, key: str, hashes: dict, schemas: dict):
+        self.key = key
+        self.hashes = hashes
+        self.cached = False
+        self.files = {name: SchemaFile(name, schema) for name, schema in schemas.items()}
+        self.messages = build_messages(self.files)
+        self.types = build_types(self.files)
+
+
+def message_name(filename: str) -> tuple:
+    """Split a schema filename stem into (message name, side).
+
+    2.0.1 names both sides (FooRequest / FooResponse); 1.6J names only the
+    response (Foo / FooResponse).
+    """
+    if filename.endswith("Response"):
+        return filename[:-len("Response")], "response"
+    if filename.endswith("Request"):
+        return filename[:-len("Request")], "request"
+    return filename, "request"
+
+
+def build_messages(files: dict) -> dict:
+    messages = {}
+    for filename, schema_file in files.items():
+        name, side = message_name(filename)
+        if name not in messages:
+            messages[name] = Message(name)
+        setattr(messages[name], side, schema_file)
+    return messages
+
+
+def build_types(files: dict) -> dict:
+    types = {}
+    for filename, schema_file in files.items():
+        for type_name, type_def in schema_file.definitions.items():
+            if type_name not in types:
+                types[type_name] = TypeInfo(type_def)
+            elif len(type_def.description) > len(types[type_name].definition.description):
+                # Pick the definition with the longest description (most informative)
+                types[type_name].definition = type_def
+            types[type_name].files.append(filename)
+    return types
+
+
+# ---------------------------------------------------------------------------
+# Build and cache
+# ---------------------------------------------------------------------------
+
+def schema_files(schema_dir: Path) -> list:
+    return sorted(schema_dir.glob("*.json"))
+
+
+def file_hashes(schema_dir: Path) -> dict:
+    """SHA-256 of every schema file, by filename stem."""
+    return {f.stem: hashlib.sha256(f.read_bytes()).hexdigest() for f in schema_files(schema_dir)}
+
+
+def schema_dir_hash(schema_dir: Path, hashes: dict = None) -> str:
+    """Hash the name and contents of every schema file, and this module."""
+    hashes = file_hashes(schema_dir) if hashes is None else hashes
+    digest = hashlib.sha256(MODULE_HASH.encode())
+    for stem, file_hash in hashes.items():
+        digest.update(f"{stem}\0{file_hash}\n".encode())
+    return digest.hexdigest()
+
+
+def cache_path(schema_dir: Path, key: str) -> Path:
+    return CACHE_DIR / f"{schema_dir.name}-{key[:16]}.pickle"
+
+
+def build(schema_dir: Path, hashes: dict = None) -> SchemaIR:
+    """Parse every schema file in schema_dir into a SchemaIR."""
+    hashes = file_hashes(schema_dir) if hashes is None else hashes
+    schemas = {}
+    for f in schema_files(schema_dir):
+        with open(f) as fh:
+            schemas[f.stem] = json.load(fh)
+    return SchemaIR(schema_dir_hash(schema_dir, hashes), hashes, schemas)
+
+
+def save(ir: SchemaIR, path: Path):
+    """Pickle ir to path atomically and drop cached IRs of older versions
+    of the same schema directory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as fh:
+        pickle.dump(ir, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    prefix = path.name.rsplit("-", 1)[0]
+    for old in path.parent.glob(f"{prefix}-*.pickle"):
+        if old != path and re.fullmatch(rf"{re.escape(prefix)}-[0-9a-f]{{16}}\.pickle", old.name):
+            old.unlink()
+
+
+def load(schema_dir: Path) -> SchemaIR:
+    """Return the IR of schema_dir, from the cache when it is current."""
+    hashes = file_hashes(schema_dir)
+    key = schema_dir_hash(schema_dir, hashes)
+    path = cache_path(schema_dir, key)
+    try:
+        with open(path, "rb") as fh:
+            ir = pickle.load(fh)
+        if ir.key == key:
+            ir.cached = True
+            return ir
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError):
+        pass  # missing, corrupt or from an older IR: rebuild
+
+    ir = build(schema_dir, hashes)
+    save(ir, path)
+    return ir
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main():
+    if len(sys.argv) < 2:
+        print(f"usage: {sys.argv[0]} SCHEMA_DIR...", file=sys.stderr)
+        sys.exit(2)
+
+    for arg in sys.argv[1:]:
+        schema_dir = Path(arg)
+        if not schema_dir.is_dir():
+            print(f"ERROR: Schema directory not found: {schema_dir}", file=sys.stderr)
+            sys.exit(1)
+        start = time.perf_counter()
+        ir = load(schema_dir)
+        elapsed = (time.perf_counter() - start) * 1000
+        source = "cache" if ir.cached else "schemas"
+        print(f"{schema_dir}: {len(ir.files)} files, {len(ir.messages)} messages, "
+              f"{len(ir.types)} types ({source}, {elapsed:.1f} ms)")
+        print(f"  {cache_path(schema_dir, ir.key)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Helpers shared by the code generators (generate_validators.py,
+generate_models.py, generate_encoders.py, generate_payloads.py),
+message_sizes.py and the benchmarks:
+
+  VERSIONS              schema directory, generated module name and
+                        validator name suffixes of each OCPP version
+  sample()              a valid payload with every optional property
+  example_payload()     the extractor's docs example, without its depth cap
+  fill_arrays()         a payload with its arrays repeated to ARRAY_ITEMS
+  compiled_validators() the validators of generate_validators.py, built
+                        in memory
+  load_module()         a generated module, imported from its path
+"""
+
+import importlib.util
+import json
+import types
+from pathlib import Path
+
+import extract_schemas
+import extract_schemas_16
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Version → schema directory, output module and validator name suffixes
+VERSIONS = {
+    "2.0.1": {
+        "schema_dir": extract_schemas.SCHEMA_DIR,
+        "module": "ocpp201",
+        "suffixes": {"request": "Request", "response": "Response"},
+    },
+    "1.6J": {
+        "schema_dir": extract_schemas_16.SCHEMA_DIR,
+        "module": "ocpp16",
+        "suffixes": {"request": "_req", "response": "_conf"},
+    },
+}
+
+# Items per array in a corpus payload (capped by maxItems)
+ARRAY_ITEMS = 3
+
+# Depth passed to the example generators: far enough below 0 that their
+# depth cap (meant to keep docs examples short) is never reached
+UNCAPPED_DEPTH = -100
+
+
+# ---------------------------------------------------------------------------
+# Payloads
+# ---------------------------------------------------------------------------
+
+def sample(node, schema_file):
+    """A valid value for node with every optional property present."""
+    ref = getattr(node, "ref", None)
+    if ref is not None:
+        return sample(schema_file.definitions[ref], schema_file)
+    enum = getattr(node, "enum", None)
+    if enum:
+        return enum[0]
+    json_type = node.type[0] if isinstance(node.type, list) else node.type
+    if json_type == "string":
+        return "a" * max(1, getattr(node, "min_length", None) or 0)
+    if json_type in ("integer", "number"):
+        minimum = getattr(node, "minimum", None)
+        maximum = getattr(node, "maximum", None)
+        value = minimum if minimum is not None else min(0, maximum) if maximum is not None else 0
+        return int(value) if json_type == "integer" else value
+    if json_type == "boolean":
+        return True
+    if json_type == "array":
+        items = getattr(node, "items", None)
+        item = sample(items, schema_file) if items is not None else "a"
+        return [item for _ in range(max(1, getattr(node, "min_items", None) or 0))]
+    shape = getattr(node, "shape", None)
+    if json_type == "object" or shape is not None:
+        fields = shape.fields if shape is not None else {}
+        return {name: sample(field, schema_file) for name, field in fields.items()}
+    return {}
+
+
+def example_payload(version, schema_file):
+    """The extractor's example for a schema file, expanded past its depth cap."""
+    shape = schema_file.shape
+    if version == "2.0.1":
+        return json.loads(extract_schemas.generate_example_payload(
+            shape.fields, shape.required, schema_file.definitions, UNCAPPED_DEPTH))
+    return extract_schemas_16.generate_example(shape.fields, shape.required, UNCAPPED_DEPTH)
+
+
+def fill_arrays(value, node, schema_file):
+    """Repeat the single item of every array in value up to ARRAY_ITEMS."""
+    while getattr(node, "ref", None) is not None:
+        node = schema_file.definitions[node.ref]
+    if isinstance(value, list) and value:
+        items = getattr(node, "items", None)
+        item = fill_arrays(value[0], items, schema_file) if items is not None else value[0]
+        count = ARRAY_ITEMS if node.max_items is None else min(ARRAY_ITEMS, node.max_items)
+        return [item] * max(count, len(value))
+    if isinstance(value, dict) and node is not None and node.shape is not None:
+        fields = node.shape.fields
+        return {k: fill_arrays(v, fields.get(k), schema_file) for k, v in value.items()}
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Generated modules
+# ---------------------------------------------------------------------------
+
+def compiled_validators(version: str, ir) -> dict:
+    """{(message, side): validate} from the generated module, built in memory."""
+    import generate_validators  # not at the top: it imports this module
+
+    config = VERSIONS[version]
+    module = types.ModuleType(config["module"])
+    exec(compile(generate_validators.generate_module(version, ir), config["module"], "exec"), module.__dict__)
+    return {(msg.name, side): getattr(module, f"validate_{msg.name}{config['suffixes'][side]}")
+            for msg in ir.messages.values() for side in ("request", "response")
+            if getattr(msg, side) is not None}
+
+
+def load_module(path: Path):
+    """Import a generated module from its path."""
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
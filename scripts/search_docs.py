@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Offline BM25 search over the heading-level sections of docs/.
+
+Splits every markdown file in docs/ (except the schema chunks, which
+repeat their block files) into sections, one per heading, and stores an
+inverted index in an SQLite database. A query ranks the sections with
+BM25 and prints the best ones with their file and line range, ready for
+a Read with offset and limit:
+
+    $ python scripts/search_docs.py transaction event meter values -k 1
+     14.73  docs/OCPP-2.0.1-Sequences/OCPP-2.0.1-Sequences.md:298-321
+            OCPP 2.0.1 — Core Message Flows > 3. Transaction Lifecycle > 3.9 Meter Values in Transactions
+
+Terms are lowercased words; CamelCase and digit runs are also indexed
+by part, so "TransactionEvent" matches both "transactionevent" and
+"transaction event". Words in a section's heading count HEADING_WEIGHT
+times. Message and type names, field names and enum values (read from
+the schema index JSON files) are boosted: a match on one of them weighs
+BOOST times a plain word.
+
+The database lives in the user cache directory ($XDG_CACHE_HOME, else
+~/.cache; the temp directory if that is not writable), never in the
+repository or an installed plugin, and is rebuilt automatically whenever
+a doc changes (by size or mtime).
+
+Usage:
+    python scripts/search_docs.py QUERY... [-k N] [--json] [--rebuild]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DOCS_DIR = REPO_ROOT / "docs"
+
+# Search database, one per checkout: the plugin root may be read-only
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "ocpp-docs"
+INDEX_NAME = f"search-index-{hashlib.sha256(str(REPO_ROOT).encode()).hexdigest()[:12]}.sqlite"
+
+# Schema indexes whose names are boosted terms (see schema_index.py)
+SCHEMA_INDEXES = sorted(DOCS_DIR.glob("*-Schemas/*-Schemas-Index.json"))
+
+# Directories under docs/ that are not indexed
+EXCLUDED_DIRS = {"chunks"}
+
+# BM25 parameters, and the weights of heading words and boosted terms
+K1 = 1.2
+B = 0.75
+HEADING_WEIGHT = 3
+BOOST = 2.0
+
+DEFAULT_RESULTS = 5
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can for from has have if in into is it its of on or "
+    "that the their then there these this to was were when which will with".split()
+)
+
+WORD_RE = re.compile(r"[A-Za-z0-9]+")
+PART_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+HEADING_RE = re.compile(r"(#{1,6}) +(.+?) *#*$")
+FENCE_RE = re.compile(r"^ *(```|~~~)")
+
+
+# ---------------------------------------------------------------------------
+# Sections and terms
+# ---------------------------------------------------------------------------
+
+def terms(text: str) -> list:
+    """Index terms of text: each word lowercased, plus the parts of
+    CamelCase and alphanumeric words."""
+    result = []
+    for word in WORD_RE.findall(text):
+        lower = word.lower()
+        if lower not in STOPWORDS:
+            result.append(lower)
+        parts = PART_RE.findall(word)
+        if len(parts) > 1:
+            result.extend(part.lower() for part in parts if part.lower() not in STOPWORDS)
+    return result
+
+
+def sections(text: str) -> list:
+    """(heading path, level, first line, last line, body) of each heading
+    section of a markdown text; lines are 1-based and inclusive. Text
+    before the first heading is a section with an empty path."""
+    lines = text.split("\n")
+    starts = []
+    fenced = False
+    for number, line in enumerate(lines):
+        if FENCE_RE.match(line):
+            fenced = not fenced
+        elif not fenced:
+            m = HEADING_RE.match(line)
+            if m:
+                starts.append((number, len(m.group(1)), m.group(2)))
+    if not starts or starts[0][0] > 0:
+        starts.insert(0, (0, 0, ""))
+
+    result = []
+    path = []
+    for i, (start, level, heading) in enumerate(starts):
+        end = starts[i + 1][0] if i + 1 < len(starts) else len(lines)
+        while end > start + 1 and not lines[end - 1].strip():
+            end -= 1
+        if level:
+            path = [(lvl, text) for lvl, text in path if lvl < level] + [(level, heading)]
+        body = "\n".join(lines[start + 1:end])
+        if not body.strip() and level:
+            continue  # a heading directly followed by its first subheading
+        result.append((" > ".join(text for _lvl, text in path), level, start + 1, end, body))
+    return result
+
+
+def boosted_terms() -> set:
+    """Message, type, field and enum names of the schema indexes."""
+    names = set()
+    for index_path in SCHEMA_INDEXES:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+        names.update(row["name"] for table in ("messages", "types", "fields") for row in index[table])
+        names.update(row["value"] for row in index["enum_values"])
+    return {word.lower() for name in names for word in WORD_RE.findall(name)} - STOPWORDS
+
+
+def doc_files() -> list:
+    return sorted(path for path in DOCS_DIR.rglob("*.md")
+                  if not EXCLUDED_DIRS & set(path.relative_to(DOCS_DIR).parts[:-1]))
+
+
+def fingerprint(paths: list) -> str:
+    """Size and mtime of every doc and schema index: the database is
+    stale when this changes."""
+    stats = {}
+    for path in paths + SCHEMA_INDEXES:
+        stat = path.stat()
+        stats[path.relative_to(REPO_ROOT).as_posix()] = [stat.st_size, stat.st_mtime_ns]
+    return json.dumps(stats, sort_keys=True)
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE sections (id INTEGER PRIMARY KEY, file TEXT, heading TEXT, level INTEGER,
+                       first_line INTEGER, last_line INTEGER, length INTEGER);
+CREATE TABLE terms (term TEXT PRIMARY KEY, df INTEGER, boost REAL) WITHOUT ROWID;
+CREATE TABLE postings (term TEXT, section INTEGER, tf INTEGER, PRIMARY KEY (term, section)) WITHOUT ROWID;
+"""
+
+
+def build(path: Path, files: list, stamp: str):
+    """(Re)create the database at path from files."""
+    boosted = boosted_terms()
+    section_rows = []
+    postings = []
+    df = Counter()
+    for file_path in files:
+        relative = file_path.relative_to(REPO_ROOT).as_posix()
+        for heading, level, first, last, body in sections(file_path.read_text(encoding="utf-8")):
+            section_id = len(section_rows)
+            counts = Counter(terms(body))
+            for term in terms(heading.rpartition(" > ")[2]):
+                counts[term] += HEADING_WEIGHT
+            section_rows.append((section_id, relative, heading, level, first, last, sum(counts.values())))
+            for term, tf in counts.items():
+                postings.append((term, section_id, tf))
+            df.update(counts.keys())
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    db = sqlite3.connect(tmp_path)
+    try:
+        db.executescript(SCHEMA)
+        lengths = [row[-1] for row in section_rows]
+        db.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("fingerprint", stamp),
+            ("sections", str(len(section_rows))),
+            ("average_length", str(sum(lengths) / len(lengths) if lengths else 0)),
+        ])
+        db.executemany("INSERT INTO sections VALUES (?, ?, ?, ?, ?, ?, ?)", section_rows)
+        db.executemany("INSERT INTO terms VALUES (?, ?, ?)",
+                       [(term, count, BOOST if term in boosted else 1.0) for term, count in df.items()])
+        db.executemany("INSERT INTO postings VALUES (?, ?, ?)", sorted(postings))
+        db.commit()
+        db.execute("VACUUM")
+    finally:
+        db.close()
+    os.replace(tmp_path, path)
+
+
+def index_path() -> Path:
+    """Path of the search database: in CACHE_DIR, or in the temp
+    directory when CACHE_DIR cannot be created or written."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        pass
+    else:
+        if os.access(CACHE_DIR, os.W_OK):
+            return CACHE_DIR / INDEX_NAME
+    return Path(tempfile.gettempdir()) / INDEX_NAME
+
+
+def open_index(rebuild: bool = False) -> sqlite3.Connection:
+    """The search database, rebuilt first if it is missing or stale."""
+    path = index_path()
+    files = doc_files()
+    stamp = fingerprint(files)
+    if not rebuild and path.exists():
+        db = sqlite3.connect(path)
+        try:
+            row = db.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        except sqlite3.DatabaseError:
+            row = None
+        if row is not None and row[0] == stamp:
+            return db
+        db.close()
+    build(path, files, stamp)
+    return sqlite3.connect(path)
+
+
+# ---------------------------------------------------------------------------
+# Search
+# ---------------------------------------------------------------------------
+
+def search(db: sqlite3.Connection, query: str, k: int = DEFAULT_RESULTS) -> list:
+    """The k best sections for query: [{score, file, lines, heading}]."""
+    meta = dict(db.execute("SELECT key, value FROM meta"))
+    total = int(meta["sections"])
+    average = float(meta["average_length"]) or 1.0
+    scores = Counter()
+    for term in dict.fromkeys(terms(query)):
+        row = db.execute("SELECT df, boost FROM terms WHERE term = ?", (term,)).fetchone()
+        if row is None:
+            continue
+        df, boost = row
+        idf = math.log(1 + (total - df + 0.5) / (df + 0.5)) * boost
+        for section, tf, length in db.execute(
+                "SELECT p.section, p.tf, s.length FROM postings p JOIN sections s ON s.id = p.section "
+                "WHERE p.term = ?", (term,)):
+            scores[section] += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / average))
+
+    results = []
+    for section, score in scores.most_common(k):
+        file, heading, first, last = db.execute(
+            "SELECT file, heading, first_line, last_line FROM sections WHERE id = ?", (section,)).fetchone()
+        results.append({"score": round(score, 2), "file": file, "lines": [first, last], "heading": heading})
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the docs sections with BM25.")
+    parser.add_argument("query", nargs="*", help="search terms")
+    parser.add_argument("-k", type=int, default=DEFAULT_RESULTS,
+                        help=f"number of sections to return (default: {DEFAULT_RESULTS})")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index even if it is current")
+    args = parser.parse_args()
+    if not args.query and not args.rebuild:
+        parser.error("a query is required (or --rebuild)")
+
+    start = time.perf_counter()
+    db = open_index(args.rebuild)
+    if not args.query:
+        count = db.execute("SELECT COUNT(*) FROM sections").fetchone()[0]
+        print(f"Written {index_path()} ({count} sections, {time.perf_counter() - start:.2f}s)")
+        return
+    try:
+        results = search(db, " ".join(args.query), args.k)
+    finally:
+        db.close()
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps(results, indent=1, ensure_ascii=False))
+    elif not results:
+        print("No matching sections.", file=sys.stderr)
+    else:
+        for result in results:
+            first, last = result["lines"]
+            print(f"{result['score']:>6.2f}  {result['file']}:{first}-{last}")
+            if result["heading"]:
+                print(f"        {result['heading']}")
+        print(f"({elapsed:.1f} ms)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Token budget of the docs an agent reads.
+
+Counts approximate tokens (doc_chunks.TOKEN_BYTES bytes per token, so
+the numbers are the same on every machine) per file, per H2 and H3
+section and per message section of the schema docs, and breaks down
+where the schema docs' tokens go:
+
+  descriptions      Description cells of field tables (the cleaned OCA
+                    descriptions), with the costliest listed
+  used_in           "**Used in:**" lists of types
+  examples          fenced example payloads
+  duplicate_tables  tables repeated verbatim (1.6J inline sub-tables,
+                    2.0.1 local types documented in two blocks): the
+                    tokens of every copy after the first
+
+Fails (exit 1) when the total, a file or a message exceeds its budget;
+the defaults below leave headroom over the current docs and can be
+overridden on the command line. The extractors run the same file and
+message check on what they generate.
+
+Usage:
+    python scripts/token_report.py [--top N] [--json]
+        [--budget N] [--file-budget N] [--message-budget N]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import doc_chunks
+import search_docs
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DOCS_DIR = REPO_ROOT / "docs"
+
+# Schema docs directory → prefix of its block/profile files and index
+SCHEMA_DOCS = {
+    DOCS_DIR / "OCPP-2.0.1-Schemas": "OCPP-2.0.1-Schemas",
+    DOCS_DIR / "OCPP-1.6J-Schemas": "OCPP-1.6J-Schemas",
+}
+
+# Budgets in tokens: all docs, any one file, any one message section
+BUDGET = 135_000
+FILE_BUDGET = 9_000
+MESSAGE_BUDGET = 1_000
+
+DEFAULT_TOP = 10
+
+USED_IN_PREFIX = "**Used in:**"
+
+
+def tokens(byte_count: int) -> int:
+    return doc_chunks.tokens(byte_count)
+
+
+# ---------------------------------------------------------------------------
+# Counting
+# ---------------------------------------------------------------------------
+
+class Report:
+    """Byte counts of a set of docs, reported in tokens."""
+
+    def __init__(self):
+        self.files = {}
+        self.sections = {}
+        self.messages = {}
+        self.contributors = Counter()
+        self.descriptions = Counter()
+        self.used_in = Counter()
+        self.tables = Counter()  # (hash, bytes) of each table → copies
+        self.schema_bytes = 0
+
+    def add_file(self, path: Path, label: str, schema: bool):
+        """Count one markdown file; schema docs also feed the breakdown."""
+        text = path.read_text(encoding="utf-8")
+        self.files[label] = len(text.encode())
+        h2 = h3 = None
+        fenced = False
+        table = []
+        description_column = False
+        for line in text.split("\n"):
+            size = len(line.encode()) + 1
+            fence = search_docs.FENCE_RE.match(line)
+            heading = None if fenced or fence else search_docs.HEADING_RE.match(line)
+            if heading:
+                level = len(heading.group(1))
+                if level <= 2:
+                    h2 = f"{label} > {heading.group(2)}" if level == 2 else None
+                    h3 = None
+                elif level == 3 and h2 is not None:
+                    h3 = f"{h2} > {heading.group(2)}"
+            for key in (h2, h3):
+                if key is not None:
+                    self.sections[key] = self.sections.get(key, 0) + size
+
+            if schema:
+                self.schema_bytes += size
+                if fence or fenced:
+                    self.contributors["examples"] += size
+                elif line.startswith(USED_IN_PREFIX):
+                    self.contributors["used_in"] += size
+                    self.used_in[line] += 1
+                if line.startswith("|") and not fenced:
+                    cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+                    if not table:
+                        description_column = cells[-1] == "Description"
+                    elif description_column and not set(cells[-1]) <= {"-", ":"} and cells[-1]:
+                        self.contributors["descriptions"] += len(cells[-1].encode())
+                        self.descriptions[cells[-1]] += 1
+                    table.append(line)
+                elif table:
+                    self._end_table(table)
+                    table = []
+            if fence:
+                fenced = not fenced
+        if table:
+            self._end_table(table)
+
+    def _end_table(self, table: list):
+        text = ("\n".join(table) + "\n").encode()
+        self.tables[(hashlib.sha256(text).hexdigest(), len(text))] += 1
+
+    def add_messages(self, docs_dir: Path, prefix: str):
+        """Count the message sections of one version's schema docs, located
+        with its schema index."""
+        index_path = docs_dir / f"{prefix}-Index.json"
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+        version = next(row["value"] for row in index["meta"] if row["key"] == "version")
+        pages = defaultdict(list)
+        for row in index["messages"]:
+            if row["block"] is not None:
+                pages[docs_dir / f"{prefix}-{row['block']}.md"].append(row["name"])
+        for path, names in pages.items():
+            self.add_message_sections(version, path, names)
+
+    def add_message_sections(self, version: str, path: Path, names: list):
+        headings = {f"## {name}": ("messages", name) for name in names}
+        for chunk in doc_chunks.split(path, path.read_text(encoding="utf-8"), headings, path.parent):
+            self.messages[f"{version} {chunk.name}"] = chunk.length
+
+    # -- results ------------------------------------------------------------
+
+    def duplicate_tables(self) -> int:
+        return sum(size * (copies - 1) for (_hash, size), copies in self.tables.items())
+
+    def summary(self, top: int) -> dict:
+        def largest(counts):
+            return [[name, tokens(size)] for name, size in
+                    sorted(counts.items(), key=lambda item: -item[1])[:top]]
+
+        contributors = dict(self.contributors)
+        contributors["duplicate_tables"] = self.duplicate_tables()
+        return {
+            "token_bytes": doc_chunks.TOKEN_BYTES,
+            "total": tokens(sum(self.files.values())),
+            "files": largest(self.files),
+            "sections": largest(self.sections),
+            "messages": largest(self.messages),
+            "schema_docs": tokens(self.schema_bytes),
+            "contributors": {name: tokens(size) for name, size in contributors.items()},
+            "descriptions": [[text, count, tokens(len(text.encode()) * count)]
+                             for text, count in sorted(self.descriptions.items(),
+                                                       key=lambda item: -len(item[0].encode()) * item[1])[:top]],
+            "used_in": [[text, count, tokens(len(text.encode()) * count)]
+                        for text, count in sorted(self.used_in.items(),
+                                                  key=lambda item: -len(item[0].encode()) * item[1])[:top]],
+        }
+
+    def over_budget(self, budget: int = None, file_budget: int = None, message_budget: int = None) -> list:
+        """Budget violations, as messages."""
+        errors = []
+        total = tokens(sum(self.files.values()))
+        if budget is not None and total > budget:
+            errors.append(f"docs total {total:,} tokens > budget {budget:,}")
+        for counts, limit, what in ((self.files, file_budget, "file"),
+                                    (self.messages, message_budget, "message")):
+            if limit is None:
+                continue
+            for name, size in counts.items():
+                if tokens(size) > limit:
+                    errors.append(f"{what} {name}: {tokens(size):,} tokens > budget {limit:,}")
+        return errors
+
+
+def generated_report(files: list, version: str, pages: dict) -> Report:
+    """Report on an extractor's outputs: files, and the message sections of
+    pages (path → message names)."""
+    report = Report()
+    for path in files:
+        report.add_file(path, path.name, schema=True)
+    for path, names in pages.items():
+        report.add_message_sections(version, path, names)
+    return report
+
+
+def check_generated(files: list, version: str, pages: dict) -> bool:
+    """Print the token cost of an extractor's outputs and any file or
+    message over budget. Returns False if over budget."""
+    report = generated_report(files, version, pages)
+    total = tokens(sum(report.files.values()))
+    name, size = max(report.messages.items(), key=lambda item: item[1], default=("-", 0))
+    print(f"Token budget: ~{total:,} tokens in {len(files)} files, largest message {name} ~{tokens(size):,}")
+    errors = report.over_budget(file_budget=FILE_BUDGET, message_budget=MESSAGE_BUDGET)
+    for error in errors:
+        print(f"  ERROR: {error}", file=sys.stderr)
+    return not errors
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def doc_report() -> Report:
+    report = Report()
+    for path in search_docs.doc_files():
+        schema = path.parent in SCHEMA_DOCS or path.name.endswith("-DataTypes.md")
+        report.add_file(path, path.relative_to(DOCS_DIR).as_posix(), schema)
+    for docs_dir, prefix in SCHEMA_DOCS.items():
+        report.add_messages(docs_dir, prefix)
+    return report
+
+
+def print_summary(summary: dict):
+    print(f"Docs: ~{summary['total']:,} tokens ({summary['token_bytes']} bytes/token)")
+    for title, key in (("Largest files", "files"), ("Largest H2/H3 sections", "sections"),
+                       ("Largest messages", "messages")):
+        print(f"\n{title}:")
+        for name, count in summary[key]:
+            print(f"  {count:>7,}  {name}")
+
+    schema = summary["schema_docs"]
+    print(f"\nSchema docs: ~{schema:,} tokens, of which:")
+    for name, count in sorted(summary["contributors"].items(), key=lambda item: -item[1]):
+        print(f"  {count:>7,}  {count / schema:>4.0%}  {name}")
+    for title, key in (("Costliest descriptions", "descriptions"), ("Costliest Used in lists", "used_in")):
+        print(f"\n{title} (tokens, copies):")
+        for text, count, cost in summary[key]:
+            print(f"  {cost:>7,}  {count:>3}x  {text[:90]}{'...' if len(text) > 90 else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the token cost of the docs and check budgets.")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"entries per list (default: {DEFAULT_TOP})")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--budget", type=int, default=BUDGET, help=f"total tokens (default: {BUDGET:,})")
+    parser.add_argument("--file-budget", type=int, default=FILE_BUDGET,
+                        help=f"tokens per file (default: {FILE_BUDGET:,})")
+    parser.add_argument("--message-budget", type=int, default=MESSAGE_BUDGET,
+                        help=f"tokens per message section (default: {MESSAGE_BUDGET:,})")
+    args = parser.parse_args()
+
+    report = doc_report()
+    summary = report.summary(args.top)
+    errors = report.over_budget(args.budget, args.file_budget, args.message_budget)
+    if args.json:
+        summary["errors"] = errors
+        print(json.dumps(summary, indent=1, ensure_ascii=False))
+    else:
+        print_summary(summary)
+        print(f"\nBudgets: total {args.budget:,}, file {args.file_budget:,}, message {args.message_budget:,}: "
+              f"{'OK' if not errors else f'{len(errors)} exceeded'}")
+    for error in errors:
+        print(f"ERROR: {error}", file=sys.stderr)
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()